@@ -1,27 +1,45 @@
 import asyncio
 from runtime.event_bus import EventBus
 from runtime.audio_manager import AudioManager
-from runtime.shutdown import graceful_shutdown
+from runtime.shutdown import graceful_shutdown, SHUTDOWN_PHRASE
+from runtime.startup import Startup
+from runtime.loop_monitor import LoopMonitor
 from hardware.swivel import SwivelController
 
-from behaviour.wakeup import wake_up
-from behaviour.goodnight import good_night
+from behaviour.wakeup import wake_up, WAKE_PHRASE
+from behaviour.goodnight import good_night, GOODNIGHT_PHRASE
+
+ONLINE_PHRASE = "System online and ready."
+FIXED_PHRASES = [WAKE_PHRASE, ONLINE_PHRASE, GOODNIGHT_PHRASE, SHUTDOWN_PHRASE]
+
+
+def boot_tts(tts):
+    tts.warmup()
+    tts.prewarm(FIXED_PHRASES)
+
 
 async def main():
+    loop_mon = LoopMonitor().start()
     bus = EventBus()
+    audio = AudioManager()
+
+    # Boot hardware + voice concurrently
+    boot = Startup()
+    boot.add("swivel", lambda: SwivelController().open())
+    boot.add("tts", lambda: boot_tts(audio.tts), required=False)
+    ready = await boot.run()
 
     # Start audio subsystem
-    audio = AudioManager()
     await audio.start()
     bus.subscribe("speak", audio.say)
 
-    with SwivelController().open() as swivel:
+    with ready["swivel"] as swivel:
 
         # Wake up KIRI
         await wake_up(bus, swivel)
 
         # Say something after waking up
-        await bus.publish("speak", "System online and ready.")
+        await bus.publish("speak", ONLINE_PHRASE)
         await asyncio.sleep(2.0)
 
         # Good night routine BEFORE shutting down runtime
@@ -30,6 +48,9 @@ async def main():
         # Graceful shutdown: drain speech + center servo
         await graceful_shutdown(bus, audio, swivel)
 
+    print(loop_mon.report(stacks=True))
+    loop_mon.stop()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
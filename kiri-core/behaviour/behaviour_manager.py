@@ -1,4 +1,7 @@
 import asyncio
+from collections import OrderedDict
+
+MAX_GREETED = 64    # bound on remembered tracks if "face.lost" never arrives
 
 class BehaviourManager:
     def __init__(self, bus, swivel, tts):
@@ -7,24 +10,37 @@ class BehaviourManager:
         self.tts = tts
         self.current = None
         self.last_name = None
+        self.greeted = OrderedDict()   # track_id -> name already greeted on that track
         self.cooldown = 0
 
         bus.subscribe("face.detected", self.on_face)
         bus.subscribe("face.lost", self.on_loss)
-
-        bus.subscribe("speak", self.on_speak)
-
-    async def on_speak(self, text):
-        await self.audio.say(text)
+        # "speak" is consumed by AudioManager.say (app/main.py)
 
 
     async def on_face(self, data):
         name = data.get("name")
         box = data.get("box")
-
-        # greet logic
-        if name and name != self.last_name and self.cooldown <= 0:
-            self.tts.say(f"Hello {name}")
+        track_id = data.get("track_id")
+
+        # greet once per (track, identity); without tracks fall back to last name.
+        # Nothing in this tree publishes track ids on the bus yet: the
+        # FaceTrackManagers live in labs/face_tracker_test.py, which has no
+        # bus. A producer that has one should publish "face.detected" with
+        # the face's "track_id" and pass on_lost to publish "face.lost".
+        if track_id is not None:
+            fresh = self.greeted.get(track_id) != name
+        else:
+            fresh = name != self.last_name
+
+        # greet logic (coalesced per person, stale greetings are dropped)
+        if name and fresh and self.cooldown <= 0:
+            if track_id is not None:
+                self.greeted[track_id] = name
+                self.greeted.move_to_end(track_id)
+                while len(self.greeted) > MAX_GREETED:
+                    self.greeted.popitem(last=False)
+            await self.bus.publish("speak", {"text": f"Hello {name}", "key": f"greet:{name}", "ttl": 3.0})
             self.last_name = name
             self.cooldown = 50  # frames or seconds depending on loop
 
@@ -35,8 +51,10 @@ class BehaviourManager:
         # swivel_tracker.adjust(box)
 
     async def on_loss(self, data):
+        # forget the track so a returning person is greeted again
+        if isinstance(data, dict):
+            self.greeted.pop(data.get("track_id"), None)
         # after some frames, trigger searching
-        pass
 
     async def tick(self):
         if self.cooldown > 0:
@@ -1,5 +1,7 @@
 import asyncio
 
+GOODNIGHT_PHRASE = "Good night. I am going to sleep now."
+
 async def good_night(bus, swivel):
     # A tiny bow
     swivel.set(90, 110)
@@ -15,4 +17,4 @@ async def good_night(bus, swivel):
         await asyncio.sleep(0.25)
 
     # Speak the farewell
-    await bus.publish("speak", "Good night. I am going to sleep now.")
+    await bus.publish("speak", GOODNIGHT_PHRASE)
@@ -1,6 +1,46 @@
 import asyncio
 import time
 import math
+from collections import deque
+
+from runtime.trace import TRACE
+
+
+class _AlphaBeta:
+    """
+    Constant-velocity (alpha-beta) filter for one world-frame angle.
+    Fed with timestamped measurements, queried at arbitrary times.
+    """
+
+    def __init__(self, alpha=0.6, beta=0.15, max_vel=180.0):
+        self.alpha = alpha
+        self.beta = beta
+        self.max_vel = max_vel
+        self.x = None
+        self.v = 0.0
+        self.t = None
+
+    def reset(self):
+        self.x = None
+        self.v = 0.0
+        self.t = None
+
+    def update(self, z, t):
+        if self.x is None:
+            self.x, self.v, self.t = z, 0.0, t
+            return
+        dt = t - self.t
+        if dt <= 0:
+            return
+        pred = self.x + self.v * dt
+        r = z - pred
+        self.x = pred + self.alpha * r
+        self.v += self.beta * r / dt
+        self.v = max(-self.max_vel, min(self.max_vel, self.v))
+        self.t = t
+
+    def predict(self, t):
+        return self.x + self.v * (t - self.t)
 
 
 class TrackFace:
@@ -10,6 +50,12 @@ class TrackFace:
       - Nonlinear gain shaping (stable near centre, strong at edges)
       - Edge boosting for fast recentering
       - Anti-oscillation behavior
+      - Optional latency compensation (predictive=True): the face is placed
+        in world (pan/tilt) angles using the head pose at capture time and
+        extrapolated over the pipeline latency.
+      - Optional event-driven mode (wait_new_fn): one control update per new
+        detection instead of fixed-rate polling, e.g.
+        TrackFace(..., wait_new_fn=state.wait_faces)
     """
 
     def __init__(
@@ -22,9 +68,14 @@ class TrackFace:
         tilt_gain=35.0,
         box_smooth=0.20,    # initial smoothing for jitter
         lost_face_delay=1.0,
+        predictive=False,
+        fov_deg=(66.0, 50.0),   # camera horizontal / vertical field of view
+        lead_s=0.08,            # actuation latency to predict past "now"
+        wait_new_fn=None,       # async (last_seq, timeout) -> new seq | None
     ):
         self.motion = motion
         self.get_face = get_face_fn
+        self.wait_new = wait_new_fn
 
         self.pan_center = float(pan_center)
         self.tilt_center = float(tilt_center)
@@ -38,6 +89,16 @@ class TrackFace:
 
         self.lost_face_delay = float(lost_face_delay)
         self.last_seen_time = 0
+        self.last_track_id = None
+
+        # latency compensation
+        self.predictive = bool(predictive)
+        self.half_fov = (math.radians(fov_deg[0]) / 2, math.radians(fov_deg[1]) / 2)
+        self.lead_s = float(lead_s)
+        self.pose_history = deque(maxlen=64)   # (t, pan, tilt)
+        self.last_frame_time = None
+        self.pan_filter = _AlphaBeta()
+        self.tilt_filter = _AlphaBeta()
 
 
     # -------------------------------------------------------------
@@ -74,63 +135,174 @@ class TrackFace:
 
 
     # -------------------------------------------------------------
-    # Main loop
+    # Head pose history (for latency compensation)
     # -------------------------------------------------------------
-    async def loop(self, hz=20):
-        dt = 1.0 / hz
+    def _read_pose(self):
+        # SwivelMotionStable wraps the real SwivelMotion as `.m`
+        m = getattr(self.motion, "m", self.motion)
+        pan = getattr(m, "current_pan", None)
+        tilt = getattr(m, "current_tilt", None)
+        if pan is None or tilt is None:
+            return self.pan_center, self.tilt_center
+        return float(pan), float(tilt)
 
-        while True:
-            now = time.monotonic()
-            face = self.get_face()
+    def _pose_at(self, t):
+        """Head pose at time t, linearly interpolated from the history."""
+        hist = self.pose_history
+        if not hist:
+            return self._read_pose()
+        if t <= hist[0][0]:
+            return hist[0][1], hist[0][2]
+        for i in range(len(hist) - 1, 0, -1):
+            t1, p1, q1 = hist[i]
+            t0, p0, q0 = hist[i - 1]
+            if t0 <= t <= t1:
+                k = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+                return p0 + k * (p1 - p0), q0 + k * (q1 - q0)
+        return hist[-1][1], hist[-1][2]
 
-            if face:
-                x, y, w, h, W, H = face
-                self.last_seen_time = now
+    def _predict_target(self, ex, ey, t_frame, now):
+        # New measurement? (the same frame may be polled more than once)
+        if t_frame != self.last_frame_time:
+            self.last_frame_time = t_frame
 
-                # Smooth bbox
-                x, y, w, h = self._smooth_box((x, y, w, h))
+            pan_then, tilt_then = self._pose_at(t_frame)
+
+            # pixel error → angular offset (pinhole), signs follow the gains
+            off_pan = math.degrees(math.atan(ex * math.tan(self.half_fov[0])))
+            off_tilt = math.degrees(math.atan(ey * math.tan(self.half_fov[1])))
+            world_pan = pan_then + math.copysign(off_pan, self.base_pan_gain * ex)
+            world_tilt = tilt_then + math.copysign(off_tilt, self.base_tilt_gain * ey)
+
+            self.pan_filter.update(world_pan, t_frame)
+            self.tilt_filter.update(world_tilt, t_frame)
+
+        t_ahead = now + self.lead_s
+        target_pan = self.pan_filter.predict(t_ahead)
+        target_tilt = self.tilt_filter.predict(t_ahead)
+        return (
+            max(0.0, min(180.0, target_pan)),
+            max(0.0, min(180.0, target_tilt)),
+        )
 
-                # Compute face center
-                cx = x + w/2
-                cy = y + h/2
 
-                # Normalized errors
-                ex = (cx - W/2) / (W/2)
-                ey = (cy - H/2) / (H/2)
+    # -------------------------------------------------------------
+    # One control iteration
+    # -------------------------------------------------------------
+    def update(self, face, now):
+        """
+        face: (x, y, w, h, W, H[, frame_time[, track_id]])
+        now:  monotonic time of this iteration
+        """
+        with TRACE.span("trackface"):
+            self._update(face, now)
 
-                # -----------------------------
-                # Nonlinear gain shaping
-                # -----------------------------
-                abs_ex = abs(ex)
+    def _update(self, face, now):
+        pan_now, tilt_now = self._read_pose()
+        self.pose_history.append((now, pan_now, tilt_now))
 
-                if abs_ex < 0.10:
-                    pan_gain = self.base_pan_gain * 0.6    # gentle
-                elif abs_ex < 0.30:
-                    pan_gain = self.base_pan_gain * 1.0    # normal
-                elif abs_ex < 0.60:
-                    pan_gain = self.base_pan_gain * 1.8    # strong
-                else:
-                    pan_gain = self.base_pan_gain * 2.5    # full authority
+        if face:
+            x, y, w, h, W, H = face[:6]
+            t_frame = face[6] if len(face) > 6 and face[6] is not None else now
+            track_id = face[7] if len(face) > 7 else None
+            self.last_seen_time = now
 
-                # Edge boosting (smooth in center, strong near edges)
-                ex_shaped = ex * (1.0 + abs_ex)
+            # attention moved to another person: don't blend the two
+            if track_id != self.last_track_id:
+                self.last_track_id = track_id
+                self.last_bbox = None
+                self.pan_filter.reset()
+                self.tilt_filter.reset()
 
-                # Tilt: keep linear (tilt is usually more stable)
-                tilt_gain = self.base_tilt_gain
-                ey_shaped = ey * (1.0 + abs(ey)*0.2)
+            # Smooth bbox (pixel-space smoothing lags while the head moves,
+            # so the predictive path filters in world angles instead)
+            if not self.predictive:
+                x, y, w, h = self._smooth_box((x, y, w, h))
 
-                # Convert to angles
-                target_pan  = self.pan_center  + ex_shaped * pan_gain
-                target_tilt = self.tilt_center + ey_shaped * tilt_gain
+            # Compute face center
+            cx = x + w/2
+            cy = y + h/2
 
-                # DEBUG:
-                # print(f"W:{W} cx:{cx:.1f} ex:{ex:.3f} gain:{pan_gain:.1f} target_pan:{target_pan:.1f}")
+            # Normalized errors
+            ex = (cx - W/2) / (W/2)
+            ey = (cy - H/2) / (H/2)
 
+            if self.predictive:
+                target_pan, target_tilt = self._predict_target(ex, ey, t_frame, now)
                 self.motion.set_target(target_pan, target_tilt)
+                return
+
+            # -----------------------------
+            # Nonlinear gain shaping
+            # -----------------------------
+            abs_ex = abs(ex)
 
+            if abs_ex < 0.10:
+                pan_gain = self.base_pan_gain * 0.6    # gentle
+            elif abs_ex < 0.30:
+                pan_gain = self.base_pan_gain * 1.0    # normal
+            elif abs_ex < 0.60:
+                pan_gain = self.base_pan_gain * 1.8    # strong
             else:
-                # No face detected
-                if now - self.last_seen_time > self.lost_face_delay:
-                    self.last_bbox = None
+                pan_gain = self.base_pan_gain * 2.5    # full authority
 
+            # Edge boosting (smooth in center, strong near edges)
+            ex_shaped = ex * (1.0 + abs_ex)
+
+            # Tilt: keep linear (tilt is usually more stable)
+            tilt_gain = self.base_tilt_gain
+            ey_shaped = ey * (1.0 + abs(ey)*0.2)
+
+            # Convert to angles
+            target_pan  = self.pan_center  + ex_shaped * pan_gain
+            target_tilt = self.tilt_center + ey_shaped * tilt_gain
+
+            # DEBUG:
+            # print(f"W:{W} cx:{cx:.1f} ex:{ex:.3f} gain:{pan_gain:.1f} target_pan:{target_pan:.1f}")
+
+            self.motion.set_target(target_pan, target_tilt)
+
+        else:
+            self._handle_loss(now)
+
+    def _handle_loss(self, now):
+        # No face detected
+        if now - self.last_seen_time > self.lost_face_delay:
+            self.last_bbox = None
+            self.pan_filter.reset()
+            self.tilt_filter.reset()
+
+
+    def step(self):
+        """Poll the face provider once (used by loop() or a Scheduler)."""
+        self.update(self.get_face(), time.monotonic())
+
+
+    # -------------------------------------------------------------
+    # Main loop
+    # -------------------------------------------------------------
+    async def loop(self, hz=20):
+        if self.wait_new is not None:
+            await self._event_loop()
+            return
+
+        dt = 1.0 / hz
+
+        while True:
+            self.step()
             await asyncio.sleep(dt)
+
+    async def _event_loop(self):
+        """Run exactly one update per new detection."""
+        seq = 0
+        while True:
+            new_seq = await self.wait_new(seq, self.lost_face_delay)
+            now = time.monotonic()
+
+            if new_seq is None:
+                # timed path: detections stopped arriving altogether
+                self._handle_loss(now)
+                continue
+
+            seq = new_seq
+            self.update(self.get_face(), now)
@@ -1,5 +1,7 @@
 import asyncio
 
+WAKE_PHRASE = "Good morning. I am awake and operational."
+
 async def wake_up(bus, swivel):
     # Soft lift + slight “hello” nod
     swivel.set(90, 120)    # tilt up
@@ -9,7 +11,7 @@ async def wake_up(bus, swivel):
     swivel.set(90, 100)    # neutral
     await asyncio.sleep(0.3)
     # Small side-to-side “curious wiggle”
-    await bus.publish("speak", "Good morning. I am awake and operational.")
+    await bus.publish("speak", WAKE_PHRASE)
     for pan in (70, 110, 90):
         swivel.set(pan, 100)
         await asyncio.sleep(0.25)
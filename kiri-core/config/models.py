@@ -1,27 +1,43 @@
 from pathlib import Path
 
-from pathlib import Path
+# Paths are resolved lazily (PEP 562 module __getattr__): the filesystem
+# walk to find the project root only happens on first access.
+
+_ROOT = None
 
-# Find the project root by locating the folder that contains "models/"
-_current = Path(__file__).resolve()
-while _current != _current.parent:
-    if (_current / "models").exists():
-        ROOT = _current
-        break
-    _current = _current.parent
-else:
-    raise RuntimeError("Could not locate the 'models' directory.")
+_RELATIVE = {
+    "MODELS": "models",
+    "FACE": "models/face",
+    "DETECTION": "models/detection",
+    "AUDIO": "models/audio",
+    "CV": "models/cv",
+    "COCO_LABELS_PATH": "models/cv/coco_labels.txt",
+    "YUNET": "models/face/face_detection_yunet_2023mar.onnx",
+    "EMBEDDER": "models/face/w600k_r50.onnx",
+    "EMBEDDER_INT8": "models/face/w600k_r50_int8.onnx",   # labs/quantize_embedder.py
+    "PIPER_VOICE": "models/audio/piper_voice.onnx",
+    "PIPER_CONFIG": "models/audio/piper_voice.onnx.json",
+}
 
 
-MODELS = ROOT / "models"
+def root() -> Path:
+    """Find the project root by locating the folder that contains "models/"."""
+    global _ROOT
+    if _ROOT is None:
+        _current = Path(__file__).resolve()
+        while _current != _current.parent:
+            if (_current / "models").exists():
+                _ROOT = _current
+                break
+            _current = _current.parent
+        else:
+            raise RuntimeError("Could not locate the 'models' directory.")
+    return _ROOT
 
-FACE = MODELS / "face"
-DETECTION = MODELS / "detection"
-AUDIO = MODELS / "audio"
-CV = MODELS / "cv"
 
-COCO_LABELS_PATH = CV / "coco_labels.txt"
-YUNET = FACE / "face_detection_yunet_2023mar.onnx"
-EMBEDDER = FACE / "w600k_r50.onnx"
-PIPER_VOICE = AUDIO / "piper_voice.onnx"
-PIPER_CONFIG = AUDIO / "piper_voice.onnx.json"
+def __getattr__(name):
+    if name == "ROOT":
+        return root()
+    if name in _RELATIVE:
+        return root() / _RELATIVE[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
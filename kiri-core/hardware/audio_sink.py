@@ -0,0 +1,144 @@
+# hardware/audio_sink.py
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+SND_DIR = Path("/dev/snd")
+
+
+def _snd_stamp():
+    """Cheap fingerprint of the sound device set (no inotify in stdlib)."""
+    try:
+        return SND_DIR.stat().st_mtime_ns, tuple(sorted(os.listdir(SND_DIR)))
+    except OSError:
+        return None
+
+
+class AudioSink:
+    """
+    Long-lived raw PCM output (S16LE mono).
+
+    Device discovery runs once; the player process (aplay / paplay reading
+    stdin) stays open between utterances, so speaking costs a pipe write
+    instead of 2-3 forks plus a device open. Discovery is redone only when
+    a write fails or the /dev/snd device set changes.
+
+    write()/drain()/close() run on the playback thread, abort() on any
+    thread: `proc` is only swapped under a lock and every method works on
+    its own snapshot of it, so abort() never races a concurrent close.
+    """
+
+    def __init__(self, rate: int = 22050, select_fn=None, cmd_fn=None):
+        # select_fn / cmd_fn default to piper_tts.select_output / raw_playback_cmd
+        if select_fn is None or cmd_fn is None:
+            from hardware.piper_tts import select_output, raw_playback_cmd
+            select_fn = select_fn or select_output
+            cmd_fn = cmd_fn or raw_playback_cmd
+        self.select_fn = select_fn
+        self.cmd_fn = cmd_fn
+        self.rate = int(rate)
+
+        self.proc = None
+        self._lock = threading.Lock()    # guards swapping self.proc
+        self.output = None          # (backend, device)
+        self._stamp = None
+        self._play_end = 0.0        # estimated time the written audio finishes
+        self.interrupted = threading.Event()
+
+        self.opens = 0
+        self.write_errors = 0
+
+    # ---------------- lifecycle ----------------
+    def _ensure_open(self):
+        """The running player process (opened if needed), or None after abort()."""
+        stamp = _snd_stamp()
+        proc = self.proc
+        if proc is not None and proc.poll() is None and stamp == self._stamp:
+            return proc
+        self.close()
+        output = self.select_fn()
+        proc = subprocess.Popen(self.cmd_fn(*output, self.rate),
+                                stdin=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        with self._lock:
+            if not self.interrupted.is_set():
+                self.proc, self.output, self._stamp = proc, output, stamp
+                self.opens += 1
+                return proc
+        # abort() landed while the player was starting
+        proc.kill()
+        proc.wait()
+        return None
+
+    def set_rate(self, rate: int):
+        if int(rate) != self.rate:
+            self.rate = int(rate)
+            self.close()
+
+    def close(self):
+        with self._lock:
+            proc, self.proc = self.proc, None
+        self._play_end = 0.0
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def abort(self):
+        """
+        Stop immediately, dropping anything still buffered in the player.
+        Further writes are discarded until reset() (thread-safe).
+        """
+        self.interrupted.set()
+        with self._lock:
+            proc, self.proc = self.proc, None
+        self._play_end = 0.0
+        if proc is not None:
+            proc.kill()         # a write blocked on the pipe fails with EPIPE
+            proc.wait()
+
+    # ---------------- output ----------------
+    def reset(self):
+        """Accept writes again after abort() (call at the start of an utterance)."""
+        self.interrupted.clear()
+
+    def write(self, pcm: bytes):
+        """Queue PCM for playback (blocks only when the pipe is full)."""
+        for attempt in (0, 1):
+            if self.interrupted.is_set():
+                return
+            try:
+                proc = self._ensure_open()
+                if proc is None:
+                    return
+                proc.stdin.write(pcm)
+                proc.stdin.flush()
+                break
+            except (BrokenPipeError, OSError, ValueError):     # ValueError: pipe closed by close()
+                if self.interrupted.is_set():
+                    return              # killed by abort(), not a device error
+                self.write_errors += 1
+                self.close()
+                self._stamp = None      # force re-discovery
+                if attempt:
+                    raise
+
+        now = time.monotonic()
+        self._play_end = max(self._play_end, now) + len(pcm) / (2.0 * self.rate)
+
+    def drain(self, margin: float = 0.0):
+        """
+        Block until the written audio has (approximately) finished playing,
+        or until `margin` seconds before that.
+        """
+        delay = self._play_end - margin - time.monotonic()
+        if delay > 0:
+            self.interrupted.wait(delay)    # abort() wakes us early
@@ -0,0 +1,52 @@
+# hardware/fake_swivel.py
+import time
+
+
+class FakeSwivel:
+    """
+    Drop-in stand-in for SwivelController (same S/P/T/C API).
+    Commands are recorded instead of being sent to an Arduino.
+    Used by replay and offline tests.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.commands = []   # (t, line)
+        self.pan_deg = 90
+        self.tilt_deg = 90
+
+    # --- context manager / lifecycle, same as SwivelController ---
+    def __enter__(self) -> "FakeSwivel":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self) -> "FakeSwivel":
+        return self
+
+    def close(self):
+        pass
+
+    def _send(self, line: str) -> str:
+        self.commands.append((self.clock(), line.strip()))
+        return "OK"
+
+    # --- high-level API ---
+    def set(self, pan: int, tilt: int) -> str:
+        self.pan_deg, self.tilt_deg = int(pan), int(tilt)
+        return self._send(f"S {int(tilt)} {int(pan)}")
+
+    def pan(self, delta: int) -> str:
+        self.pan_deg += int(delta)
+        return self._send(f"T {int(delta)}")
+
+    def tilt(self, delta: int) -> str:
+        self.tilt_deg += int(delta)
+        return self._send(f"P {int(delta)}")
+
+    def cfg(self, vel_deg_s: float, acc_deg_s2: float) -> str:
+        return self._send(f"C V {float(vel_deg_s)} A {float(acc_deg_s2)}")
+
+    def center(self) -> str:
+        return self.set(90, 90)
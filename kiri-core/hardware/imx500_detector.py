@@ -1,12 +1,10 @@
 # hardware/imx500_detector.py
 
-import cv2, numpy as np
+import numpy as np
 from pathlib import Path
-from picamera2 import Picamera2, MappedArray
-from picamera2.devices import IMX500
-from picamera2.devices.imx500 import NetworkIntrinsics, postprocess_nanodet_detection
 
-from config.models import COCO_LABELS_PATH
+# picamera2 (and cv2, only needed for the overlay) are imported lazily so
+# that importing this module stays cheap and can happen off the boot path.
 
 
 class IMX500Detector:
@@ -23,6 +21,11 @@ class IMX500Detector:
                  model_path="/usr/share/imx500-models/imx500_network_yolo11n_pp.rpk",
                  rgb_size=(640, 480)):
 
+        from picamera2 import Picamera2
+        from picamera2.devices import IMX500
+        from picamera2.devices.imx500 import NetworkIntrinsics
+        from config.models import COCO_LABELS_PATH
+
         self.last_detections = []
         self.last_results = None
         self.rgb_size = rgb_size
@@ -84,6 +87,10 @@ class IMX500Detector:
     def stop(self):
         self.picam2.stop()
 
+    def set_frame_rate(self, fps):
+        """Change the sensor frame rate on the fly (idle throttling)."""
+        self.picam2.set_controls({"FrameRate": float(fps)})
+
 
     # --- clean RGB frame for YuNet ---
     def capture_rgb(self):
@@ -91,6 +98,20 @@ class IMX500Detector:
         return self.picam2.capture_array("main")
 
 
+    def capture_rgb_and_detections(self):
+        """
+        One request → clean RGB frame + IMX500 detections of the same frame
+        (cheaper than capture_rgb() followed by get_detections()).
+        """
+        request = self.picam2.capture_request()
+        try:
+            rgb = request.make_array("main")
+            metadata = request.get_metadata()
+        finally:
+            request.release()
+        self.last_results = self._parse_detections(metadata)
+        return rgb, self.last_results
+
     # ========== IMX500 detection parsing ==========
 
     def get_detections(self):
@@ -114,6 +135,7 @@ class IMX500Detector:
         postproc = (self.intrinsics.postprocess or "").lower()
 
         if postproc == "nanodet":
+            from picamera2.devices.imx500 import postprocess_nanodet_detection
             boxes, scores, classes = postprocess_nanodet_detection(
                 outputs=np_outputs[0], conf=THRESH, iou_thres=IOU, max_out_dets=MAX_DETS
             )[0]
@@ -150,6 +172,9 @@ class IMX500Detector:
         if self.last_results is None:
             return
 
+        import cv2
+        from picamera2 import MappedArray
+
         labels = self.get_labels()
 
         with MappedArray(request, stream) as m:
@@ -2,9 +2,12 @@
 from pathlib import Path
 import os
 import re
+import time
 import wave
 import subprocess
-from piper.voice import PiperVoice  # pip install piper-tts
+
+from hardware.tts_cache import TTSCache, voice_fingerprint
+from hardware.audio_sink import AudioSink
 
 
 # ---- config / defaults ----
@@ -43,6 +46,7 @@ _voice = None
 def _get_voice():
     global _voice
     if _voice is None:
+        from piper.voice import PiperVoice  # pip install piper-tts (heavy: imported on first use)
         if not VOICE_PATH.exists() or not CONFIG_PATH.exists():
             raise FileNotFoundError(f"Piper voice or JSON missing:\n{VOICE_PATH}\n{CONFIG_PATH}")
         _voice = PiperVoice.load(str(VOICE_PATH), config_path=str(CONFIG_PATH))
@@ -55,6 +59,50 @@ def _synthesize_wav(text: str, wav_handle):
     else:
         v.synthesize(text, wav_handle)
 
+def voice_sample_rate() -> int:
+    return int(_get_voice().config.sample_rate)
+
+def iter_pcm(text: str):
+    """
+    Yield raw 16-bit mono PCM chunks for text as Piper produces them.
+    Supports both the piper-tts >= 1.3 API (AudioChunk objects) and the
+    older synthesize_stream_raw() generator.
+    """
+    v = _get_voice()
+    if hasattr(v, "synthesize_wav"):
+        for chunk in v.synthesize(text):
+            yield chunk.audio_int16_bytes
+    else:
+        yield from v.synthesize_stream_raw(text)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+")
+_CLAUSE_END = re.compile(r"(?<=,)\s+")
+
+def split_sentences(text: str, max_chars: int = 160, min_chars: int = 12):
+    """
+    Split text into sentence-sized pieces for streaming synthesis.
+    Overlong sentences are split further at commas; tiny fragments
+    ("Hi." / "Ok,") are merged into the next piece.
+    """
+    pieces = []
+    for sent in _SENTENCE_END.split(text.strip()):
+        if len(sent) > max_chars:
+            pieces.extend(_CLAUSE_END.split(sent))
+        elif sent:
+            pieces.append(sent)
+
+    out, carry = [], ""
+    for p in pieces:
+        p = (carry + " " + p).strip() if carry else p
+        if len(p) < min_chars:
+            carry = p
+            continue
+        out.append(p)
+        carry = ""
+    if carry:
+        out.append(carry)
+    return out
+
 def synthesize_to_file(text: str, output_path: Path) -> Path:
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -66,6 +114,37 @@ def synthesize_to_file(text: str, output_path: Path) -> Path:
 # -------------------------------
 #  UNIVERSAL PLAYBACK
 # -------------------------------
+def select_output():
+    """
+    Pick the output device:
+      1) USB ALSA hw:2,0 if available      -> ("alsa", "hw:2,0")
+      2) Otherwise Bluetooth sink (Pulse)  -> ("pulse", sink_name)
+      3) Otherwise default PulseAudio sink -> ("pulse", None)
+    """
+    # ----------- PRIORITY 1: USB SPEAKER (ALSA hw:2,0) -----------
+    if alsa_usb_available():
+        print("[TTS] Using USB speaker (hw:2,0)")
+        return "alsa", "hw:2,0"
+
+    # ----------- PRIORITY 2: BLUETOOTH (PulseAudio/pipewire) -----------
+    bt_sink = detect_bluetooth_sink()
+    if bt_sink:
+        print(f"[TTS] Using Bluetooth sink: {bt_sink}")
+        return "pulse", bt_sink
+
+    # ----------- PRIORITY 3: SYSTEM DEFAULT SINK -----------
+    print("[TTS] Using default PulseAudio sink")
+    return "pulse", None
+
+def raw_playback_cmd(backend, device, rate: int):
+    """Player command that reads raw S16LE mono PCM from stdin."""
+    if backend == "alsa":
+        return ["aplay", "-q", "-D", device, "-t", "raw", "-f", "S16_LE", "-r", str(rate), "-c", "1", "-"]
+    cmd = ["paplay", "--raw", f"--rate={rate}", "--channels=1", "--format=s16le"]
+    if device:
+        cmd.append(f"--device={device}")
+    return cmd
+
 def play(output_path: Path) -> int:
     """
     Intelligent playback:
@@ -73,21 +152,13 @@ def play(output_path: Path) -> int:
       2) Otherwise use Bluetooth sink (PulseAudio)
       3) Otherwise fall back to default PulseAudio sink
     """
-
-    # ----------- PRIORITY 1: USB SPEAKER (ALSA hw:2,0) -----------
-    if alsa_usb_available():
-        cmd = ["aplay", "-q", "-D", "hw:2,0", str(output_path)]
-        print("[TTS] Using USB speaker (hw:2,0)")
+    backend, device = select_output()
+    if backend == "alsa":
+        cmd = ["aplay", "-q", "-D", device, str(output_path)]
+    elif device:
+        cmd = ["paplay", "--device", device, str(output_path)]
     else:
-        # ----------- PRIORITY 2: BLUETOOTH (PulseAudio/pipewire) -----------
-        bt_sink = detect_bluetooth_sink()
-        if bt_sink:
-            cmd = ["paplay", "--device", bt_sink, str(output_path)]
-            print(f"[TTS] Using Bluetooth sink: {bt_sink}")
-        else:
-            # ----------- PRIORITY 3: SYSTEM DEFAULT SINK -----------
-            cmd = ["paplay", str(output_path)]
-            print("[TTS] Using default PulseAudio sink")
+        cmd = ["paplay", str(output_path)]
 
     # Execute
     proc = subprocess.run(cmd, capture_output=True)
@@ -97,21 +168,167 @@ def play(output_path: Path) -> int:
 
     return proc.returncode
 
+# ---- Synthesis backends ----
+def stream_pcm(text: str):
+    """PCM chunks for text, synthesized sentence by sentence."""
+    for sentence in split_sentences(text):
+        yield from iter_pcm(sentence)
+
+class InProcessSynth:
+    """Runs Piper in the calling process (see tts_worker.SynthWorker for the out-of-process one)."""
+    def warmup(self):
+        for _ in iter_pcm("Ready."):
+            pass
+
+    def sample_rate(self) -> int:
+        return voice_sample_rate()
+
+    def stream(self, text: str):
+        return stream_pcm(text)
+
+def write_wav(path: Path, rate: int, chunks) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        for pcm in chunks:
+            wav.writeframes(pcm)
+    return path
+
+def read_wav(path: Path):
+    """Return (rate, pcm_bytes)."""
+    with wave.open(str(path), "rb") as wav:
+        return wav.getframerate(), wav.readframes(wav.getnframes())
+
+
 # ---- Friendly wrapper ----
 class TTS:
-    """Simple Piper-based text-to-speech wrapper."""
-    def __init__(self, tmp_dir="assets/tts_cache"):
+    """Simple Piper-based text-to-speech wrapper (with a persistent utterance cache)."""
+    def __init__(self, tmp_dir="assets/tts_cache", cache_bytes=64 * 1024 * 1024, synth=None):
         self.tmp_dir = Path(tmp_dir)
         self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = TTSCache(self.tmp_dir, voice_fingerprint(VOICE_PATH, CONFIG_PATH), cache_bytes)
+        self.synth = synth or InProcessSynth()
+        self.last_ttfa = None   # seconds from say*/() call to first audio handed to the player
+        self.sink = None        # persistent AudioSink, opened on first use
+
+    def _sink(self, rate: int) -> AudioSink:
+        if self.sink is None:
+            self.sink = AudioSink(rate)
+        self.sink.set_rate(rate)
+        return self.sink
+
+    def close(self):
+        self.cache.flush()
+        if self.sink is not None:
+            self.sink.close()
+
+    def stop(self):
+        """Interrupt the utterance currently playing (thread-safe)."""
+        if self.sink is not None:
+            self.sink.abort()
+
+    def begin(self, rate: int):
+        """
+        Arm the sink for a new utterance: a stop() from now on cuts it off,
+        even before play_stream(..., reset=False) starts writing.
+        """
+        self._sink(rate).reset()
+
+    def warmup(self):
+        """Load the voice and run one dummy synthesis (no playback)."""
+        self.synth.warmup()
+
+    def synthesize(self, text: str) -> Path:
+        """Return a WAV for text, synthesizing only on a cache miss."""
+        path = self.cache.get(text)
+        if path is None:
+            tmp = self.cache.tmp_path(text)
+            write_wav(tmp, self.synth.sample_rate(), self.synth.stream(text))
+            path = self.cache.put(text, tmp)
+        return path
+
+    def prewarm(self, phrases):
+        """Make sure fixed phrases are cached (call at startup)."""
+        for text in phrases:
+            if text.strip():
+                self.synthesize(text)
+
+    def open_stream(self, text: str, use_cache: bool = True):
+        """
+        Start producing audio for text: (rate, pcm chunks, cached).
+        With an out-of-process synth the work starts right away, so this
+        can run ahead of playback. use_cache=False always synthesizes.
+        """
+        path = self.cache.get(text) if use_cache else None
+        if path is not None:
+            rate, pcm = read_wav(path)
+            return rate, [pcm], True
+        return self.synth.sample_rate(), self.synth.stream(text), False
+
+    def play_stream(self, rate: int, chunks, t0: float = None, cache_text: str = None, margin: float = 0.0,
+                    reset: bool = True):
+        """
+        Write PCM chunks to the sink as they arrive and wait until played
+        (up to `margin` seconds early, so a following utterance can be
+        queued gaplessly). If cache_text is given and playback was not
+        interrupted, the audio is stored in the cache afterwards.
+        reset=False keeps a stop() issued since begin() in effect.
+        """
+        t0 = t0 if t0 is not None else time.monotonic()
+        sink = self._sink(rate)
+        if reset:
+            sink.reset()
+        elif sink.interrupted.is_set():
+            self.last_ttfa = None
+            return              # stopped before the first write
+        self.last_ttfa = None
+        played = [] if cache_text else None
+
+        for pcm in chunks:
+            if sink.interrupted.is_set():
+                break
+            sink.write(pcm)
+            if self.last_ttfa is None:
+                self.last_ttfa = time.monotonic() - t0
+            if played is not None:
+                played.append(pcm)
+
+        interrupted = sink.interrupted.is_set()
+        sink.drain(margin)
+        if played and not interrupted:
+            tmp = self.cache.tmp_path(cache_text)
+            write_wav(tmp, rate, played)
+            self.cache.put(cache_text, tmp)
 
     def say(self, text: str, filename: str = None):
         """Generate and play speech."""
         if not text.strip():
             return
-        filename = filename or f"tts_{abs(hash(text)) % (10**8)}.wav"
-        path = self.tmp_dir / filename
-        synthesize_to_file(text, path)
-        play(path)
+        t0 = time.monotonic()
+        if filename:
+            path = self.tmp_dir / filename
+            synthesize_to_file(text, path)
+        else:
+            path = self.synthesize(text)
+        rate, pcm = read_wav(path)
+        self.play_stream(rate, [pcm], t0)
+
+    def say_stream(self, text: str, use_cache: bool = True):
+        """
+        Low-latency speech for long text: synthesize sentence by sentence
+        and write PCM into the already-open audio sink. The pipe applies
+        back-pressure, so sentence N+1 is synthesized while N plays.
+        Cached phrases are played from the cache instead, and new ones are
+        stored; use_cache=False neither reads nor writes the cache.
+        """
+        if not text.strip():
+            return
+        t0 = time.monotonic()
+        rate, chunks, cached = self.open_stream(text, use_cache)
+        self.play_stream(rate, chunks, t0, cache_text=None if cached or not use_cache else text)
 
 # ---- Handy CLI ----
 if __name__ == "__main__":
@@ -4,6 +4,8 @@ import time, sys, os
 from pathlib import Path
 from typing import Optional
 
+from runtime.trace import TRACE
+
 try:
     import serial
     from serial.tools import list_ports
@@ -35,13 +37,16 @@ def _find_port(preferred: Optional[str] = None) -> Optional[str]:
 
 class SwivelController:
     """Tiny client for the Arduino pan/tilt (S/P/T/C protocol)."""
-    def __init__(self, port: Optional[str] = None, baud: int = DEFAULT_BAUD, reset_wait_s: float = 2.0):
+    def __init__(self, port: Optional[str] = None, baud: int = DEFAULT_BAUD, reset_wait_s: float = 2.0,
+                 wait_ready: bool = True):
         self.port = _find_port(port)
         if not self.port:
             raise RuntimeError("No serial port found. Plug the Arduino in or specify port explicitly.")
         self.baud = baud
         self._ser: Optional[serial.Serial] = None
         self._reset_wait_s = reset_wait_s
+        self._wait_ready = wait_ready
+        self.ready_line: Optional[str] = None
 
     # --- context manager sugar ---
     def __enter__(self) -> "SwivelController":
@@ -54,10 +59,27 @@ class SwivelController:
     def open(self) -> "SwivelController":
         if self._ser is None:
             self._ser = serial.Serial(self.port, self.baud, timeout=1)
-            time.sleep(self._reset_wait_s)  # give Arduino time to reset
+            if self._wait_ready:
+                self._wait_for_ready()
+            else:
+                time.sleep(self._reset_wait_s)  # give Arduino time to reset
             self._ser.reset_input_buffer()
         return self
 
+    def _wait_for_ready(self):
+        """
+        Return as soon as the Arduino prints its first line after reset
+        (instead of always sleeping reset_wait_s); reset_wait_s is the cap.
+        """
+        deadline = time.monotonic() + self._reset_wait_s
+        self._ser.timeout = 0.05
+        while time.monotonic() < deadline:
+            line = self._ser.readline().decode(errors="ignore").strip()
+            if line:
+                self.ready_line = line
+                return True
+        return False
+
     def close(self):
         if self._ser:
             try:
@@ -70,12 +92,13 @@ class SwivelController:
         if not self._ser:
             raise RuntimeError("Serial not open. Use .open().")
 
-        # Send immediately
-        self._ser.write((line.strip() + "\n").encode("ascii"))
+        with TRACE.span("serial_send"):
+            # Send immediately
+            self._ser.write((line.strip() + "\n").encode("ascii"))
 
-        # Non-blocking read (timeout=0 means return instantly)
-        self._ser.timeout = 0
-        resp = self._ser.readline().decode(errors="ignore").strip()
+            # Non-blocking read (timeout=0 means return instantly)
+            self._ser.timeout = 0
+            resp = self._ser.readline().decode(errors="ignore").strip()
 
         return resp
 
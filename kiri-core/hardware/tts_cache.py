@@ -0,0 +1,145 @@
+# hardware/tts_cache.py
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def _normalise(text: str) -> str:
+    return re.sub(r"\s+", " ", text.strip())
+
+
+def voice_fingerprint(voice_path: Path, config_path: Path) -> str:
+    """
+    Identify a voice without hashing the (large) ONNX file every start:
+    model name + size + mtime, plus the full config contents.
+    """
+    h = hashlib.sha256()
+    for p in (Path(voice_path), Path(config_path)):
+        h.update(p.name.encode())
+        if p.exists():
+            st = p.stat()
+            h.update(f"{st.st_size}:{int(st.st_mtime)}".encode())
+    if Path(config_path).exists():
+        h.update(Path(config_path).read_bytes())
+    return h.hexdigest()[:16]
+
+
+class TTSCache:
+    """
+    Persistent, content-addressed cache of synthesized utterances.
+
+    - key = sha256(voice fingerprint + normalised text), stable across runs
+    - entries are 16-bit mono PCM WAV files (directly playable)
+    - total size bounded by max_bytes, least-recently-used evicted first
+    - hits only touch the in-memory LRU time; the index file is written on
+      put()/eviction, at most every `save_every` s after hits, and by flush()
+    - thread-safe: the synth and playback stages call it from different
+      executor threads
+    """
+
+    def __init__(self, root, voice_id: str, max_bytes: int = 64 * 1024 * 1024, save_every: float = 60.0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.voice_id = voice_id
+        self.max_bytes = int(max_bytes)
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()    # guards index + index file
+        self.save_every = float(save_every)
+        self._dirty = False              # LRU times changed since the last save
+        self._saved_at = time.monotonic()
+
+        self.index = {}  # key -> {"bytes", "last", "text"}
+        if self.index_path.exists():
+            try:
+                self.index = json.loads(self.index_path.read_text() or "{}")
+            except ValueError:
+                self.index = {}
+
+        # drop index entries whose file vanished
+        self.index = {k: v for k, v in self.index.items() if self.path_for(k).exists()}
+
+        # files from the old per-process hash() naming can never be hit again
+        for p in self.root.glob("tts_*.wav"):
+            p.unlink(missing_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _save_index(self):
+        # caller holds self._lock; unique temp name, then atomic rename
+        fd, tmp = tempfile.mkstemp(prefix=".index.", suffix=".tmp", dir=self.root)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(self.index, indent=1))
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.voice_id}\0{_normalise(text)}".encode()).hexdigest()[:32]
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}.wav"
+
+    def get(self, text: str):
+        """Return the cached WAV path, or None."""
+        k = self.key(text)
+        with self._lock:
+            entry = self.index.get(k)
+            if entry is None or not self.path_for(k).exists():
+                self.misses += 1
+                return None
+            entry["last"] = time.time()
+            self.hits += 1
+            # no SD-card write per hit: "last" only orders eviction
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= self.save_every:
+                self._save_index()
+        return self.path_for(k)
+
+    def tmp_path(self, text: str) -> Path:
+        """Where to synthesize before put() (same filesystem, atomic rename)."""
+        return self.root / f".{self.key(text)}.{os.getpid()}.partial.wav"
+
+    def put(self, text: str, wav_path: Path) -> Path:
+        k = self.key(text)
+        dst = self.path_for(k)
+        os.replace(wav_path, dst)
+        with self._lock:
+            self.index[k] = {
+                "bytes": dst.stat().st_size,
+                "last": time.time(),
+                "text": _normalise(text)[:80],
+            }
+            self._evict()
+            self._save_index()
+        return dst
+
+    def _evict(self):
+        total = sum(e["bytes"] for e in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for k, e in sorted(self.index.items(), key=lambda kv: kv[1]["last"]):
+            if total <= self.max_bytes:
+                break
+            self.path_for(k).unlink(missing_ok=True)
+            total -= e["bytes"]
+            del self.index[k]
+
+    def flush(self):
+        """Persist LRU times updated by hits since the last save (call at close)."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum(e["bytes"] for e in self.index.values())
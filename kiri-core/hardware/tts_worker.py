@@ -0,0 +1,165 @@
+# hardware/tts_worker.py
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+
+
+def _worker_main(conn):
+    """Child process: load the Piper voice once, then serve requests."""
+    from hardware import piper_tts
+
+    try:
+        rate = piper_tts.voice_sample_rate()     # loads the voice
+    except Exception as e:
+        conn.send(("error", None, repr(e)))
+        return
+    conn.send(("ready", None, rate))
+
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            return
+        if msg is None:
+            return
+
+        req_id, text = msg
+        try:
+            for pcm in piper_tts.stream_pcm(text):
+                conn.send(("chunk", req_id, pcm))
+            conn.send(("done", req_id, None))
+        except Exception as e:
+            conn.send(("error", req_id, repr(e)))
+
+
+class SynthJob:
+    """PCM chunks of one request, iterable as they arrive from the worker."""
+
+    def __init__(self, worker, req_id):
+        self.worker = worker
+        self.req_id = req_id
+        self.chunks = queue.Queue()
+        self.cancelled = False
+
+    def cancel(self):
+        """Ignore the rest of this request's audio."""
+        self.cancelled = True
+
+    def __iter__(self):
+        while True:
+            item = self.chunks.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+class SynthWorker:
+    """
+    Piper in a long-lived child process (same interface as
+    piper_tts.InProcessSynth), so synthesis neither holds the main
+    interpreter's GIL nor competes with vision/control for it.
+
+    Requests are sent immediately and answered in order; PCM comes back
+    over a pipe and is buffered per request by a reader thread, so the
+    next utterance can be synthesized while the current one plays.
+    The worker is (re)started on demand.
+    """
+
+    def __init__(self, start_timeout: float = 60.0):
+        self.start_timeout = start_timeout
+        self.proc = None
+        self.conn = None
+        self.rate = None
+        self._jobs = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._ready = None
+
+    # ---------------- lifecycle ----------------
+    def start(self):
+        with self._lock:
+            if self.proc is None or not self.proc.is_alive():
+                ctx = mp.get_context("spawn")       # no fork of a threaded parent
+                parent, child = ctx.Pipe()
+                self.rate = None
+                self.proc = ctx.Process(target=_worker_main, args=(child,), daemon=True, name="piper-tts")
+                self.proc.start()
+                child.close()
+                self.conn = parent
+                self._ready = threading.Event()
+                threading.Thread(target=self._reader, args=(parent,), daemon=True).start()
+
+        if not self._ready.wait(self.start_timeout) or self.rate is None:
+            raise RuntimeError("Piper worker failed to start")
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                with self._send_lock:
+                    self.conn.send(None)
+            except OSError:
+                pass
+        if self.proc is not None:
+            self.proc.join(timeout=2.0)
+            if self.proc.is_alive():
+                self.proc.terminate()
+        self.proc = None
+
+    def _reader(self, conn):
+        while True:
+            try:
+                kind, req_id, payload = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if kind == "ready":
+                self.rate = payload
+                self._ready.set()
+                continue
+            if req_id is None:          # startup failure
+                print("[TTS worker]", payload)
+                self._ready.set()
+                continue
+
+            with self._lock:
+                job = self._jobs.get(req_id)
+                if job is not None and kind != "chunk":
+                    del self._jobs[req_id]
+            if job is None or job.cancelled:
+                continue
+            if kind == "chunk":
+                job.chunks.put(payload)
+            elif kind == "done":
+                job.chunks.put(None)
+            else:
+                job.chunks.put(RuntimeError(f"Piper synthesis failed: {payload}"))
+
+        # worker died: fail whatever is still pending
+        with self._lock:
+            jobs, self._jobs = self._jobs, {}
+        for job in jobs.values():
+            job.chunks.put(RuntimeError("Piper worker exited"))
+        self._ready.set()
+
+    # ---------------- synth interface ----------------
+    def warmup(self):
+        self.start()
+        for _ in self.stream("Ready."):
+            pass
+
+    def sample_rate(self) -> int:
+        self.start()
+        return self.rate
+
+    def stream(self, text: str) -> SynthJob:
+        self.start()
+        job = SynthJob(self, next(self._ids))
+        with self._lock:
+            self._jobs[job.req_id] = job
+        with self._send_lock:
+            self.conn.send((job.req_id, text))
+        return job
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Cross-process bus bridge benchmark.
+
+Hub in this process, publisher and subscriber in two spawned processes:
+
+    publisher ──► hub (local EventBus) ──► subscriber
+              1 hop                  2 hops
+
+Measures per-hop latency (CLOCK_MONOTONIC is shared between processes)
+and throughput for small events (fifo) and 640x480 RGB frames (latest),
+with frames sent via shared memory and inline for comparison. Latency
+is measured with paced publishers (1 kHz events, 30 fps frames);
+throughput with flooding ones and no subscriber in the hub process.
+
+    python labs/bus_bench.py
+    python labs/bus_bench.py --small 50000 --seconds 5
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from runtime.bus_bridge import BusHub, BusClient
+from runtime.event_bus import EventBus, FIFO, LATEST
+
+POLICIES = {"bench.small": FIFO, "bench.frame": LATEST, "bench.done": FIFO}
+
+
+def percentiles_us(lat):
+    if not lat:
+        return None
+    a = np.asarray(lat) * 1e6
+    return {"n": len(a), "p50_us": float(np.percentile(a, 50)), "p99_us": float(np.percentile(a, 99)),
+            "max_us": float(a.max())}
+
+
+# ---------- child processes ----------
+
+def _subscriber(path, topic, ready, results):
+    async def run():
+        rb = BusClient(path, policies=POLICIES)
+        lat, done = [], asyncio.Event()
+        t_first = []
+
+        def on_msg(data):
+            now = time.monotonic()
+            if not t_first:
+                t_first.append(now)
+            lat.append(now - data["t"])
+
+        rb.subscribe(topic, on_msg)
+        rb.subscribe("bench.done", lambda _: done.set())
+        await rb.connect()
+        await asyncio.sleep(0.2)      # let the SUB frames reach the hub
+        ready.set()
+        await done.wait()
+        span = time.monotonic() - t_first[0] if t_first else 0.0
+        results.put({"lat": lat, "span": span, "stats": rb.stats()})
+        await rb.close()
+    asyncio.run(run())
+
+
+def _publisher(path, topic, count, seconds, rate, frame_shape, use_shm, go, results):
+    async def run():
+        rb = BusClient(path, policies=POLICIES, use_shm=use_shm)
+        await rb.connect()
+        frame = np.random.default_rng(0).integers(0, 255, frame_shape, dtype=np.uint8) if frame_shape else None
+        go.wait()
+        t0 = time.monotonic()
+        sent = 0
+        while (count and sent < count) or (seconds and time.monotonic() - t0 < seconds):
+            data = {"t": time.monotonic(), "i": sent}
+            if frame is not None:
+                data["frame"] = frame
+                await asyncio.sleep(0)     # ~camera-like: let the writer run
+            await rb.publish(topic, data)
+            sent += 1
+            if rate:
+                await asyncio.sleep(max(0.0, t0 + sent / rate - time.monotonic()))
+            elif sent % 256 == 0:
+                await asyncio.sleep(0)
+        # wait for the outbox to drain, then tell the subscriber to stop
+        while rb.peer.outbox.ready:
+            await asyncio.sleep(0.001)
+        await rb.publish("bench.done", None)
+        await asyncio.sleep(0.2)
+        results.put({"sent": sent, "elapsed": time.monotonic() - t0})
+        await rb.close()
+    asyncio.run(run())
+
+
+# ---------- scenarios ----------
+
+async def scenario(name, topic, count=0, seconds=0.0, rate=0.0, frame_shape=None, use_shm=True, local=True):
+    ctx = mp.get_context("spawn")
+    path = os.path.join(tempfile.mkdtemp(), "bus.sock")
+    bus = EventBus(POLICIES)
+    hop1 = []
+    if local:
+        bus.subscribe(topic, lambda d: hop1.append(time.monotonic() - d["t"]))
+    hub = await BusHub(bus, path).start()
+
+    ready, go = ctx.Event(), ctx.Event()
+    sub_q, pub_q = ctx.Queue(), ctx.Queue()
+    sub = ctx.Process(target=_subscriber, args=(path, topic, ready, sub_q))
+    pub = ctx.Process(target=_publisher, args=(path, topic, count, seconds, rate, frame_shape, use_shm, go, pub_q))
+    sub.start()
+    pub.start()
+    await asyncio.get_running_loop().run_in_executor(None, ready.wait)
+    go.set()
+
+    loop = asyncio.get_running_loop()
+    p = await loop.run_in_executor(None, pub_q.get)
+    s = await loop.run_in_executor(None, sub_q.get)
+    pub.join()
+    sub.join()
+    await hub.close()
+
+    return {
+        "scenario": name,
+        "sent": p["sent"],
+        "received": len(s["lat"]),
+        "publish_rate_hz": p["sent"] / p["elapsed"],
+        "receive_rate_hz": len(s["lat"]) / s["span"] if s["span"] else None,
+        "hop1_latency": percentiles_us(hop1),
+        "hop2_latency": percentiles_us(s["lat"]),
+        "subscriber": s["stats"],
+    }
+
+
+async def main_async(args):
+    shape = (480, 640, 3)
+    s = args.seconds
+    return [
+        await scenario("events 1kHz", "bench.small", seconds=s, rate=1000),
+        await scenario("events flood", "bench.small", count=args.small, local=False),
+        await scenario("frames shm 30fps", "bench.frame", seconds=s, rate=30, frame_shape=shape),
+        await scenario("frames inline 30fps", "bench.frame", seconds=s, rate=30, frame_shape=shape,
+                       use_shm=False),
+        await scenario("frames shm flood", "bench.frame", seconds=s, frame_shape=shape, local=False),
+        await scenario("frames inline flood", "bench.frame", seconds=s, frame_shape=shape,
+                       use_shm=False, local=False),
+    ]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bus bridge latency/throughput benchmark")
+    ap.add_argument("--small", type=int, default=20000, help="Small events to send")
+    ap.add_argument("--seconds", type=float, default=3.0, help="Duration of the paced and frame scenarios")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args(argv)
+
+    rows = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    for r in rows:
+        h1, h2 = r["hop1_latency"] or {}, r["hop2_latency"] or {}
+        print(f"{r['scenario']:22s} sent={r['sent']:6d} recv={r['received']:6d} "
+              f"pub={r['publish_rate_hz']:8.0f}/s recv={r['receive_rate_hz'] or 0:8.0f}/s  "
+              f"1-hop p50={h1.get('p50_us', float('nan')):7.0f}us p99={h1.get('p99_us', float('nan')):7.0f}us  "
+              f"2-hop p50={h2.get('p50_us', 0):7.0f}us p99={h2.get('p99_us', 0):7.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Float32 vs INT8 embedder accuracy, latency and memory.
+
+Input: aligned 112x112 faces, one sub-folder per identity:
+
+    faces_aligned/
+      anna/ 0001.png 0002.png ...
+      bob/  ...
+
+    python labs/embedder_accuracy.py faces_aligned/
+    python labs/embedder_accuracy.py faces_aligned/ --thresh 0.65 --out acc.json
+
+For each model: genuine (same person) and impostor similarity
+distributions, verification rate (TAR) and false-accept rate at the
+threshold, per-embed latency and RSS growth from loading the session.
+Also reports how close INT8 embeddings are to float32 ones per image and
+the gallery size in float32 vs float16.
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from perception.face_embedder import FaceEmbedder
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def rss_mb():
+    """Resident set size from /proc (Linux), None elsewhere."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return None
+
+
+def load_faces(src: Path, per_id: int):
+    labels, images = [], []
+    for person in sorted(p for p in src.iterdir() if p.is_dir()):
+        files = sorted(f for f in person.iterdir() if f.suffix.lower() in IMAGE_EXTS)[:per_id]
+        for f in files:
+            img = cv2.imread(str(f))
+            if img is not None:
+                labels.append(person.name)
+                images.append(img)
+    return np.array(labels), images
+
+
+def embed_all(model_path, images, threads):
+    before = rss_mb()
+    emb = FaceEmbedder(model_path, threads=threads)
+    emb.warmup()
+    after = rss_mb()
+    times, vecs = [], []
+    for img in images:
+        t0 = time.perf_counter()
+        vecs.append(emb.embed(img))
+        times.append(time.perf_counter() - t0)
+    t = np.asarray(times) * 1000.0
+    return np.stack(vecs), {
+        "model": str(model_path),
+        "file_mb": Path(model_path).stat().st_size / 1e6,
+        "session_rss_mb": (after - before) if before is not None and after is not None else None,
+        "embed_ms_p50": float(np.percentile(t, 50)),
+        "embed_ms_p95": float(np.percentile(t, 95)),
+    }
+
+
+def pair_scores(vecs, labels):
+    """Genuine and impostor cosine similarities over all distinct pairs."""
+    sims = vecs @ vecs.T
+    iu = np.triu_indices(len(labels), k=1)
+    same = labels[iu[0]] == labels[iu[1]]
+    s = sims[iu]
+    return s[same], s[~same]
+
+
+def verification(genuine, impostor, thresh):
+    def dist(a):
+        if not len(a):
+            return None
+        return {"n": int(len(a)), "mean": float(a.mean()), "std": float(a.std()),
+                "p05": float(np.percentile(a, 5)), "p95": float(np.percentile(a, 95))}
+    return {
+        "genuine": dist(genuine),
+        "impostor": dist(impostor),
+        "tar": float(np.mean(genuine >= thresh)) if len(genuine) else None,
+        "far": float(np.mean(impostor >= thresh)) if len(impostor) else None,
+        # d' : separation of the two distributions
+        "d_prime": float((genuine.mean() - impostor.mean()) /
+                         np.sqrt(0.5 * (genuine.var() + impostor.var()) + 1e-12))
+                   if len(genuine) and len(impostor) else None,
+    }
+
+
+def main(argv=None):
+    from config.models import EMBEDDER, EMBEDDER_INT8
+    ap = argparse.ArgumentParser(description="Compare float32 and INT8 face embedders")
+    ap.add_argument("faces", type=Path, help="Aligned faces, one sub-folder per identity")
+    ap.add_argument("--fp32", type=Path, default=None)
+    ap.add_argument("--int8", type=Path, default=None)
+    ap.add_argument("--thresh", type=float, default=0.65, help="Similarity threshold (FaceDB.infer: 1 - 0.35)")
+    ap.add_argument("--per-id", type=int, default=20, help="Max images per identity")
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--out", type=Path, default=None)
+    args = ap.parse_args(argv)
+
+    labels, images = load_faces(args.faces, args.per_id)
+    if len(set(labels)) < 2:
+        raise SystemExit("[acc] need at least two identities")
+    print(f"[acc] {len(images)} faces, {len(set(labels))} identities")
+
+    report, vecs = {"threshold": args.thresh}, {}
+    for key, path in (("fp32", args.fp32 or EMBEDDER), ("int8", args.int8 or EMBEDDER_INT8)):
+        if not Path(path).exists():
+            print(f"[acc] {key}: {path} missing, skipped")
+            continue
+        vecs[key], perf = embed_all(path, images, args.threads)
+        report[key] = {**perf, **verification(*pair_scores(vecs[key], labels), args.thresh)}
+
+    if "fp32" in vecs and "int8" in vecs:
+        agree = np.sum(vecs["fp32"] * vecs["int8"], axis=1)
+        report["fp32_vs_int8_cosine"] = {"mean": float(agree.mean()), "min": float(agree.min())}
+        if report["fp32"]["embed_ms_p50"]:
+            report["speedup"] = report["fp32"]["embed_ms_p50"] / report["int8"]["embed_ms_p50"]
+
+    # gallery storage: float32 vs float16 templates, and what float16 does to scores
+    any_vecs = next(iter(vecs.values()), None)
+    if any_vecs is not None:
+        half = any_vecs.astype(np.float16).astype(np.float32)
+        report["gallery"] = {
+            "templates": len(any_vecs),
+            "fp32_kb": any_vecs.astype(np.float32).nbytes / 1024,
+            "fp16_kb": any_vecs.astype(np.float16).nbytes / 1024,
+            "fp16_max_score_err": float(np.max(np.abs(any_vecs @ any_vecs.T - half @ any_vecs.T))),
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        args.out.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
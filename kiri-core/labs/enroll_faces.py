@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Bulk FaceDB enrollment.
+
+Input is one folder per person with photos and/or short videos:
+
+    people/
+      anna/  img1.jpg img2.jpg clip.mp4
+      bob/   ...
+
+    python labs/enroll_faces.py people/ --db data/faces --workers 4
+    python labs/enroll_faces.py people/ --db data/faces --prototypes 8 --replace
+
+Detect + align + embed runs in a process pool (each worker loads YuNet and
+the embedder once). Faces that are too small, blurry or low-confidence are
+rejected, near-duplicate embeddings are dropped, and each person can
+optionally be compacted to k-means prototypes. A held-out split measures
+rank-1 accuracy and search time before/after compaction.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from perception.face_align import align_by_5pts
+from perception.face_db import FaceDB
+from perception.face_embedder import FaceEmbedder
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
+VIDEO_EXTS = {".mp4", ".avi", ".mov", ".mkv", ".h264"}
+
+# ---------- worker side ----------
+
+_refiner = None
+_embedder = None
+_quality = None
+
+
+def _init_worker(yunet, embedder, quality):
+    global _refiner, _embedder, _quality
+    # the pool provides the parallelism: one OpenCV and one onnxruntime
+    # intra-op thread per worker, or N workers would each spawn N threads
+    cv2.setNumThreads(1)
+    from perception.face_refiner import FaceRefiner
+    _refiner = FaceRefiner(str(yunet))
+    _embedder = FaceEmbedder(embedder, threads=1)
+    _quality = quality
+
+
+def _frames(path: Path, video_step: int):
+    if path.suffix.lower() in IMAGE_EXTS:
+        img = cv2.imread(str(path))
+        if img is not None:
+            yield img
+        return
+    cap = cv2.VideoCapture(str(path))
+    i = 0
+    while True:
+        ok, bgr = cap.read()
+        if not ok:
+            break
+        if i % video_step == 0:
+            yield bgr
+        i += 1
+    cap.release()
+
+
+def blur_score(aligned_bgr):
+    """Variance of the Laplacian on the aligned crop: low = blurry."""
+    gray = cv2.cvtColor(aligned_bgr, cv2.COLOR_BGR2GRAY)
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def _process(job):
+    """(name, path, video_step) -> (name, [embeddings], {reject reason: count})"""
+    name, path, video_step = job
+    embs, rejects = [], {}
+
+    def reject(why):
+        rejects[why] = rejects.get(why, 0) + 1
+
+    for bgr in _frames(Path(path), video_step):
+        faces = _refiner.detect_faces(bgr)
+        if not faces:
+            reject("no_face")
+            continue
+        # enrollment photos should show one person; take the largest face
+        face = max(faces, key=lambda f: f["box"][2] * f["box"][3])
+        if min(face["box"][2], face["box"][3]) < _quality["min_size"]:
+            reject("small")
+            continue
+        if face.get("score", 1.0) < _quality["min_score"]:
+            reject("low_score")
+            continue
+        aligned = align_by_5pts(bgr, face["kps"])
+        if blur_score(aligned) < _quality["min_blur"]:
+            reject("blurry")
+            continue
+        embs.append(_embedder.embed(aligned))
+    return name, embs, rejects
+
+
+# ---------- gallery maths ----------
+
+def dedupe(embs, thresh):
+    """Greedy near-duplicate removal: keep a vector only if its cosine to every kept one is < thresh."""
+    kept = []
+    for e in embs:
+        if kept and float(np.max(np.stack(kept) @ e)) >= thresh:
+            continue
+        kept.append(e)
+    return kept
+
+
+def kmeans_prototypes(embs, k, iters=20, seed=0):
+    """Spherical k-means: returns up to k L2-normalised centroids."""
+    x = np.stack(embs).astype(np.float32)
+    k = min(k, len(x))
+    rng = np.random.default_rng(seed)
+    c = x[rng.choice(len(x), k, replace=False)]
+    for _ in range(iters):
+        assign = np.argmax(x @ c.T, axis=1)
+        new = np.stack([x[assign == j].sum(0) if np.any(assign == j) else c[j] for j in range(k)])
+        new /= np.linalg.norm(new, axis=1, keepdims=True) + 1e-9
+        if np.allclose(new, c, atol=1e-5):
+            break
+        c = new
+    return list(c)
+
+
+def evaluate(gallery, probes):
+    """
+    gallery: {name: [emb]}, probes: [(name, emb)].
+    Returns rank-1 accuracy and mean per-query search time (ms).
+    """
+    names = [n for n, embs in gallery.items() for _ in embs]
+    if not names or not probes:
+        return {"templates": len(names), "probes": len(probes), "acc": None, "search_ms": None}
+    m = np.stack([e for embs in gallery.values() for e in embs]).astype(np.float32)
+    hits, t0 = 0, time.perf_counter()
+    for name, q in probes:
+        if names[int(np.argmax(m @ q))] == name:
+            hits += 1
+    dt = time.perf_counter() - t0
+    return {
+        "templates": len(names),
+        "probes": len(probes),
+        "acc": hits / len(probes),
+        "search_ms": dt / len(probes) * 1000.0,
+    }
+
+
+def split_probes(per_person, frac, seed=0):
+    """Hold out `frac` of each person's embeddings (people with < 2 keep everything)."""
+    rng = np.random.default_rng(seed)
+    train, probes = {}, []
+    for name, embs in per_person.items():
+        idx = rng.permutation(len(embs))
+        n_probe = int(len(embs) * frac) if len(embs) >= 2 else 0
+        probes += [(name, embs[i]) for i in idx[:n_probe]]
+        train[name] = [embs[i] for i in idx[n_probe:]]
+    return train, probes
+
+
+# ---------- driver ----------
+
+def collect_jobs(src: Path, video_step: int):
+    jobs = []
+    for person in sorted(p for p in src.iterdir() if p.is_dir()):
+        for f in sorted(person.iterdir()):
+            if f.suffix.lower() in IMAGE_EXTS | VIDEO_EXTS:
+                jobs.append((person.name, str(f), video_step))
+    return jobs
+
+
+def enroll(src, db_root, workers=None, quality=None, dedup=0.95, prototypes=0,
+           holdout=0.2, video_step=5, replace=False, yunet=None, embedder=None, prefer_int8=True):
+    from config.models import YUNET
+    # templates must come from the same model recognition uses at runtime
+    embedder = embedder or FaceEmbedder.default_path(prefer_int8)
+    print(f"[enroll] embedder {embedder}")
+    quality = quality or {"min_size": 60, "min_score": 0.6, "min_blur": 60.0}
+    jobs = collect_jobs(Path(src), video_step)
+    if not jobs:
+        raise SystemExit(f"[enroll] no images/videos under {src}")
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+
+    t0 = time.perf_counter()
+    per_person, rejects, raw = {}, {}, 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(yunet or YUNET, embedder, quality)) as pool:
+        for name, embs, rej in pool.map(_process, jobs, chunksize=4):
+            per_person.setdefault(name, []).extend(embs)
+            raw += len(embs)
+            for k, v in rej.items():
+                rejects[k] = rejects.get(k, 0) + v
+    t_embed = time.perf_counter() - t0
+    print(f"[enroll] {len(jobs)} files -> {raw} faces in {t_embed:.1f}s ({workers} workers), rejected {rejects}")
+
+    per_person = {n: dedupe(e, dedup) for n, e in per_person.items() if e}
+    train, probes = split_probes(per_person, holdout)
+
+    report = {
+        "files": len(jobs),
+        "accepted": raw,
+        "rejected": rejects,
+        "after_dedupe": sum(len(e) for e in per_person.values()),
+        "embed_s": round(t_embed, 2),
+        "full": evaluate(train, probes),
+    }
+
+    final = per_person
+    if prototypes:
+        compact = {n: kmeans_prototypes(e, prototypes) for n, e in train.items() if e}
+        report["prototypes"] = evaluate(compact, probes)
+        final = {n: kmeans_prototypes(e, prototypes) for n, e in per_person.items()}
+
+    db = FaceDB(Path(db_root))
+    report["gallery_before"] = db.size()
+    for name, embs in final.items():
+        if replace:
+            db.replace(name, embs)
+        else:
+            db.add_many(name, embs)
+    report["gallery_after"] = db.size()
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bulk-enroll faces into a FaceDB")
+    ap.add_argument("src", type=Path, help="Folder with one sub-folder per person")
+    ap.add_argument("--db", type=Path, required=True, help="FaceDB root")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--min-size", type=int, default=60, help="Min face box side (px)")
+    ap.add_argument("--min-score", type=float, default=0.6, help="Min YuNet score")
+    ap.add_argument("--min-blur", type=float, default=60.0, help="Min Laplacian variance of aligned crop")
+    ap.add_argument("--dedup", type=float, default=0.95, help="Cosine above which embeddings are duplicates")
+    ap.add_argument("--prototypes", type=int, default=0, help="Compact each person to k prototypes (0 = keep all)")
+    ap.add_argument("--holdout", type=float, default=0.2, help="Fraction held out for the accuracy report")
+    ap.add_argument("--video-step", type=int, default=5, help="Use every Nth video frame")
+    ap.add_argument("--replace", action="store_true", help="Replace existing templates of enrolled people")
+    ap.add_argument("--embedder", default=None, help="Embedder ONNX (default: INT8 if generated, else float32)")
+    ap.add_argument("--fp32", action="store_true", help="Use the float32 embedder even if the INT8 one exists")
+    ap.add_argument("--out", type=Path, default=None, help="Write the JSON report here")
+    args = ap.parse_args(argv)
+
+    report = enroll(
+        args.src, args.db, workers=args.workers,
+        quality={"min_size": args.min_size, "min_score": args.min_score, "min_blur": args.min_blur},
+        dedup=args.dedup, prototypes=args.prototypes, holdout=args.holdout,
+        video_step=args.video_step, replace=args.replace,
+        embedder=args.embedder, prefer_int8=not args.fp32,
+    )
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        args.out.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
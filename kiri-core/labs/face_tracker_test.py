@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
+import argparse
 import asyncio
+import time
 import cv2
 
 from hardware.swivel import SwivelController
@@ -11,61 +13,262 @@ from perception.face_refiner import FaceRefiner
 from hardware.imx500_detector import IMX500Detector
 from config.models import YUNET
 from runtime.web_preview import start_web_preview
+from runtime.state import State
+from runtime.scheduler import Scheduler
+from runtime.recorder import SessionRecorder
+from runtime.startup import Startup
+from runtime.idle_governor import IdleGovernor
+from runtime.perception_governor import LatencyGovernor
+from runtime.sysmon import SysMon
+from runtime.trace import TRACE
+from runtime.loop_monitor import LoopMonitor
+from perception.frame_diff import FrameDiff
+from perception.static_gate import StaticSceneGate
+from perception.face_tracks import FaceTrackManager
+from perception.person_head import PersonHeadTracker
 
+PERSON = 0          # COCO class id
+FULL_FPS = 30
+IDLE_FPS = 5
 
-class State:
-    def __init__(self):
-        self.frame = None
-        self.faces = []
 
+async def perception_loop(state, cam, fr, recorder=None, governor=None, budget=None, gate=None, moving_fn=None):
+    diff = FrameDiff()
+    tracks = FaceTrackManager()
 
-async def perception_loop(state, cam, fr):
     while True:
-        frame_rgb = cam.capture_rgb()
-        frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+        TRACE.new_frame()
+        person = False
+        with TRACE.span("capture"):
+            if governor and governor.idle:
+                # idle: also look at the IMX500's (free) person detections
+                frame_rgb, dets = cam.capture_rgb_and_detections()
+                person = any(d.category == PERSON for d in dets)
+            else:
+                frame_rgb = cam.capture_rgb()
+        t_capture = time.monotonic()
+        with TRACE.span("convert"):
+            frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
 
-        faces = fr.detect_faces(frame)
+        # record every frame, including the ones the early-outs below skip,
+        # so a replay sees the real scene (detections only where YuNet ran)
+        seq = recorder.record_frame(frame, t_capture) if recorder else None
 
-        state.frame = frame
-        state.faces = faces
+        if governor:
+            # against the last frame detection ran on, so slow motion adds up
+            moved = diff.changed(frame, update=False)
+            if governor.idle and not (person or moved or governor.detect_due(t_capture)):
+                state.frame = frame         # keep the preview alive, skip YuNet
+                await asyncio.sleep(0)
+                continue
+
+        # latency budget: cadence, input scale and boost follow the operating point
+        point = budget.point if budget else None
+        if budget and not budget.detect_due():
+            state.frame = frame
+            await asyncio.sleep(0)
+            continue
+
+        # static scene + still head: reuse the last detections (with their age)
+        if gate and not gate.should_detect(frame, t_capture, moving=moving_fn() if moving_fn else False):
+            state.publish_faces(frame, gate.reuse(t_capture), t_capture,
+                                tracks=state.tracks, attention=state.attention)
+            await asyncio.sleep(0)
+            continue
+
+        with TRACE.span("detect"):
+            if point:
+                faces = fr.detect_faces(frame, scale=point["scale"], allow_boost=point["boost"])
+            else:
+                faces = fr.detect_faces(frame)
+
+        if gate:
+            gate.store(faces, t_capture)
+
+        if governor:
+            diff.accept()
+            governor.note_detect(t_capture)
+            governor.update(t_capture, face=bool(faces), person=person, motion=moved)
+
+        if recorder:
+            recorder.record_detections(seq, faces, t_capture)
+
+        with TRACE.span("track_select"):
+            confirmed = tracks.update(faces, t_capture)
+        state.publish_faces(frame, faces, t_capture, tracks=confirmed, attention=tracks.attention)
+
+        if budget:
+            now = time.monotonic()
+            budget.observe(now - t_capture, now)
 
         await asyncio.sleep(0)
 
 
-async def main():
+async def person_loop(state, cam, fr, heads, want_faces_fn=None, preview_hz=5.0):
+    """
+    IMX500-only tracking: the head follows person boxes from the sensor's
+    metadata. Pixels are only fetched for the preview (preview_hz) and,
+    with YuNet on them, while someone is close or faces are wanted.
+    """
+    faces_tracks = FaceTrackManager()
+    frame, t_frame = None, 0.0
+
+    while True:
+        TRACE.new_frame()
+        want = heads.near or bool(want_faces_fn and want_faces_fn())
+        fresh = want or frame is None or time.monotonic() - t_frame >= 1.0 / preview_hz
+        with TRACE.span("capture"):
+            if fresh:
+                frame_rgb, dets = cam.capture_rgb_and_detections()
+            else:
+                dets = cam.get_detections()     # metadata only, blocks until the next frame
+        t_capture = time.monotonic()
+        if fresh:
+            with TRACE.span("convert"):
+                frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+            t_frame = t_capture
+
+        with TRACE.span("person"):
+            confirmed = heads.update(dets, t_capture)
+
+        if want and fresh:
+            with TRACE.span("detect"):
+                faces = fr.detect_faces(frame)
+            face_confirmed = faces_tracks.update(faces, t_capture)
+            # keep the face target through short YuNet misses (until the track
+            # is dropped after max_misses): falling back to the head estimate
+            # would switch track ids and reset TrackFace's filters every time
+            held = faces_tracks.tracks.get(faces_tracks.attention_id)
+            if held is not None:
+                state.publish_faces(frame, faces, t_capture, tracks=face_confirmed, attention=held)
+                await asyncio.sleep(0)
+                continue
+
+        state.publish_faces(frame, heads.faces(), t_capture,
+                            tracks=confirmed, attention=heads.attention)
+        await asyncio.sleep(0)
+
+
+async def main(record=None, idle_after=10.0, trace=False, budget_ms=40.0, static_gate=True,
+               person_mode=False):
     print("=== KIRI Face Tracker Test ===")
 
+    if trace:
+        TRACE.enable()
+    if TRACE.enabled:
+        TRACE.install_signal()
+        print("Tracing on: GET /trace on the preview port, or kill -USR1 this process")
+
+    recorder = SessionRecorder(record) if record else None
+    if recorder:
+        print(f"Recording session to {record}")
+
     state = State()
+    loop_mon = LoopMonitor().start()
+
+    def start_camera():
+        cam = IMX500Detector()
+        cam.start(show_preview=False)
+        return cam
 
-    cam = IMX500Detector()
-    cam.start(show_preview=False)
+    def load_yunet():
+        fr = FaceRefiner(YUNET)
+        fr.warmup()
+        return fr
 
-    fr = FaceRefiner(YUNET)
+    # Camera firmware upload, YuNet load and Arduino reset overlap
+    boot = Startup()
+    boot.add("camera", start_camera)
+    boot.add("yunet", load_yunet)
+    boot.add("swivel", lambda: SwivelController().open())
+    ready = await boot.run()
+    cam, fr, sw = ready["camera"], ready["yunet"], ready["swivel"]
 
-    sw = SwivelController().open()
     raw_motion = SwivelMotion(sw)        # your original class
     motion = SwivelMotionStable(raw_motion)
 
-    asyncio.create_task(raw_motion.loop())
-
     tracker = TrackFace(
         motion=motion,
         get_face_fn=lambda: get_best_face(state),
         pan_gain=-40.0,
-        tilt_gain=+35.0
+        tilt_gain=+35.0,
+        predictive=True,    # latency-compensated world-frame tracking
+        wait_new_fn=state.wait_faces,
     )
+
+    # One deadline scheduler for the servo loop; TrackFace reacts to
+    # new detections instead of polling
+    sched = Scheduler()
+
+    def motion_step():
+        result = raw_motion.step()
+        # idle: park the servo loop as soon as the head has settled
+        if governor and governor.idle and raw_motion.at_target():
+            sched.pause("motion")
+        return result
+
+    sched.add("motion", motion_step, hz=raw_motion.hz, priority=2)
+    asyncio.create_task(sched.run())
     asyncio.create_task(tracker.loop())
 
-    asyncio.create_task(perception_loop(state, cam, fr))
+    # Nobody around → lower frame rate, sparse detection, parked servo loop
+    # (motion_step parks it once the servo reaches its target)
+    def on_idle_change(idle):
+        cam.set_frame_rate(IDLE_FPS if idle else FULL_FPS)
+        if not idle:
+            sched.resume("motion")
+
+    governor = IdleGovernor(idle_after=idle_after, on_change=on_idle_change) if idle_after > 0 else None
+    sysmon = SysMon()
+    budget = LatencyGovernor(budget_ms) if budget_ms > 0 else None
+    gate = StaticSceneGate() if static_gate else None
+
+    heads = None
+    if person_mode:
+        # IMX500 person boxes steer the head; YuNet only runs when someone is close
+        heads = PersonHeadTracker(frame_size=cam.rgb_size)
+        if governor or budget or gate or recorder:
+            print("Person mode: idle governor, latency budget, static gate and recording are off")
+        governor = budget = gate = None
+        asyncio.create_task(person_loop(state, cam, fr, heads,
+                                        want_faces_fn=lambda: heads.needs_identity(time.monotonic())))
+    else:
+        asyncio.create_task(perception_loop(state, cam, fr, recorder, governor, budget,
+                                            gate=gate, moving_fn=lambda: not raw_motion.at_target()))
 
     await start_web_preview(state, port=8080)
 
     print("Move your head — KIRI is watching you!")
 
     while True:
-        await asyncio.sleep(1)
+        await asyncio.sleep(10)
+        print(sched.report())
+        print(sysmon.report() + (f"  idle={governor.idle}" if governor else ""))
+        print(loop_mon.report())
+        if budget:
+            print(budget.report())
+        if gate:
+            print(gate.report())
+        if heads:
+            print(heads.report() + f", YuNet ran {fr.stats()['calls']} times")
+        if recorder:
+            print(f"[rec] written={recorder.written} dropped={recorder.dropped}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--record", help="Record the session to this directory (replay with runtime/replay.py)")
+    ap.add_argument("--idle-after", type=float, default=10.0,
+                    help="Seconds without a face before throttling (0 = never idle)")
+    ap.add_argument("--trace", action="store_true",
+                    help="Per-frame span tracing (dump via /trace or SIGUSR1)")
+    ap.add_argument("--budget-ms", type=float, default=40.0,
+                    help="Per-frame perception latency budget (0 = fixed full quality)")
+    ap.add_argument("--no-static-gate", action="store_true",
+                    help="Run the detector on every frame, even when nothing changed")
+    ap.add_argument("--person-mode", action="store_true",
+                    help="Steer from IMX500 person boxes; CPU face detection only when someone is close")
+    args = ap.parse_args()
+    asyncio.run(main(args.record, args.idle_after, args.trace, args.budget_ms, not args.no_static_gate,
+                     args.person_mode))
 
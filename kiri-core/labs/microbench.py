@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the hot functions, with stored baselines.
+
+Synthetic inputs only (no camera, servo or model files):
+
+    python labs/microbench.py                  # run + compare with the baseline
+    python labs/microbench.py --save           # (re)write the baseline
+    python labs/microbench.py -k facedb -t 0.10
+
+A benchmark regresses when its median per-call time is more than
+--tolerance AND more than --min-delta-us slower than the baseline, and a
+Mann-Whitney U test says the two sample sets differ (p < --alpha).
+Exit status 1 on any regression, 2 if a benchmark with a baseline could
+not run (e.g. a missing import). Baselines are machine-specific, so none
+is committed: create one on the target (the Pi) with --save.
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+BASELINE = Path(__file__).with_name("microbench_baseline.json")
+
+# runnable as `python labs/microbench.py` from anywhere: the setups import project modules
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+BENCHES = {}
+
+
+def bench(name):
+    """Register a setup function returning the zero-arg callable to time."""
+    def deco(setup):
+        BENCHES[name] = setup
+        return setup
+    return deco
+
+
+# ---------- synthetic fixtures ----------
+
+def _frame(w=640, h=480, seed=0):
+    rng = np.random.default_rng(seed)
+    img = cv2.GaussianBlur(rng.integers(0, 255, (h, w, 3), dtype=np.uint8), (9, 9), 0)
+    cv2.ellipse(img, (320, 220), (70, 90), 0, 0, 360, (150, 170, 200), -1)
+    return img
+
+
+KPS = [(295, 200), (345, 200), (320, 230), (300, 260), (340, 260)]
+
+
+class _NullMotion:
+    current_pan = 90.0
+    current_tilt = 60.0
+
+    def set_target(self, pan, tilt):
+        pass
+
+
+class _FakeYuNet:
+    """Stands in for cv2.FaceDetectorYN: returns a fixed (N,15) result."""
+
+    def __init__(self, n=3):
+        rng = np.random.default_rng(1)
+        d = np.zeros((n, 15), dtype=np.float32)
+        d[:, 0:2] = rng.uniform(0, 500, (n, 2))
+        d[:, 2:4] = rng.uniform(40, 120, (n, 2))
+        d[:, 4:14] = rng.uniform(0, 600, (n, 10))
+        d[:, 14] = rng.uniform(0.5, 1.0, n)
+        self.dets = d
+
+    def setInputSize(self, size):
+        pass
+
+    def setScoreThreshold(self, s):
+        pass
+
+    def detect(self, img):
+        return 1, self.dets
+
+
+class _FakeIMX500:
+    """get_outputs / get_input_size / convert_inference_coords of picamera2's IMX500."""
+
+    def __init__(self, n=300):
+        rng = np.random.default_rng(2)
+        self.outputs = [
+            rng.uniform(0, 1, (1, n, 4)).astype(np.float32),
+            rng.uniform(0, 0.5, (1, n)).astype(np.float32),
+            rng.integers(0, 80, (1, n)).astype(np.float32),
+        ]
+
+    def get_outputs(self, metadata, add_batch=True):
+        # the parser scales boxes in place: hand out fresh copies
+        return [o.copy() for o in self.outputs]
+
+    def get_input_size(self):
+        return 640, 640
+
+    def convert_inference_coords(self, coords, metadata, picam2):
+        x, y, w, h = coords
+        return int(x), int(y), int(w), int(h)
+
+
+class _Intrinsics:
+    bbox_normalization = True
+    postprocess = ""
+    labels = [str(i) for i in range(80)]
+
+
+# ---------- benchmarks ----------
+
+@bench("trackface.smooth_box")
+def _():
+    from behaviour.track_face import TrackFace
+    tf = TrackFace(_NullMotion(), lambda: None)
+    boxes = [(300, 200, 80, 80), (304, 202, 81, 79), (340, 210, 80, 80)]
+    state = {"i": 0}
+
+    def run():
+        state["i"] += 1
+        tf._smooth_box(boxes[state["i"] % 3])
+    return run
+
+
+@bench("trackface.update")
+def _():
+    from behaviour.track_face import TrackFace
+    tf = TrackFace(_NullMotion(), lambda: None, pan_gain=-40.0)
+    faces = [(300, 200, 80, 80, 640, 480), (340, 210, 80, 80, 640, 480)]
+    state = {"i": 0, "t": 0.0}
+
+    def run():
+        state["i"] += 1
+        state["t"] += 0.033
+        tf.update(faces[state["i"] % 2], state["t"])
+    return run
+
+
+@bench("trackface.update_predictive")
+def _():
+    from behaviour.track_face import TrackFace
+    tf = TrackFace(_NullMotion(), lambda: None, pan_gain=-40.0, predictive=True)
+    state = {"i": 0, "t": 0.0}
+
+    def run():
+        state["i"] += 1
+        state["t"] += 0.033
+        t = state["t"]
+        tf.update((300 + state["i"] % 20, 200, 80, 80, 640, 480, t - 0.05, 1), t)
+    return run
+
+
+@bench("stable.set_target")
+def _():
+    from motion.swivel_stable import SwivelMotionStable
+    st = SwivelMotionStable(_NullMotion())
+    targets = [(90.0, 60.0), (95.0, 62.0), (88.0, 58.0)]
+    state = {"i": 0}
+
+    def run():
+        state["i"] += 1
+        st.set_target(*targets[state["i"] % 3])
+    return run
+
+
+@bench("motion.step_towards")
+def _():
+    from motion.swivel_motion import SwivelMotion
+    m = SwivelMotion(controller=None)
+    return lambda: m._step_towards(90.0, 120.0, 1 / 30)
+
+
+@bench("refiner.run_parse")
+def _():
+    from perception.face_refiner import FaceRefiner
+    fr = FaceRefiner.__new__(FaceRefiner)   # skip the model load
+    fr._init_fallback()
+    fr.det = _FakeYuNet()
+    img = _frame()
+    return lambda: fr._run(img, score=0.3)
+
+
+@bench("refiner.preproc_boost")
+def _():
+    from perception.face_refiner import FaceRefiner
+    fr = FaceRefiner.__new__(FaceRefiner)
+    fr._init_fallback()
+    img = _frame()
+    return lambda: fr._preproc_boost(img)
+
+
+@bench("align_by_5pts")
+def _():
+    from perception.face_align import align_by_5pts
+    img = _frame()
+    return lambda: align_by_5pts(img, KPS)
+
+
+@bench("embedder.preprocess")
+def _():
+    from perception.face_embedder import FaceEmbedder
+    emb = FaceEmbedder.__new__(FaceEmbedder)   # preprocess needs no session
+    face = _frame(112, 112)
+    return lambda: emb.preprocess(face)
+
+
+def _facedb(size):
+    def setup():
+        from perception.face_db import FaceDB
+        rng = np.random.default_rng(3)
+        tmp = tempfile.TemporaryDirectory()
+        db = FaceDB(Path(tmp.name))
+        for i in range(0, size, 50):
+            db.add_many(f"p{i // 50}", rng.standard_normal((min(50, size - i), 512)).astype(np.float32))
+        db.matrix()        # build the cache outside the timed region
+        q = rng.standard_normal(512).astype(np.float32)
+        run = lambda: db.infer(q)
+        run.keep = tmp     # keep the directory alive while benchmarking
+        return run
+    return setup
+
+
+for _n in (100, 1000, 10000):
+    bench(f"facedb.infer[{_n}]")(_facedb(_n))
+
+
+@bench("imx500.parse_detections")
+def _():
+    from hardware.imx500_detector import IMX500Detector
+    det = IMX500Detector.__new__(IMX500Detector)   # no camera
+    det.imx500 = _FakeIMX500()
+    det.intrinsics = _Intrinsics()
+    det.picam2 = None
+    det.last_detections = []
+    return lambda: det._parse_detections({})
+
+
+@bench("mjpeg.encode")
+def _():
+    from perception.preview import encode_frame
+    img = _frame()
+    faces = [{"box": [280, 150, 90, 110]}]
+    return lambda: encode_frame(img, faces)
+
+
+# ---------- timing + statistics ----------
+
+def measure(fn, repeat=15, min_sample_s=0.02, tiny_s=5e-6, tiny_sample_s=0.1):
+    """
+    Per-call seconds for `repeat` samples, each looping `fn` for >= min_sample_s
+    (>= tiny_sample_s for calls under tiny_s: timer and scheduler noise
+    dominate short samples of sub-microsecond functions).
+    """
+    fn()  # warm caches / lazy imports
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= min_sample_s:
+            break
+        number *= 2 if dt == 0 else max(2, int(min_sample_s / dt * 1.2))
+    if dt / number < tiny_s:
+        number = max(number, int(number * tiny_sample_s / dt))
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return samples
+
+
+def mann_whitney_p(a, b):
+    """Two-sided Mann-Whitney U p-value (normal approximation, tie-corrected)."""
+    a, b = np.asarray(a), np.asarray(b)
+    n1, n2 = len(a), len(b)
+    both = np.concatenate([a, b])
+    order = both.argsort()
+    ranks = np.empty(len(both))
+    ranks[order] = np.arange(1, len(both) + 1)
+    # average ranks of ties
+    vals, inv, counts = np.unique(both, return_inverse=True, return_counts=True)
+    if np.any(counts > 1):
+        sums = np.bincount(inv, weights=ranks)
+        ranks = (sums / counts)[inv]
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    tie = (counts ** 3 - counts).sum() / (n * (n - 1)) if n > 1 else 0.0
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - tie))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2.0) / sigma
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def summarize(samples):
+    a = np.asarray(samples)
+    q1, med, q3 = np.percentile(a, [25, 50, 75])
+    return {"median_us": med * 1e6, "iqr_us": (q3 - q1) * 1e6, "samples_us": [s * 1e6 for s in samples]}
+
+
+def machine():
+    return {"machine": platform.machine(), "python": platform.python_version(), "opencv": cv2.__version__}
+
+
+def run(names, repeat):
+    results, skipped = {}, {}
+    for name in names:
+        try:
+            fn = BENCHES[name]()
+        except ImportError as e:
+            skipped[name] = str(e)
+            print(f"  {name:32s} skipped ({e})")
+            continue
+        results[name] = summarize(measure(fn, repeat))
+        print(f"  {name:32s} {results[name]['median_us']:10.2f} us  (iqr {results[name]['iqr_us']:.2f})")
+    return results, skipped
+
+
+def compare(results, baseline, tolerance, alpha, min_delta_us=0.5):
+    """Returns the names that regressed."""
+    regressed = []
+    print(f"\n{'benchmark':32s} {'base us':>10s} {'now us':>10s} {'change':>8s}  p")
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:32s} {'-':>10s} {cur['median_us']:10.2f}    (new)")
+            continue
+        change = cur["median_us"] / base["median_us"] - 1.0
+        p = mann_whitney_p(base["samples_us"], cur["samples_us"])
+        delta = cur["median_us"] - base["median_us"]
+        bad = change > tolerance and delta > min_delta_us and p < alpha
+        faster = change < -tolerance and -delta > min_delta_us and p < alpha
+        flag = "  REGRESSED" if bad else ("  faster" if faster else "")
+        print(f"{name:32s} {base['median_us']:10.2f} {cur['median_us']:10.2f} {change:+7.1%}  {p:.3f}{flag}")
+        if bad:
+            regressed.append(name)
+    return regressed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="KIRI hot-path microbenchmarks")
+    ap.add_argument("-k", "--filter", default="", help="Only run benchmarks containing this text")
+    ap.add_argument("-t", "--tolerance", type=float, default=0.15, help="Allowed slowdown (0.15 = 15%%)")
+    ap.add_argument("--alpha", type=float, default=0.01, help="Significance level of the U test")
+    ap.add_argument("--min-delta-us", type=float, default=0.5,
+                    help="Ignore slowdowns smaller than this in absolute terms")
+    ap.add_argument("--repeat", type=int, default=15, help="Samples per benchmark")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    args = ap.parse_args(argv)
+
+    cv2.setNumThreads(1)   # the Pi pipeline is effectively single-threaded per stage
+    names = [n for n in BENCHES if args.filter in n]
+    print(f"[microbench] {len(names)} benchmarks on {platform.machine()}")
+    results, skipped = run(names, args.repeat)
+
+    if args.save:
+        data = {"machine": machine(), "benchmarks": results}
+        if args.baseline.exists():
+            # keep entries that were filtered out or skipped this time
+            old = json.loads(args.baseline.read_text()).get("benchmarks", {})
+            data["benchmarks"] = {**old, **results}
+        args.baseline.write_text(json.dumps(data, indent=1))
+        print(f"[microbench] baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("[microbench] no baseline yet (run with --save)")
+        return 0
+    stored = json.loads(args.baseline.read_text())
+    if stored.get("machine", {}).get("machine") != platform.machine():
+        print(f"[microbench] warning: baseline recorded on {stored.get('machine')}, comparing anyway")
+    baseline = stored.get("benchmarks", {})
+    regressed = compare(results, baseline, args.tolerance, args.alpha, args.min_delta_us)
+    if regressed:
+        print(f"\n[microbench] {len(regressed)} regression(s): {', '.join(regressed)}")
+        return 1
+    # a gate that ran nothing must not pass
+    missing = [n for n in skipped if n in baseline]
+    if missing:
+        print(f"\n[microbench] {len(missing)} benchmark(s) with a baseline did not run: {', '.join(missing)}")
+        return 2
+    print("\n[microbench] no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
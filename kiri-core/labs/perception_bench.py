@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+End-to-end perception throughput benchmark.
+
+Feeds images, a video file or a recorded session (runtime/recorder.py)
+through the real face pipeline and prints machine-readable JSON:
+
+    python labs/perception_bench.py path/to/frames/ --gallery 500 --out bench.json
+    python labs/perception_bench.py clip.mp4 --max-frames 300
+    python labs/perception_bench.py sessions/2025-06-01/
+"""
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from config.models import YUNET
+from perception.face_refiner import FaceRefiner
+from perception.face_align import align_by_5pts
+from perception.face_db import FaceDB
+from perception.face_provider import get_best_face
+from runtime.state import State
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def iter_frames(src: Path, max_frames=None):
+    """Yield RGB frames (as the camera delivers them)."""
+    n = 0
+    if src.is_dir() and (src / "index.jsonl").exists():
+        from runtime.recorder import SessionLog
+        log = SessionLog(src)
+        # recorded frames are already BGR (post-conversion)
+        frames = (cv2.cvtColor(f, cv2.COLOR_BGR2RGB) for _, f in log.frames())
+    elif src.is_dir():
+        paths = sorted(p for p in src.iterdir() if p.suffix.lower() in IMAGE_EXTS)
+        frames = (cv2.cvtColor(cv2.imread(str(p)), cv2.COLOR_BGR2RGB) for p in paths)
+    else:
+        cap = cv2.VideoCapture(str(src))
+
+        def _video():
+            while True:
+                ok, bgr = cap.read()
+                if not ok:
+                    return
+                yield cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        frames = _video()
+
+    for rgb in frames:
+        if max_frames is not None and n >= max_frames:
+            return
+        n += 1
+        yield rgb
+
+
+def synthetic_gallery(root: Path, size: int, ids: int = 50, dim: int = 512, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    db = FaceDB(root)
+    for i in range(size):
+        v = rng.standard_normal(dim).astype(np.float32)
+        db.add(f"person{i % ids}", v / np.linalg.norm(v))
+    return db
+
+
+def percentiles(samples):
+    if not samples:
+        return None
+    a = np.asarray(samples) * 1000.0
+    return {
+        "n": len(samples),
+        "p50_ms": float(np.percentile(a, 50)),
+        "p95_ms": float(np.percentile(a, 95)),
+        "p99_ms": float(np.percentile(a, 99)),
+        "mean_ms": float(a.mean()),
+    }
+
+
+def git_rev():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def run(args):
+    fr = FaceRefiner(YUNET, score=args.score)
+
+    embedder = None
+    if not args.no_embed:
+        from perception.face_embedder import FaceEmbedder
+        if args.embedder:
+            embedder = FaceEmbedder(args.embedder)
+        else:
+            embedder = FaceEmbedder.default(prefer_int8=not args.fp32)
+
+    tmp = tempfile.TemporaryDirectory()
+    db = synthetic_gallery(Path(tmp.name), args.gallery) if embedder and args.gallery > 0 else None
+
+    state = State()
+    stages = {k: [] for k in ("convert", "detect", "align", "embed", "infer", "best_face", "frame")}
+    frames = with_face = 0
+
+    t_start = time.perf_counter()
+    for rgb in iter_frames(Path(args.source), args.max_frames):
+        t0 = time.perf_counter()
+
+        t = time.perf_counter()
+        bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+        stages["convert"].append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        faces = fr.detect_faces(bgr)
+        stages["detect"].append(time.perf_counter() - t)
+
+        state.publish_faces(bgr, faces, t0)
+        t = time.perf_counter()
+        best = get_best_face(state)
+        stages["best_face"].append(time.perf_counter() - t)
+
+        if faces:
+            with_face += 1
+            face = max(faces, key=lambda f: f["box"][2] * f["box"][3])
+
+            t = time.perf_counter()
+            aligned = align_by_5pts(bgr, face["kps"])
+            stages["align"].append(time.perf_counter() - t)
+
+            if embedder:
+                t = time.perf_counter()
+                emb = embedder.embed(aligned)
+                stages["embed"].append(time.perf_counter() - t)
+
+                if db:
+                    t = time.perf_counter()
+                    db.infer(emb)
+                    stages["infer"].append(time.perf_counter() - t)
+
+        stages["frame"].append(time.perf_counter() - t0)
+        frames += 1
+
+    wall = time.perf_counter() - t_start
+    tmp.cleanup()
+
+    return {
+        "source": str(args.source),
+        "git": git_rev(),
+        "platform": {
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+        },
+        "config": {
+            "score": args.score,
+            "gallery": args.gallery if db else 0,
+            "embed": embedder is not None,
+            "embedder": embedder.onnx if embedder else None,
+        },
+        "frames": frames,
+        "frames_with_face": with_face,
+        "boosted_fallback": {
+            "runs": fr.boost_runs,
+            "rate": fr.boost_runs / max(1, fr.calls),
+            **fr.stats(),
+        },
+        "fps": frames / wall if wall > 0 else 0.0,
+        "stages": {k: percentiles(v) for k, v in stages.items()},
+        # Linux reports KiB, macOS bytes
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                       / (1024.0 if sys.platform != "darwin" else 1024.0 * 1024.0),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="KIRI perception throughput benchmark")
+    ap.add_argument("source", help="Image directory, video file or recorded session directory")
+    ap.add_argument("--max-frames", type=int, default=None)
+    ap.add_argument("--gallery", type=int, default=200, help="Synthetic FaceDB size (0 = skip infer)")
+    ap.add_argument("--score", type=float, default=0.30, help="YuNet score threshold")
+    ap.add_argument("--embedder", help="Override embedder ONNX path")
+    ap.add_argument("--fp32", action="store_true", help="Float32 embedder even if the INT8 one exists")
+    ap.add_argument("--no-embed", action="store_true", help="Skip embedding + recognition stages")
+    ap.add_argument("--out", help="Write JSON here instead of stdout")
+    args = ap.parse_args(argv)
+
+    result = run(args)
+    text = json.dumps(result, indent=2)
+    if args.out:
+        Path(args.out).write_text(text)
+        print(f"[bench] {result['frames']} frames, {result['fps']:.1f} fps → {args.out}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Static INT8 quantisation of the face embedder.
+
+Calibrates on a folder of aligned 112x112 faces (any depth of
+sub-folders, e.g. the output of an enrollment run) and writes a QDQ
+ONNX model that FaceEmbedder loads like the float32 one:
+
+    python labs/quantize_embedder.py faces_aligned/ --num 300
+    python labs/quantize_embedder.py faces_aligned/ --method entropy --out models/face/x.onnx
+
+Check the result with labs/embedder_accuracy.py before switching over.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from perception.face_embedder import preprocess
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def calibration_images(src: Path, num: int, seed: int = 0):
+    paths = sorted(p for p in src.rglob("*") if p.suffix.lower() in IMAGE_EXTS)
+    if not paths:
+        raise SystemExit(f"[quant] no images under {src}")
+    rng = np.random.default_rng(seed)
+    if len(paths) > num:
+        paths = [paths[i] for i in sorted(rng.choice(len(paths), num, replace=False))]
+    return paths
+
+
+def quantize(model_in, model_out, calib_dir, num=200, method="minmax", per_channel=True):
+    from onnxruntime.quantization import (
+        CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+    import onnxruntime as ort
+
+    in_name = ort.InferenceSession(str(model_in), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    paths = calibration_images(Path(calib_dir), num)
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._it = iter(paths)
+
+        def get_next(self):
+            for p in self._it:
+                img = cv2.imread(str(p))
+                if img is not None:
+                    return {in_name: preprocess(img)}
+            return None
+
+    methods = {
+        "minmax": CalibrationMethod.MinMax,
+        "entropy": CalibrationMethod.Entropy,
+        "percentile": CalibrationMethod.Percentile,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # shape inference + graph cleanup, recommended before static quantisation
+        prep = Path(tmp) / "prep.onnx"
+        quant_pre_process(str(model_in), str(prep))
+        t0 = time.perf_counter()
+        quantize_static(
+            str(prep), str(model_out), _Reader(),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=methods[method],
+        )
+    print(f"[quant] {len(paths)} calibration faces, {method}, {time.perf_counter() - t0:.0f}s")
+    mb = lambda p: Path(p).stat().st_size / 1e6
+    print(f"[quant] {model_in} ({mb(model_in):.1f} MB) -> {model_out} ({mb(model_out):.1f} MB)")
+
+
+def main(argv=None):
+    from config.models import EMBEDDER, EMBEDDER_INT8
+    ap = argparse.ArgumentParser(description="Static INT8 quantisation of the face embedder")
+    ap.add_argument("calib", type=Path, help="Folder of aligned 112x112 face crops")
+    ap.add_argument("--model", type=Path, default=None, help="Float32 ONNX (default: config EMBEDDER)")
+    ap.add_argument("--out", type=Path, default=None, help="Output ONNX (default: config EMBEDDER_INT8)")
+    ap.add_argument("--num", type=int, default=200, help="Calibration images to use")
+    ap.add_argument("--method", choices=["minmax", "entropy", "percentile"], default="minmax")
+    ap.add_argument("--per-tensor", action="store_true", help="Per-tensor instead of per-channel weights")
+    args = ap.parse_args(argv)
+
+    quantize(args.model or EMBEDDER, args.out or EMBEDDER_INT8, args.calib,
+             num=args.num, method=args.method, per_channel=not args.per_tensor)
+
+
+if __name__ == "__main__":
+    main()
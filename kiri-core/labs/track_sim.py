@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Closed-loop head-tracking simulator.
+
+Drives the real TrackFace → SwivelMotionStable → SwivelMotion chain
+against a FakeSwivel, with a simulated camera (FOV, frame rate, pipeline
+latency, pixel noise, dropouts), a face moving in world angles, and a
+servo that slews toward the quantised command. Runs on a simulated clock,
+so a 10 s scenario takes a fraction of a second.
+
+    python labs/track_sim.py --traj step
+    python labs/track_sim.py --traj sine --set sim.latency=0.12
+    python labs/track_sim.py --traj step --sweep stable.deadzone_deg=0.5,1.2,2 \\
+                                         --sweep motion.max_speed=60,120,240
+
+Parameters are addressed as <group>.<name>:
+    track.*   TrackFace kwargs   (pan_gain, box_smooth, predictive, lead_s, ...)
+    stable.*  SwivelMotionStable (deadzone_deg, smooth_alpha, max_step_deg)
+    motion.*  SwivelMotion       (hz, max_speed)
+    sim.*     simulator          (see SIM_DEFAULTS)
+
+Metrics (pan axis): settle time and overshoot after the step, steady-state
+jitter (std of the head angle once settled), RMS tracking error and servo
+commands per second.
+"""
+import argparse
+import itertools
+import json
+import math
+from collections import deque
+
+import numpy as np
+
+from behaviour.track_face import TrackFace
+from hardware.fake_swivel import FakeSwivel
+from motion.swivel_motion import SwivelMotion
+from motion.swivel_stable import SwivelMotionStable
+
+SIM_DEFAULTS = {
+    "duration": 6.0,        # s
+    "tick": 0.001,          # simulation step, s
+    "fps": 30.0,            # camera frame rate
+    "latency": 0.07,        # capture → detection result, s
+    "fov": (66.0, 50.0),    # camera horizontal / vertical FOV, deg
+    "size": (640, 480),     # frame size, px
+    "face_px": 80,          # face box side, px
+    "noise_px": 1.5,        # detector jitter (std), px
+    "dropout": 0.0,         # probability a visible face is missed
+    "servo_speed": 300.0,   # physical slew rate, deg/s
+    "quant_deg": 1.0,       # servo resolution, deg
+    "start": 90.0,          # initial head + face pan/tilt, deg
+    "step_at": 1.0,         # step trajectory: time of the jump, s
+    "amp": 20.0,            # step size / sine amplitude, deg
+    "freq": 0.3,            # sine frequency, Hz
+    "speed": 15.0,          # ramp speed, deg/s
+    "settle_band": 2.0,     # |error| band for settle time, deg
+    "seed": 0,
+}
+
+TRACK_DEFAULTS = {"pan_gain": -40.0, "tilt_gain": 35.0, "tilt_center": 90.0, "predictive": True}
+
+
+# ---------- scenario ----------
+
+def trajectory(kind, p):
+    """face (pan, tilt) in world degrees as a function of time."""
+    start, amp = p["start"], p["amp"]
+    if kind == "static":
+        return lambda t: (start, start)
+    if kind == "step":
+        return lambda t: (start + (amp if t >= p["step_at"] else 0.0), start)
+    if kind == "ramp":
+        return lambda t: (start + p["speed"] * max(0.0, t - p["step_at"]), start)
+    if kind == "sine":
+        return lambda t: (start + amp * math.sin(2 * math.pi * p["freq"] * t), start)
+    raise ValueError(f"unknown trajectory {kind!r}")
+
+
+class _Servo:
+    """Physical servo: slews toward the (quantised) command at a fixed rate."""
+
+    def __init__(self, start, speed, quant):
+        self.pan = self.tilt = float(start)
+        self.speed = speed
+        self.quant = quant
+
+    def step(self, cmd_pan, cmd_tilt, dt):
+        q = self.quant
+        tp, tt = round(cmd_pan / q) * q, round(cmd_tilt / q) * q
+        m = self.speed * dt
+        self.pan += max(-m, min(m, tp - self.pan))
+        self.tilt += max(-m, min(m, tt - self.tilt))
+
+
+class _Camera:
+    """Projects the world-frame face into pixels given the head pose."""
+
+    def __init__(self, p, pan_sign, tilt_sign, rng):
+        self.W, self.H = p["size"]
+        self.tan_half = (math.tan(math.radians(p["fov"][0]) / 2), math.tan(math.radians(p["fov"][1]) / 2))
+        self.half = (p["fov"][0] / 2, p["fov"][1] / 2)
+        self.face_px = p["face_px"]
+        self.noise = p["noise_px"]
+        self.dropout = p["dropout"]
+        # TrackFace's gain signs define which way the image moves with the head
+        self.sign = (pan_sign, tilt_sign)
+        self.rng = rng
+
+    def capture(self, face_pan, face_tilt, head_pan, head_tilt):
+        d_pan, d_tilt = face_pan - head_pan, face_tilt - head_tilt
+        if abs(d_pan) >= self.half[0] or abs(d_tilt) >= self.half[1]:
+            return None
+        if self.dropout and self.rng.random() < self.dropout:
+            return None
+        ex = self.sign[0] * math.tan(math.radians(d_pan)) / self.tan_half[0]
+        ey = self.sign[1] * math.tan(math.radians(d_tilt)) / self.tan_half[1]
+        cx = self.W / 2 * (1 + ex) + self.rng.normal(0, self.noise)
+        cy = self.H / 2 * (1 + ey) + self.rng.normal(0, self.noise)
+        s = self.face_px
+        return (cx - s / 2, cy - s / 2, s, s, self.W, self.H)
+
+
+# ---------- simulation ----------
+
+def simulate(traj="step", track=None, stable=None, motion=None, sim=None):
+    p = dict(SIM_DEFAULTS, **(sim or {}))
+    tk = dict(TRACK_DEFAULTS, fov_deg=p["fov"], **(track or {}))
+    rng = np.random.default_rng(p["seed"])
+
+    clock = [0.0]
+    swivel = FakeSwivel(clock=lambda: clock[0])
+    raw = SwivelMotion(swivel, **(motion or {}))
+    raw.current_pan = raw.target_pan = p["start"]
+    raw.current_tilt = raw.target_tilt = p["start"]
+    swivel.pan_deg = swivel.tilt_deg = int(p["start"])
+    stab = SwivelMotionStable(raw, **(stable or {}))
+    tracker = TrackFace(motion=stab, get_face_fn=lambda: None, **tk)
+
+    face_at = trajectory(traj, p)
+    servo = _Servo(p["start"], p["servo_speed"], p["quant_deg"])
+    cam = _Camera(p, math.copysign(1, tk["pan_gain"]), math.copysign(1, tk["tilt_gain"]), rng)
+
+    tick = p["tick"]
+    motion_dt, frame_dt = 1.0 / raw.hz, 1.0 / p["fps"]
+    next_motion = next_frame = 0.0
+    pending = deque()          # (t_ready, t_capture, face)
+    log = []                   # (t, face_pan, head_pan, face_tilt, head_tilt)
+
+    for i in range(int(p["duration"] / tick)):
+        t = clock[0] = i * tick
+        servo.step(swivel.pan_deg, swivel.tilt_deg, tick)
+
+        if t >= next_frame:
+            next_frame += frame_dt
+            fp, ft = face_at(t)
+            pending.append((t + p["latency"], t, cam.capture(fp, ft, servo.pan, servo.tilt)))
+
+        # event-driven TrackFace: one update per detection result
+        while pending and pending[0][0] <= t:
+            _, t_cap, face = pending.popleft()
+            tracker.update(face + (t_cap, 1) if face else None, t)
+
+        if t >= next_motion:
+            next_motion += motion_dt
+            raw.step(motion_dt)
+
+        fp, ft = face_at(t)
+        log.append((t, fp, servo.pan, ft, servo.tilt))
+
+    return metrics(traj, p, np.array(log), swivel.commands)
+
+
+def metrics(traj, p, log, commands):
+    t, face, head = log[:, 0], log[:, 1], log[:, 2]
+    err = face - head
+    band = p["settle_band"]
+    res = {
+        "rms_err_deg": float(np.sqrt(np.mean(err ** 2))),
+        "tilt_rms_err_deg": float(np.sqrt(np.mean((log[:, 3] - log[:, 4]) ** 2))),
+        "commands_per_s": len(commands) / p["duration"],
+    }
+
+    if traj == "step":
+        after = t >= p["step_at"]
+        outside = np.nonzero(after & (np.abs(err) > band))[0]
+        settled_i = outside[-1] + 1 if len(outside) else int(np.argmax(after))
+        res["settle_s"] = float(t[settled_i] - p["step_at"]) if settled_i < len(t) else None
+        # overshoot: how far the head went past the new face position
+        direction = math.copysign(1, p["amp"])
+        res["overshoot_deg"] = float(max(0.0, np.max(-err[after] * direction)))
+        res["overshoot_pct"] = 100.0 * res["overshoot_deg"] / abs(p["amp"]) if p["amp"] else 0.0
+        # never settled: judge the last 30% instead
+        steady = head[settled_i:] if settled_i < len(t) else head[t >= p["duration"] * 0.7]
+    else:
+        steady = head[t >= p["duration"] * 0.5] if traj == "static" else err[t >= p["step_at"]]
+    # jitter: std of the head angle (static / settled) or of the error (moving face)
+    res["jitter_deg"] = float(np.std(steady)) if len(steady) else None
+    return res
+
+
+# ---------- CLI ----------
+
+def _value(s):
+    for conv in (int, float):
+        try:
+            return conv(s)
+        except ValueError:
+            pass
+    if s.lower() in ("true", "false"):
+        return s.lower() == "true"
+    return s
+
+
+def _groups(params):
+    g = {"track": {}, "stable": {}, "motion": {}, "sim": {}}
+    for key, val in params.items():
+        group, _, name = key.partition(".")
+        if group not in g or not name:
+            raise SystemExit(f"bad parameter {key!r} (use track./stable./motion./sim.)")
+        g[group][name] = val
+    return g
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Closed-loop head-tracking simulator")
+    ap.add_argument("--traj", default="step", choices=["step", "ramp", "sine", "static"])
+    ap.add_argument("--set", action="append", default=[], metavar="K=V", help="Fixed parameter")
+    ap.add_argument("--sweep", action="append", default=[], metavar="K=V1,V2,...", help="Swept parameter")
+    ap.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = ap.parse_args(argv)
+
+    fixed = {k: _value(v) for k, v in (s.split("=", 1) for s in args.set)}
+    sweeps = {k: [_value(x) for x in v.split(",")] for k, v in (s.split("=", 1) for s in args.sweep)}
+
+    rows = []
+    for combo in itertools.product(*sweeps.values()):
+        params = dict(fixed, **dict(zip(sweeps.keys(), combo)))
+        rows.append({"params": params, **simulate(args.traj, **_groups(params))})
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    cols = ["settle_s", "overshoot_deg", "jitter_deg", "rms_err_deg", "commands_per_s"]
+    keys = list(sweeps.keys())
+    print("  ".join(f"{k:>22s}" for k in keys) + "".join(f"{c:>16s}" for c in cols))
+    for r in rows:
+        cells = "  ".join(f"{str(r['params'][k]):>22s}" for k in keys)
+        vals = "".join(f"{'-' if r.get(c) is None else format(r[c], '.3f'):>16s}" for c in cols)
+        print(cells + vals)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-audio: file-based Piper path vs sentence streaming, and
+per-utterance player startup overhead: spawn-per-utterance vs the
+persistent AudioSink.
+
+    python labs/tts_latency_test.py            # plays each text twice
+    python labs/tts_latency_test.py --runs 3
+"""
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from hardware import piper_tts
+from hardware.piper_tts import TTS, select_output, raw_playback_cmd, synthesize_to_file
+from hardware.audio_sink import AudioSink
+
+TEXTS = [
+    "Hello there.",
+    "I noticed you came back. It is nice to see you again, I was getting a little bored.",
+    "Let me tell you something about myself. I live on a small computer, and I watch the room "
+    "through a camera. When somebody walks in I turn my head to look at them. Sometimes I say "
+    "hello. Sometimes I just look curious. Either way, I am always paying attention.",
+]
+
+
+def file_path_ttfa(text):
+    """The pre-streaming path: synthesize a whole WAV, then start the player."""
+    with tempfile.TemporaryDirectory() as d:
+        wav = Path(d) / "utt.wav"
+        t0 = time.monotonic()
+        synthesize_to_file(text, wav)
+        backend, device = select_output()
+        cmd = ["aplay", "-q", "-D", device, str(wav)] if backend == "alsa" else \
+              ["paplay"] + ([f"--device={device}"] if device else []) + [str(wav)]
+        proc = subprocess.Popen(cmd)
+        ttfa = time.monotonic() - t0
+        proc.wait()
+    return ttfa
+
+
+def spawn_overhead(rate, pcm):
+    """Old per-utterance cost: device discovery + player spawn + first write."""
+    t0 = time.monotonic()
+    proc = subprocess.Popen(raw_playback_cmd(*select_output(), rate), stdin=subprocess.PIPE)
+    proc.stdin.write(pcm)
+    proc.stdin.flush()
+    dt = time.monotonic() - t0
+    proc.stdin.close()
+    proc.wait()
+    return dt
+
+
+def sink_overhead(sink, pcm):
+    t0 = time.monotonic()
+    sink.write(pcm)
+    dt = time.monotonic() - t0
+    sink.drain()
+    return dt
+
+
+def stream_ttfa(tts, text):
+    # bypass the cache: say_stream would store the first run and replay
+    # it from the cache afterwards
+    tts.say_stream(text, use_cache=False)
+    return tts.last_ttfa
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=2)
+    args = ap.parse_args()
+
+    tts = TTS(tmp_dir=tempfile.mkdtemp())
+    tts.warmup()
+    rate = piper_tts.voice_sample_rate()
+    print(f"voice sample rate: {rate} Hz")
+
+    silence = b"\0\0" * (rate // 50)   # 20 ms
+    sink = AudioSink(rate)
+    sink_overhead(sink, silence)        # first write opens the device
+    old = [spawn_overhead(rate, silence) for _ in range(5)]
+    new = [sink_overhead(sink, silence) for _ in range(5)]
+    sink.close()
+    print(f"player startup per utterance | spawn {1000 * statistics.median(old):7.1f} ms"
+          f" | persistent sink {1000 * statistics.median(new):7.2f} ms")
+
+    for text in TEXTS:
+        f = [file_path_ttfa(text) for _ in range(args.runs)]
+        s = [stream_ttfa(tts, text) for _ in range(args.runs)]
+        print(f"{len(text):4d} chars | file {1000 * statistics.median(f):7.1f} ms"
+              f" | stream {1000 * statistics.median(s):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
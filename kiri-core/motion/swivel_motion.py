@@ -2,6 +2,8 @@ import asyncio
 import time
 import math
 
+from runtime.trace import TRACE
+
 class SwivelMotion:
     def __init__(self, controller, hz=30, max_speed=120):
         """
@@ -19,10 +21,17 @@ class SwivelMotion:
         self.target_tilt = 90
 
         self.running = False
+        self.target_frame = None   # trace frame id the current target came from
+
+        # skip serial writes when the (integer) command did not change
+        self.last_sent = None
+        self.sent = 0
+        self.skipped = 0
 
     def set_target(self, pan: float, tilt: float):
         self.target_pan = float(pan)
         self.target_tilt = float(tilt)
+        self.target_frame = TRACE.frame
 
     async def loop(self):
         self.running = True
@@ -31,20 +40,38 @@ class SwivelMotion:
         while self.running:
             start = time.monotonic()
 
-            # compute next step
-            next_pan = self._step_towards(self.current_pan, self.target_pan, dt)
-            next_tilt = self._step_towards(self.current_tilt, self.target_tilt, dt)
-
-            self.current_pan = next_pan
-            self.current_tilt = next_tilt
-
-            # send to hardware
-            self.controller.set(self.current_pan, self.current_tilt)
+            self.step(dt)
 
             # sleep accurately
             elapsed = time.monotonic() - start
             await asyncio.sleep(max(0, dt - elapsed))
 
+    def step(self, dt=None):
+        """One control iteration (used by loop() or a Scheduler)."""
+        dt = dt if dt is not None else 1 / self.hz
+        with TRACE.in_frame(self.target_frame), TRACE.span("motion_step"):
+            self._step(dt)
+
+    def _step(self, dt):
+        # compute next step
+        next_pan = self._step_towards(self.current_pan, self.target_pan, dt)
+        next_tilt = self._step_towards(self.current_tilt, self.target_tilt, dt)
+
+        self.current_pan = next_pan
+        self.current_tilt = next_tilt
+
+        # send to hardware (only when the integer command changes)
+        cmd = (int(self.current_pan), int(self.current_tilt))
+        if cmd == self.last_sent:
+            self.skipped += 1
+            return
+        self.controller.set(self.current_pan, self.current_tilt)
+        self.last_sent = cmd
+        self.sent += 1
+
+    def at_target(self):
+        return self.current_pan == self.target_pan and self.current_tilt == self.target_tilt
+
     def _step_towards(self, current, target, dt):
         max_step = self.max_speed * dt
         diff = target - current
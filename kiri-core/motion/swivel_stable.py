@@ -3,6 +3,8 @@
 
 import math
 
+from runtime.trace import TRACE
+
 class SwivelMotionStable:
     """
     A wrapper that stabilises target commands to SwivelMotion.
@@ -33,6 +35,10 @@ class SwivelMotionStable:
         Applies smoothing + dead zone + step limiting.
         Called instead of inner_motion.set_target().
         """
+        with TRACE.span("stable"):
+            self._set_target(pan, tilt)
+
+    def _set_target(self, pan, tilt):
 
         # Initialise stabilised targets
         if self.stab_pan is None:
@@ -5,8 +5,14 @@ from pathlib import Path
 import json
 
 class FaceDB:
-    def __init__(self, root: Path):
+    """
+    Templates are stored as float16 .npy files by default (half the size;
+    cosine scores change by ~1e-4 on L2-normalised vectors). Older float32
+    files load unchanged; search always runs in float32.
+    """
+    def __init__(self, root: Path, dtype=np.float16):
         self.root = Path(root)
+        self.dtype = np.dtype(dtype)
         self.root.mkdir(parents=True, exist_ok=True)
         self.index_path = self.root / "index.json"
         self.emb_dir = self.root / "embeds"
@@ -14,17 +20,60 @@ class FaceDB:
         self.index = {}  # name -> [filenames]
         if self.index_path.exists():
             self.index = json.loads(self.index_path.read_text() or "{}")
+        self._matrix = None  # (names, L2-normalised (N,D) embeddings), built on demand
 
     def _save_index(self):
         self.index_path.write_text(json.dumps(self.index, indent=2))
 
+    def _next_fid(self, name: str) -> str:
+        used = set(self.index.get(name, []))
+        i = len(used)
+        while f"{name}_{i}.npy" in used or (self.emb_dir / f"{name}_{i}.npy").exists():
+            i += 1
+        return f"{name}_{i}.npy"
+
     def add(self, name: str, emb: np.ndarray):
+        self.add_many(name, [emb])
+
+    def add_many(self, name: str, embs):
+        """Add several embeddings for one person (one index write)."""
         name = name.strip()
-        fid = f"{name}_{len(self.index.get(name, []))}.npy"
-        np.save(self.emb_dir / fid, emb.astype(np.float32))
-        self.index.setdefault(name, []).append(fid)
+        for emb in embs:
+            fid = self._next_fid(name)
+            np.save(self.emb_dir / fid, np.asarray(emb).astype(self.dtype))
+            self.index.setdefault(name, []).append(fid)
+        self._matrix = None
+        self._save_index()
+
+    def remove(self, name: str):
+        """Delete all templates of a person."""
+        for f in self.index.pop(name.strip(), []):
+            (self.emb_dir / f).unlink(missing_ok=True)
+        self._matrix = None
         self._save_index()
 
+    def replace(self, name: str, embs):
+        """Swap a person's templates for a new set (e.g. compacted prototypes)."""
+        self.remove(name)
+        self.add_many(name, embs)
+
+    def convert(self, dtype=None):
+        """Rewrite every stored template in `dtype` (default: this DB's dtype)."""
+        dtype = np.dtype(dtype or self.dtype)
+        for files in self.index.values():
+            for f in files:
+                path = self.emb_dir / f
+                if path.exists():
+                    np.save(path, np.load(path).astype(dtype))
+        self._matrix = None
+
+    def nbytes(self) -> int:
+        """Bytes of template data on disk (headers excluded)."""
+        return sum(int(np.prod(e.shape)) * e.itemsize for _, e in self.all())
+
+    def size(self) -> int:
+        return sum(len(v) for v in self.index.values())
+
     def all(self):
         """Yield (name, embedding) for all stored vectors."""
         for name, files in self.index.items():
@@ -33,15 +82,31 @@ class FaceDB:
                 if path.exists():
                     yield name, np.load(path)
 
+    def matrix(self):
+        """(names list, (N,D) float32 L2-normalised matrix), cached until the DB changes."""
+        if self._matrix is None:
+            names, vecs = [], []
+            for name, ref in self.all():
+                names.append(name)
+                vecs.append(ref.astype(np.float32).ravel())
+            if vecs:
+                m = np.stack(vecs)
+                m /= np.linalg.norm(m, axis=1, keepdims=True) + 1e-9
+            else:
+                m = np.zeros((0, 0), dtype=np.float32)
+            self._matrix = (names, m)
+        return self._matrix
+
     def infer(self, emb: np.ndarray, thresh: float = 0.35):
         """Return (best_name, best_score) or (None, 0). Score is 1 - cosine distance."""
-        best_name, best_score = None, 0.0
-        # cosine similarity
-        def cos(a,b): return float(np.dot(a, b) / (np.linalg.norm(a)*np.linalg.norm(b) + 1e-9))
-        for name, ref in self.all():
-            s = cos(emb, ref)
-            if s > best_score:
-                best_name, best_score = name, s
+        names, m = self.matrix()
+        if not names:
+            return None, 0.0
+        # cosine similarity against every template at once
+        q = np.asarray(emb, dtype=np.float32).ravel()
+        sims = m @ (q / (np.linalg.norm(q) + 1e-9))
+        i = int(np.argmax(sims))
+        best_name, best_score = names[i], max(0.0, float(sims[i]))
         if best_score >= (1.0 - thresh):  # thresh ~0.35 => require sim >= 0.65
             return best_name, best_score
         return None, best_score
@@ -1,26 +1,56 @@
 # modules/face_embedder.py
 from __future__ import annotations
 import numpy as np
-import cv2, onnxruntime as ort
+import cv2
 from pathlib import Path
 
+
+def preprocess(bgr_face: np.ndarray, size=(112,112)):
+    # convert to RGB, resize, normalise to [-1,1] or [0,1] depending on model
+    img = cv2.cvtColor(bgr_face, cv2.COLOR_BGR2RGB)
+    img = cv2.resize(img, size, interpolation=cv2.INTER_LINEAR)
+    img = img.astype(np.float32) / 127.5 - 1.0  # [-1,1] common for InsightFace
+    # NCHW
+    img = np.transpose(img, (2,0,1))[None, ...]
+    return img
+
+
 class FaceEmbedder:
-    def __init__(self, onnx_path: str | Path):
+    """
+    ArcFace-style ONNX embedder. Works with the float32 model and with the
+    static-INT8 (QDQ) model written by labs/quantize_embedder.py; both take
+    the same float32 input.
+    """
+    def __init__(self, onnx_path: str | Path, threads: int | None = None):
+        import onnxruntime as ort   # heavy: imported on first use
         self.onnx = str(onnx_path)
-        self.session = ort.InferenceSession(self.onnx, providers=["CPUExecutionProvider"])
+        opts = ort.SessionOptions()
+        # full graph optimisation fuses the Q/DQ pairs into integer kernels
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = int(threads)
+        self.session = ort.InferenceSession(self.onnx, sess_options=opts, providers=["CPUExecutionProvider"])
         io = self.session.get_inputs()[0]
         self.in_name = io.name
         self.in_shape = io.shape  # [1,3,112,112] typically
         self.out_name = self.session.get_outputs()[0].name
 
+    @staticmethod
+    def default_path(prefer_int8: bool = True) -> str:
+        """The INT8 model if it has been generated, else the float32 one."""
+        from config.models import EMBEDDER, EMBEDDER_INT8
+        return str(EMBEDDER_INT8 if prefer_int8 and Path(EMBEDDER_INT8).exists() else EMBEDDER)
+
+    @classmethod
+    def default(cls, prefer_int8: bool = True, **kw) -> "FaceEmbedder":
+        return cls(cls.default_path(prefer_int8), **kw)
+
     def preprocess(self, bgr_face: np.ndarray, size=(112,112)):
-        # convert to RGB, resize, normalise to [-1,1] or [0,1] depending on model
-        img = cv2.cvtColor(bgr_face, cv2.COLOR_BGR2RGB)
-        img = cv2.resize(img, size, interpolation=cv2.INTER_LINEAR)
-        img = img.astype(np.float32) / 127.5 - 1.0  # [-1,1] common for InsightFace
-        # NCHW
-        img = np.transpose(img, (2,0,1))[None, ...]
-        return img
+        return preprocess(bgr_face, size)
+
+    def warmup(self):
+        """One dummy inference so the first real embed is not slow."""
+        self.embed(np.zeros((112, 112, 3), dtype=np.uint8))
 
     def embed(self, bgr_face: np.ndarray) -> np.ndarray:
         inp = self.preprocess(bgr_face)
@@ -3,18 +3,31 @@
 def get_best_face(state):
     """
     Expects `state` to hold the latest frame + detected faces.
-    Returns (x, y, w, h, W, H) or None.
+    Returns (x, y, w, h, W, H, frame_time, track_id) or None.
+    frame_time is the capture time of the frame (None if unknown).
+
+    If a FaceTrackManager feeds the state (state.tracks is not None) the
+    attention track is used, which is stable across frames; otherwise
+    the largest raw detection is picked and track_id is None.
     """
     frame = state.frame
     faces = state.faces  # list of {"box": [x,y,w,h], ...}
+    frame_time = getattr(state, "frame_time", None)
+
+    if getattr(state, "tracks", None) is not None:
+        target = state.attention
+        if target is None:
+            return None
+        x, y, w, h = target.box
+        H, W = frame.shape[:2]
+        return (x, y, w, h, W, H, frame_time, target.id)
 
     if not faces:
         return None
 
     # pick largest face
-    faces_sorted = sorted(faces, key=lambda f: f["box"][2] * f["box"][3], reverse=True)
-    best = faces_sorted[0]
+    best = max(faces, key=lambda f: f["box"][2] * f["box"][3])
 
     x, y, w, h = best["box"]
     H, W = frame.shape[:2]
-    return (x, y, w, h, W, H)
+    return (x, y, w, h, W, H, frame_time, None)
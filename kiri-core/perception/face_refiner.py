@@ -1,12 +1,20 @@
 # modules/face_refiner.py
 from pathlib import Path
+import time
 import cv2
 import numpy as np
 
+from runtime.trace import TRACE
+
 class FaceRefiner:
     """
     YuNet-first face detector with an adaptive fallback pass.
-    Returns list of dicts: {"box":[x,y,w,h], "kps":[(x1,y1),...,(x5,y5)]}
+    Returns list of dicts: {"box":[x,y,w,h], "kps":[(x1,y1),...,(x5,y5)], "score":s}
+
+    The fallback (gamma + CLAHE on L, lower score threshold) only runs
+    when the first pass found nothing AND the frame is dark or flat
+    (luminance mean / std of a thumbnail), and backs off exponentially
+    after repeated misses: an empty, well-lit room costs one pass.
     """
     def __init__(self, yunet_path: str, score=0.30, nms=0.3, require_yunet: bool = True, model_in=(416, 416)):
         p = Path(yunet_path)
@@ -26,16 +34,66 @@ class FaceRefiner:
         )
         self.base_score = float(score)
         self.mode = "yunet"
+        self._init_fallback()
+
+    def _init_fallback(self, dark_mean=90.0, flat_std=28.0, max_backoff=64, gamma=0.8):
+        """Fallback gate settings, precomputed LUT/CLAHE and stats."""
+        self.dark_mean = dark_mean      # boost frames darker than this (0..255)...
+        self.flat_std = flat_std        # ...or with less contrast than this
+        self.max_backoff = max_backoff  # frames to skip after many misses (cap)
+        self._gamma_lut = np.array([((i / 255.0) ** gamma) * 255.0 for i in range(256)]).clip(0, 255).astype(np.uint8)
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+        self._misses = 0          # consecutive boosted passes without a face
+        self._skip_left = 0       # frames left in the current backoff
+
+        # stats
+        self.calls = 0
+        self.boost_runs = 0
+        self.boost_hits = 0
+        self.skipped_bright = 0
+        self.skipped_backoff = 0
+        self.boost_time = 0.0
+        self.detect_time = 0.0
+        self.last_boosted = False
+        self.last_luma = None
+
+    def warmup(self, size=(640, 480)):
+        """One dummy inference at the working resolution (no stats)."""
+        self._run(np.zeros((size[1], size[0], 3), dtype=np.uint8), score=self.base_score)
 
     def _preproc_boost(self, bgr: np.ndarray) -> np.ndarray:
-        img = bgr.astype(np.float32) / 255.0
-        img = np.clip(img ** 0.8, 0, 1)              # gamma lift
-        img = (img * 255).astype(np.uint8)
-        lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
+        # one LAB round trip; gamma lift (LUT) + CLAHE on L only
+        lab = cv2.cvtColor(bgr, cv2.COLOR_BGR2LAB)
         l, a, b = cv2.split(lab)
-        l = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8)).apply(l)
+        l = self._clahe.apply(cv2.LUT(l, self._gamma_lut))
         return cv2.cvtColor(cv2.merge([l,a,b]), cv2.COLOR_LAB2BGR)
 
+    def luma_stats(self, bgr: np.ndarray):
+        """(mean, std) of the luminance of an 80x60 thumbnail."""
+        small = cv2.resize(bgr, (80, 60), interpolation=cv2.INTER_AREA)
+        mean, std = cv2.meanStdDev(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY))
+        return float(mean[0][0]), float(std[0][0])
+
+    def _boost_wanted(self, bgr: np.ndarray) -> bool:
+        if self._skip_left > 0:
+            self._skip_left -= 1
+            self.skipped_backoff += 1
+            return False
+        mean, std = self.last_luma = self.luma_stats(bgr)
+        if mean >= self.dark_mean and std >= self.flat_std:
+            self.skipped_bright += 1     # boosting a well-exposed frame does not help
+            return False
+        return True
+
+    def _note_boost(self, found: bool):
+        if found:
+            self.boost_hits += 1
+            self._misses = 0
+            return
+        # after repeated misses skip the fallback for 2, 4, 8, ... frames
+        self._misses += 1
+        self._skip_left = min(self.max_backoff, 2 ** (self._misses - 1)) if self._misses > 1 else 0
+
     def _run(self, bgr_img: np.ndarray, score=None):
         h, w = bgr_img.shape[:2]
         self.det.setInputSize((w, h))
@@ -49,15 +107,59 @@ class FaceRefiner:
                 arr = arr.tolist()
                 x, y, ww, hh = map(int, arr[:4])
                 kps = [(int(arr[4+i*2]), int(arr[5+i*2])) for i in range(5)]
+                score = float(arr[14])
                 # clamp
                 x = max(0, min(x, w-1)); y = max(0, min(y, h-1))
                 ww = max(1, min(ww, w - x)); hh = max(1, min(hh, h - y))
-                faces.append({"box":[x,y,ww,hh], "kps":kps})
+                faces.append({"box":[x,y,ww,hh], "kps":kps, "score":score})
         return faces
 
-    def detect_faces(self, bgr_img: np.ndarray):
-        faces = self._run(bgr_img, score=self.base_score)
+    def detect_faces(self, bgr_img: np.ndarray, scale: float = 1.0, allow_boost: bool = True):
+        """
+        scale < 1 runs YuNet on a downscaled copy (boxes/kps are mapped
+        back to full-frame pixels); allow_boost=False skips the fallback.
+        """
+        self.calls += 1
+        self.last_boosted = False
+        img = bgr_img
+        if scale != 1.0:
+            h, w = bgr_img.shape[:2]
+            img = cv2.resize(bgr_img, (max(1, int(w * scale)), max(1, int(h * scale))),
+                             interpolation=cv2.INTER_AREA)
+        t0 = time.perf_counter()
+        with TRACE.span("yunet"):
+            faces = self._run(img, score=self.base_score)
         if faces:
-            return faces
-        boosted = self._preproc_boost(bgr_img)
-        return self._run(boosted, score=max(0.15, self.base_score - 0.10))
+            self._misses = self._skip_left = 0   # people around: fallback fully available
+        elif allow_boost and self._boost_wanted(img):
+            self.boost_runs += 1
+            self.last_boosted = True
+            t1 = time.perf_counter()
+            with TRACE.span("boost"):
+                boosted = self._preproc_boost(img)
+                faces = self._run(boosted, score=max(0.15, self.base_score - 0.10))
+            self.boost_time += time.perf_counter() - t1
+            self._note_boost(bool(faces))
+        self.detect_time += time.perf_counter() - t0
+        if scale != 1.0 and faces:
+            faces = self._rescale(faces, 1.0 / scale)
+        return faces
+
+    def stats(self):
+        n = max(1, self.calls)
+        return {
+            "calls": self.calls,
+            "boost_rate": self.boost_runs / n,
+            "boost_hits": self.boost_hits,
+            "skipped_bright": self.skipped_bright,
+            "skipped_backoff": self.skipped_backoff,
+            "ms_per_frame": 1000.0 * self.detect_time / n,
+            "boost_ms_per_frame": 1000.0 * self.boost_time / n,
+        }
+
+    @staticmethod
+    def _rescale(faces, k):
+        for f in faces:
+            f["box"] = [int(v * k) for v in f["box"]]
+            f["kps"] = [(int(x * k), int(y * k)) for x, y in f["kps"]]
+        return faces
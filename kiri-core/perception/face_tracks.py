@@ -0,0 +1,187 @@
+# perception/face_tracks.py
+import itertools
+
+import numpy as np
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of xywh boxes: a (N,4), b (M,4) → (N,M)."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    ax1, ay1 = a[:, 0:1], a[:, 1:2]
+    ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+    bx1, by1 = b[:, 0], b[:, 1]
+    bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+
+    iw = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    ih = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = iw * ih
+    union = (a[:, 2:3] * a[:, 3:4]) + (b[:, 2] * b[:, 3]) - inter
+    return inter / np.maximum(union, 1e-6)
+
+
+class FaceTrack:
+    """One face followed across frames."""
+
+    def __init__(self, tid, face, t):
+        self.id = tid
+        self.box = list(face["box"])
+        self.face = face
+        self.first_seen = t
+        self.last_seen = t
+        self.age = 1            # frames since the track started
+        self.hits = 1           # frames with a matched detection
+        self.misses = 0         # consecutive frames without one
+        self.vx = 0.0           # centre velocity, px/s
+        self.vy = 0.0
+        self.name = None        # last recognised identity
+        self.name_score = 0.0
+
+    @property
+    def area(self):
+        return self.box[2] * self.box[3]
+
+    def predicted_box(self, t):
+        dt = t - self.last_seen
+        x, y, w, h = self.box
+        return [x + self.vx * dt, y + self.vy * dt, w, h]
+
+    def update(self, face, t, vel_smooth=0.5):
+        dt = t - self.last_seen
+        x, y, w, h = face["box"]
+        if dt > 0:
+            ox, oy, ow, oh = self.box
+            vx = ((x + w / 2) - (ox + ow / 2)) / dt
+            vy = ((y + h / 2) - (oy + oh / 2)) / dt
+            self.vx += vel_smooth * (vx - self.vx)
+            self.vy += vel_smooth * (vy - self.vy)
+        self.box = [x, y, w, h]
+        self.face = face
+        self.last_seen = t
+        self.hits += 1
+        self.misses = 0
+
+
+class FaceTrackManager:
+    """
+    Associates detections across frames (vectorised IoU on motion-
+    predicted boxes + greedy assignment) and keeps a stable attention
+    target with hysteresis, so the head does not flip between people.
+
+    Each face dict gets a "track_id" key. on_lost(track) is called when a
+    track is dropped, e.g. to publish "face.lost" on the bus:
+
+        FaceTrackManager(on_lost=lambda tr: asyncio.create_task(
+            bus.publish("face.lost", {"track_id": tr.id, "name": tr.name})))
+    """
+
+    def __init__(self, iou_thresh=0.25, max_misses=8, min_hits=2,
+                 switch_ratio=1.5, switch_frames=5, first_id=1, on_lost=None):
+        self.iou_thresh = iou_thresh
+        self.max_misses = max_misses
+        self.min_hits = min_hits
+        self.switch_ratio = switch_ratio      # challenger must be this much more salient...
+        self.switch_frames = switch_frames    # ...for this many consecutive frames
+
+        self.on_lost = on_lost
+        self.tracks = {}
+        self._ids = itertools.count(first_id)   # separate id ranges keep sources apart
+        self.attention_id = None
+        self._challenger = None
+        self._challenger_frames = 0
+
+    # ---------------- association ----------------
+    def update(self, faces, t):
+        """Feed one frame's detections; returns the confirmed tracks."""
+        tracks = list(self.tracks.values())
+        for tr in tracks:
+            tr.age += 1
+
+        matched_t, matched_d = set(), set()
+        if tracks and faces:
+            pred = np.array([tr.predicted_box(t) for tr in tracks])
+            dets = np.array([f["box"] for f in faces])
+            iou = iou_matrix(pred, dets)
+
+            # greedy: best pairs first
+            order = np.dstack(np.unravel_index(np.argsort(-iou, axis=None), iou.shape))[0]
+            for ti, di in order:
+                if iou[ti, di] < self.iou_thresh:
+                    break
+                if ti in matched_t or di in matched_d:
+                    continue
+                matched_t.add(ti)
+                matched_d.add(di)
+                tracks[ti].update(faces[di], t)
+
+        for ti, tr in enumerate(tracks):
+            if ti not in matched_t:
+                tr.misses += 1
+                if tr.misses > self.max_misses:
+                    del self.tracks[tr.id]
+                    if self.on_lost:
+                        self.on_lost(tr)
+
+        for di, face in enumerate(faces):
+            if di not in matched_d:
+                tr = FaceTrack(next(self._ids), face, t)
+                self.tracks[tr.id] = tr
+
+        for tr in self.tracks.values():
+            if tr.misses == 0:
+                tr.face["track_id"] = tr.id
+
+        self._update_attention()
+        return self.confirmed()
+
+    def confirmed(self):
+        return [tr for tr in self.tracks.values() if tr.hits >= self.min_hits and tr.misses == 0]
+
+    def set_identity(self, track_id, name, score=0.0):
+        tr = self.tracks.get(track_id)
+        if tr is not None:
+            tr.name, tr.name_score = name, score
+
+    # ---------------- attention ----------------
+    def _salience(self, tr):
+        # bigger (closer) faces win; a known face gets a small bonus
+        return tr.area * (1.2 if tr.name else 1.0)
+
+    def _update_attention(self):
+        visible = self.confirmed()
+        if not visible:
+            cur = self.tracks.get(self.attention_id)
+            if cur is None:
+                self.attention_id = None
+            return
+
+        best = max(visible, key=self._salience)
+        cur = self.tracks.get(self.attention_id)
+        if cur is None or cur.misses > 0:
+            # current target gone (or never set): take the best right away
+            if cur is None or cur.misses > self.max_misses // 2:
+                self.attention_id = best.id
+                self._challenger, self._challenger_frames = None, 0
+            return
+
+        if best.id == cur.id or self._salience(best) < self.switch_ratio * self._salience(cur):
+            self._challenger, self._challenger_frames = None, 0
+            return
+
+        if self._challenger == best.id:
+            self._challenger_frames += 1
+        else:
+            self._challenger, self._challenger_frames = best.id, 1
+        if self._challenger_frames >= self.switch_frames:
+            self.attention_id = best.id
+            self._challenger, self._challenger_frames = None, 0
+
+    @property
+    def attention(self):
+        """The track KIRI should look at (None if nobody is visible)."""
+        tr = self.tracks.get(self.attention_id)
+        if tr is None or tr.misses > 0:
+            return None
+        return tr
@@ -0,0 +1,42 @@
+# perception/frame_diff.py
+import cv2
+import numpy as np
+
+
+class FrameDiff:
+    """
+    Cheap scene-change detector: compares a heavily downsampled grayscale
+    copy of each frame with a reference frame (mean absolute difference).
+    """
+
+    def __init__(self, size=(32, 24), threshold=6.0):
+        self.size = tuple(size)
+        self.threshold = float(threshold)
+        self.ref = None
+        self.last_score = 0.0
+        self.last_thumb = None
+
+    def thumb(self, bgr: np.ndarray) -> np.ndarray:
+        small = cv2.resize(bgr, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def score(self, thumb: np.ndarray) -> float:
+        if self.ref is None:
+            return float("inf")
+        return float(cv2.absdiff(thumb, self.ref).mean())
+
+    def changed(self, bgr: np.ndarray, update=True) -> bool:
+        """True if the frame differs from the reference (first frame counts as changed)."""
+        t = self.last_thumb = self.thumb(bgr)
+        self.last_score = self.score(t)
+        moved = self.last_score > self.threshold
+        if update:
+            self.ref = t
+        return moved
+
+    def accept(self):
+        """Make the last frame seen by changed() the reference."""
+        self.ref = self.last_thumb
+
+    def reset(self):
+        self.ref = None
@@ -0,0 +1,114 @@
+# perception/person_head.py
+from perception.face_tracks import FaceTrackManager
+
+PERSON = 0          # COCO class id
+
+
+class PersonHeadTracker:
+    """
+    Head targets from IMX500 person boxes alone (no CPU vision).
+
+    Each person box gives a head estimate: the top `head_frac` of the box,
+    centred horizontally, `head_aspect` times as wide as it is tall (but
+    never wider than the person). Estimates are associated across frames
+    with a FaceTrackManager (so the attention target has the usual
+    hysteresis) and each track's box is smoothed with an EMA.
+
+    `near` tells when CPU face detection is worth running: the attention
+    person fills more than `near_enter` of the frame height (released
+    below `near_exit`). That is also when the box estimate gets worst,
+    since a close person's box is mostly torso. needs_identity() covers
+    the other reason to look at pixels: a new, unnamed person gets
+    `identify_s` seconds of face detection so recognition can run.
+
+        confirmed = heads.update(cam.get_detections(), now)
+        state.publish_faces(frame, heads.faces(), now,
+                            tracks=confirmed, attention=heads.attention)
+    """
+
+    def __init__(self, frame_size=(640, 480), min_conf=0.4, head_frac=0.2, head_aspect=0.8,
+                 smooth=0.4, near_enter=0.45, near_exit=0.35, identify_s=2.0, first_id=100001):
+        self.W, self.H = frame_size
+        self.min_conf = float(min_conf)
+        self.head_frac = float(head_frac)
+        self.head_aspect = float(head_aspect)
+        self.smooth = float(smooth)
+        self.near_enter = float(near_enter)
+        self.near_exit = float(near_exit)
+        self.identify_s = float(identify_s)
+
+        # own id range, so TrackFace notices a switch between head and face targets
+        self.tracks = FaceTrackManager(first_id=first_id)
+        self._smoothed = {}     # track id -> smoothed head box
+        self.near = False
+
+        # stats
+        self.frames = 0
+        self.near_frames = 0
+
+    def head_box(self, box):
+        """Head estimate (x, y, w, h) from a person box (x, y, w, h)."""
+        x, y, w, h = box
+        hh = h * self.head_frac
+        hw = min(w, hh * self.head_aspect)
+        cx = x + w / 2
+        hx = max(0.0, min(self.W - hw, cx - hw / 2))
+        return [hx, max(0.0, y), hw, hh]
+
+    def update(self, dets, t):
+        """Feed one frame's IMX500 detections; returns the confirmed head tracks."""
+        self.frames += 1
+        heads = []
+        for d in dets:
+            if d.category != PERSON or d.conf < self.min_conf:
+                continue
+            heads.append({"box": self.head_box(d.box), "score": float(d.conf),
+                          "person_box": list(d.box), "source": "imx500"})
+
+        confirmed = self.tracks.update(heads, t)
+
+        # EMA on the boxes of tracks that were matched this frame
+        a = self.smooth
+        for tr in self.tracks.tracks.values():
+            if tr.misses:
+                continue
+            prev = self._smoothed.get(tr.id)
+            if prev is not None:
+                tr.box = [p + a * (n - p) for p, n in zip(prev, tr.box)]
+            self._smoothed[tr.id] = tr.box
+            tr.face["box"] = [int(round(v)) for v in tr.box]
+        for tid in list(self._smoothed):
+            if tid not in self.tracks.tracks:
+                del self._smoothed[tid]
+
+        self._update_near()
+        return confirmed
+
+    def _update_near(self):
+        target = self.attention
+        if target is None:
+            self.near = False
+            return
+        frac = target.face["person_box"][3] / self.H
+        self.near = frac >= (self.near_exit if self.near else self.near_enter)
+        if self.near:
+            self.near_frames += 1
+
+    def needs_identity(self, now):
+        """True during the first identify_s of an attention person nobody has named yet."""
+        target = self.attention
+        return (target is not None and target.name is None
+                and now - target.first_seen < self.identify_s)
+
+    @property
+    def attention(self):
+        return self.tracks.attention
+
+    def faces(self):
+        """Face-like dicts of the confirmed head tracks (for State / previews)."""
+        return [tr.face for tr in self.tracks.confirmed()]
+
+    def report(self):
+        near = self.near_frames / self.frames if self.frames else 0.0
+        return (f"[person] {self.frames} frames, {len(self.tracks.confirmed())} people, "
+                f"close enough for face detection {near:.0%} of the time")
@@ -1,6 +1,43 @@
 import cv2
 import asyncio
 
+
+def preview_step(state, window_name="KIRI Preview"):
+    """
+    Draw one preview frame. Returns False when 'q' was pressed.
+    Usable directly as a Scheduler task (create the window first).
+    """
+    frame = state.frame
+    faces = state.faces
+
+    if frame is not None:
+        shown = frame.copy()
+
+        if faces:
+            for face in faces:
+                x, y, w, h = face["box"]
+                cv2.rectangle(shown, (x, y), (x+w, y+h), (0, 255, 0), 2)
+
+        cv2.imshow(window_name, shown)
+
+    # process GUI events — non-blocking
+    return not (cv2.waitKey(1) & 0xFF == ord('q'))
+
+
+def encode_frame(frame, faces, quality=75):
+    """Draw face boxes on a copy of `frame` and JPEG-encode it (None on failure)."""
+    shown = frame.copy()
+
+    # Draw bounding boxes
+    for f in faces:
+        x, y, w, h = f["box"]
+        cv2.rectangle(shown, (x, y), (x+w, y+h), (0, 255, 0), 2)
+
+    # Encode JPEG
+    ret, jpeg = cv2.imencode('.jpg', shown, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return jpeg.tobytes() if ret else None
+
+
 async def preview_loop(state, window_name="KIRI Preview", hz=12):
     """
     Shows live feed with bounding boxes.
@@ -10,21 +47,7 @@ async def preview_loop(state, window_name="KIRI Preview", hz=12):
     cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
 
     while True:
-        frame = state.frame
-        faces = state.faces
-
-        if frame is not None:
-            shown = frame.copy()
-
-            if faces:
-                for face in faces:
-                    x, y, w, h = face["box"]
-                    cv2.rectangle(shown, (x, y), (x+w, y+h), (0, 255, 0), 2)
-
-            cv2.imshow(window_name, shown)
-
-        # process GUI events — non-blocking
-        if cv2.waitKey(1) & 0xFF == ord('q'):
+        if not preview_step(state, window_name):
             break
 
         await asyncio.sleep(dt)
@@ -0,0 +1,66 @@
+# perception/static_gate.py
+from perception.frame_diff import FrameDiff
+
+
+class StaticSceneGate:
+    """
+    Skips face detection on frames that look like the last processed one.
+
+    Each frame is compared (FrameDiff: 32x24 grayscale, mean absdiff) with
+    the last frame the detector actually ran on, not with its predecessor,
+    so slow drift still adds up to a refresh. Detection runs when the
+    scene changed, the head is moving (the image shifts even if the room
+    doesn't), nothing is cached yet, or the cached result is older than
+    1/min_refresh_hz. Otherwise reuse() hands back the cached faces, each
+    with an "age" (seconds since the frame they were detected on).
+
+        if gate.should_detect(frame, now, moving=not motion.at_target()):
+            faces = fr.detect_faces(frame)
+            gate.store(faces, now)
+        else:
+            faces = gate.reuse(now)
+    """
+
+    def __init__(self, threshold=4.0, min_refresh_hz=2.0, size=(32, 24)):
+        self.diff = FrameDiff(size=size, threshold=threshold)
+        self.max_age = 1.0 / min_refresh_hz
+        self.faces = None
+        self.t_detect = None
+
+        # stats
+        self.frames = 0
+        self.skipped = 0
+        self.forced = 0
+
+    def should_detect(self, bgr, now, moving=False):
+        self.frames += 1
+        changed = self.diff.changed(bgr, update=False)
+        if self.faces is None or changed or moving:
+            return True
+        if now - self.t_detect >= self.max_age:
+            self.forced += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def store(self, faces, t_capture):
+        """Cache a fresh detection; its frame becomes the new reference."""
+        self.faces = faces
+        self.t_detect = t_capture
+        self.diff.accept()
+
+    def reuse(self, now):
+        age = now - self.t_detect
+        return [dict(f, age=age) for f in self.faces]
+
+    def reset(self):
+        self.faces = None
+        self.diff.reset()
+
+    @property
+    def skip_fraction(self):
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def report(self):
+        return (f"[static] skipped {self.skipped}/{self.frames} detector calls "
+                f"({self.skip_fraction:.0%}), forced refreshes {self.forced}")
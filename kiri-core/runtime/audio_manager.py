@@ -1,38 +1,226 @@
 import asyncio
+import functools
+import itertools
+import time
 from hardware.piper_tts import TTS
+from hardware.tts_worker import SynthWorker
+
+# Suggested priorities (higher = more urgent)
+PRIORITY_CHATTER = -10
+PRIORITY_NORMAL = 0
+PRIORITY_URGENT = 10
+
+
+class Utterance:
+    """One queued speech request."""
+
+    _order = itertools.count()
+
+    def __init__(self, text, priority=PRIORITY_NORMAL, ttl=None, key=None):
+        self.text = text
+        self.priority = priority
+        self.key = key                      # coalescing key, e.g. "greet:anna"
+        self.created = time.monotonic()
+        self.deadline = self.created + ttl if ttl is not None else None
+        self.dropped = False                # superseded by a newer utterance with the same key
+        self.interrupted = False            # cut off by higher-priority speech
+        self.bumped = False                 # synthesized ahead, but something more urgent arrived
+        self.seq = next(self._order)
+
+    def expired(self, now):
+        return self.deadline is not None and now > self.deadline
+
+    def __lt__(self, other):
+        # PriorityQueue pops the smallest: highest priority first, then FIFO
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
 
 class AudioManager:
     """
     A non-blocking audio manager for Piper TTS.
 
-    - Maintains an async queue of messages to speak.
-    - Executes Piper in a separate thread (since Piper blocks).
-    - Ensures no overlapping speech unless explicitly allowed.
+    - Maintains an async priority queue of utterances to speak.
+    - Runs Piper in a dedicated worker process (use_worker=False keeps it
+      in-process) and pipelines it: utterance N+1 is synthesized while N
+      plays, and playback of N+1 is queued just before N ends.
+    - Plays through a separate thread (since playback blocks).
+    - Ensures no overlapping speech: a higher-priority utterance
+      interrupts lower-priority playback instead.
+    - Drops utterances past their ttl and merges duplicates that share
+      a coalescing key (the newest text wins).
+    - queue.join() still waits for everything queued to be spoken or dropped.
     """
 
-    def __init__(self):
-        self.tts = TTS()
-        self.queue = asyncio.Queue()
+    def __init__(self, use_worker=True, gap_margin=0.05):
+        self.tts = TTS(synth=SynthWorker() if use_worker else None)
+        self.queue = asyncio.PriorityQueue()
+        self._ready = asyncio.Queue(maxsize=1)   # synthesized-ahead utterance
+        self.gap_margin = gap_margin
         self.running = False
+        self.current = None
+        self._prepared = None   # utterance being synthesized ahead / waiting in self._ready
+        self._room = asyncio.Event()   # set while self._ready is empty
+        self._room.set()
+        self._pending = {}      # key -> queued Utterance
+
+        # stats
+        self.spoken = 0
+        self.expired = 0
+        self.coalesced = 0
+        self.preempted = 0
+        self.wait_sum = 0.0     # enqueue → playback start
+        self.wait_max = 0.0
+        self.ttfa_sum = 0.0     # playback start → first audio
+        self.ttfa_max = 0.0
 
     async def start(self):
         """Start the audio loop."""
         if self.running:
             return
         self.running = True
+        asyncio.create_task(self._synth_loop())
         asyncio.create_task(self._audio_loop())
 
-    async def say(self, text: str):
-        """Public method — enqueue a speech request."""
-        await self.queue.put(text)
+    async def say(self, text, priority=PRIORITY_NORMAL, ttl=None, key=None):
+        """
+        Public method — enqueue a speech request.
+        text may also be a dict {"text", "priority", "ttl", "key"}
+        (handy when publishing on the "speak" bus topic).
+        """
+        if isinstance(text, dict):
+            priority = text.get("priority", priority)
+            ttl = text.get("ttl", ttl)
+            key = text.get("key", key)
+            text = text["text"]
+
+        u = Utterance(text, priority, ttl, key)
+
+        if key is not None:
+            old = self._pending.get(key)
+            if old is not None:
+                old.dropped = True
+                self.coalesced += 1
+            self._pending[key] = u
+
+        cur = self.current
+        if cur is not None and priority > cur.priority and not cur.interrupted:
+            cur.interrupted = True
+            self.preempted += 1
+            self.tts.stop()
+
+        prep = self._prepared
+        if prep is not None:
+            if priority > prep.priority:
+                prep.bumped = True
+            if key is not None and prep.key == key and not prep.dropped:
+                prep.dropped = True         # synthesized ahead, but superseded too
+                self.coalesced += 1
+
+        await self.queue.put(u)
+
+    def _skip(self, u, now):
+        """True if u should not be spoken (superseded or too old)."""
+        if u.dropped:
+            return True
+        if u.expired(now):
+            self.expired += 1
+            return True
+        return False
+
+    async def _synth_loop(self):
+        """Stage 1: pick the next utterance and start synthesizing it."""
+        loop = asyncio.get_running_loop()
+        while self.running:
+            # don't hold an utterance outside the queue while another one
+            # waits to play: say() could not bump it
+            await self._room.wait()
+            u = await self.queue.get()
+            if u.key is not None and self._pending.get(u.key) is u:
+                del self._pending[u.key]
+
+            if self._skip(u, time.monotonic()):
+                self.queue.task_done()
+                continue
+
+            self._prepared = u
+            try:
+                # cache lookup / worker request (starts synthesis right away)
+                stream = await loop.run_in_executor(None, self.tts.open_stream, u.text)
+            except Exception as e:
+                print(f"[audio] failed to synthesize {u.text!r}: {e!r}")
+                self._prepared = None
+                self.queue.task_done()
+                continue
+
+            self._room.clear()
+            await self._ready.put((u, stream))
 
     async def _audio_loop(self):
-        """Background loop: processes speech requests continuously."""
+        """Stage 2: play prepared utterances back to back."""
+        loop = asyncio.get_running_loop()
         while self.running:
-            text = await self.queue.get()
+            u, (rate, chunks, cached) = await self._ready.get()
+            self._room.set()
+            if self._prepared is u:
+                self._prepared = None
+            try:
+                now = time.monotonic()
+                if self._skip(u, now) or u.bumped:
+                    if hasattr(chunks, "cancel"):
+                        chunks.cancel()
+                    if u.bumped and not u.dropped:
+                        # let the more urgent utterance go first, retry this one after;
+                        # back in _pending so a later say() with its key still supersedes it
+                        u.bumped = False
+                        if u.key is not None:
+                            newer = self._pending.get(u.key)
+                            if newer is not None and newer is not u:
+                                u.dropped = True     # a newer same-key utterance is queued
+                                self.coalesced += 1
+                                continue
+                            self._pending[u.key] = u
+                        await self.queue.put(u)
+                    continue
+
+                wait = now - u.created
+                self.wait_sum += wait
+                self.wait_max = max(self.wait_max, wait)
+
+                # Arm the sink before u becomes preemptible: a stop() from
+                # say() between here and the first write must still count
+                self.tts.begin(rate)
+                self.current = u
+
+                # Offload blocking playback to a thread
+                await loop.run_in_executor(
+                    None, functools.partial(self.tts.play_stream, rate, chunks, now,
+                                            None if cached else u.text, self.gap_margin, reset=False),
+                )
 
-            # Offload Piper blocking call to a thread
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, self.tts.say, text)
+                if u.interrupted:
+                    if hasattr(chunks, "cancel"):
+                        chunks.cancel()
+                    continue
+                self.spoken += 1
+                ttfa = self.tts.last_ttfa or 0.0
+                self.ttfa_sum += ttfa
+                self.ttfa_max = max(self.ttfa_max, ttfa)
+            except Exception as e:
+                print(f"[audio] failed to speak {u.text!r}: {e!r}")
+            finally:
+                self.current = None
+                self.queue.task_done()
 
-            self.queue.task_done()
+    def stats(self):
+        n = max(1, self.spoken)
+        return {
+            "queued": self.queue.qsize(),
+            "spoken": self.spoken,
+            "expired": self.expired,
+            "coalesced": self.coalesced,
+            "preempted": self.preempted,
+            "wait_avg_ms": 1000 * self.wait_sum / n,
+            "wait_max_ms": 1000 * self.wait_max,
+            "ttfa_avg_ms": 1000 * self.ttfa_sum / n,
+            "ttfa_max_ms": 1000 * self.ttfa_max,
+        }
@@ -0,0 +1,521 @@
+import asyncio
+import os
+import struct
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from runtime.event_bus import EventBus, DEFAULT_POLICY, DEFAULT_MAXSIZE, LATEST, FIFO
+
+# Cross-process EventBus bridge over a Unix domain socket.
+#
+#   hub process:     hub = BusHub(bus, "/tmp/kiri-bus.sock"); await hub.start()
+#   other process:   rb = BusClient("/tmp/kiri-bus.sock"); await rb.connect()
+#                    rb.subscribe("face.detected", on_face)
+#                    await rb.publish("frame", frame)     # big arrays go via shared memory
+#
+# Every process keeps its own EventBus; the hub routes published events
+# to the local bus and to every peer subscribed to the topic. Per-topic
+# policies (latest / fifo / drop_oldest) apply to each peer's outbox too,
+# so a slow consumer only ever holds one pending frame.
+
+DEFAULT_PATH = "/tmp/kiri-bus.sock"
+
+# --- framing: kind (B), topic length (H), payload length (I) ---
+_HDR = struct.Struct("!BHI")
+PUB, SUB, UNSUB = 1, 2, 3
+
+SHM_THRESHOLD = 64 * 1024    # arrays at least this big travel via shared memory
+SHM_SLOTS = 4
+
+
+# ---------- payload codec (struct-packed, tagged) ----------
+
+_Q = struct.Struct("!q")
+_D = struct.Struct("!d")
+_I = struct.Struct("!I")
+
+
+def _enc(obj, out, shm):
+    if obj is None:
+        out.append(b"N")
+    elif obj is True:
+        out.append(b"T")
+    elif obj is False:
+        out.append(b"F")
+    elif isinstance(obj, int):
+        out += (b"i", _Q.pack(obj))
+    elif isinstance(obj, float):
+        out += (b"f", _D.pack(obj))
+    elif isinstance(obj, str):
+        b = obj.encode()
+        out += (b"s", _I.pack(len(b)), b)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        out += (b"b", _I.pack(len(obj)), bytes(obj))
+    elif isinstance(obj, (list, tuple)):
+        out += (b"l", _I.pack(len(obj)))
+        for v in obj:
+            _enc(v, out, shm)
+    elif isinstance(obj, dict):
+        out += (b"d", _I.pack(len(obj)))
+        for k, v in obj.items():
+            _enc(k, out, shm)
+            _enc(v, out, shm)
+    elif isinstance(obj, np.ndarray):
+        handle = shm.put(obj) if shm is not None and obj.nbytes >= SHM_THRESHOLD else None
+        if handle is not None:
+            out.append(b"S")
+            _enc(handle, out, None)
+        else:
+            a = np.ascontiguousarray(obj)
+            out.append(b"a")
+            _enc([a.dtype.str, list(a.shape)], out, None)
+            out += (_I.pack(a.nbytes), a.tobytes())
+    elif isinstance(obj, np.generic):
+        _enc(obj.item(), out, shm)
+    else:
+        raise TypeError(f"bus bridge cannot encode {type(obj).__name__}")
+
+
+def encode(obj, shm=None):
+    out = []
+    _enc(obj, out, shm)
+    return b"".join(out)
+
+
+def _dec(buf, i, attach):
+    tag = buf[i:i + 1]
+    i += 1
+    if tag == b"N":
+        return None, i
+    if tag == b"T":
+        return True, i
+    if tag == b"F":
+        return False, i
+    if tag == b"i":
+        return _Q.unpack_from(buf, i)[0], i + 8
+    if tag == b"f":
+        return _D.unpack_from(buf, i)[0], i + 8
+    if tag in (b"s", b"b"):
+        n = _I.unpack_from(buf, i)[0]
+        raw = bytes(buf[i + 4:i + 4 + n])
+        return (raw.decode() if tag == b"s" else raw), i + 4 + n
+    if tag == b"l":
+        n = _I.unpack_from(buf, i)[0]
+        i += 4
+        items = []
+        for _ in range(n):
+            v, i = _dec(buf, i, attach)
+            items.append(v)
+        return items, i
+    if tag == b"d":
+        n = _I.unpack_from(buf, i)[0]
+        i += 4
+        d = {}
+        for _ in range(n):
+            k, i = _dec(buf, i, attach)
+            v, i = _dec(buf, i, attach)
+            d[k] = v
+        return d, i
+    if tag == b"a":
+        (dtype, shape), i = _dec(buf, i, attach)
+        n = _I.unpack_from(buf, i)[0]
+        a = np.frombuffer(bytes(buf[i + 4:i + 4 + n]), dtype=dtype).reshape(shape)
+        return a, i + 4 + n
+    if tag == b"S":
+        handle, i = _dec(buf, i, attach)
+        return attach(handle), i
+    raise ValueError(f"bad tag {tag!r} at {i - 1}")
+
+
+def decode(buf, attach=None):
+    return _dec(memoryview(buf), 0, attach or _no_shm)[0]
+
+
+def _no_shm(handle):
+    raise ValueError("shared-memory payload without an attach function")
+
+
+# ---------- shared memory for large arrays ----------
+
+class StaleShm(Exception):
+    """A shared-memory slot was reused before it could be copied out; drop the event."""
+
+
+class ShmWriter:
+    """
+    Publisher-owned ring of shared-memory slots per (shape, dtype).
+
+    Each slot starts with an 8-byte generation counter (seqlock): it is
+    set to -1 while writing, then to the new generation, so a reader
+    that copies while the slot is being reused notices and drops it.
+    """
+    GEN = struct.Struct("q")
+
+    def __init__(self, slots=SHM_SLOTS):
+        self.slots = slots
+        self.rings = {}     # (shape, dtype) -> [SharedMemory]
+        self.next = {}
+        self.gen = 0
+
+    def put(self, arr):
+        key = (arr.shape, arr.dtype.str)
+        ring = self.rings.get(key)
+        if ring is None:
+            size = self.GEN.size + arr.nbytes
+            ring = self.rings[key] = [shared_memory.SharedMemory(create=True, size=size)
+                                      for _ in range(self.slots)]
+            self.next[key] = 0
+        i = self.next[key]
+        self.next[key] = (i + 1) % self.slots
+        shm = ring[i]
+        self.gen += 1
+        self.GEN.pack_into(shm.buf, 0, -1)
+        np.ndarray(arr.shape, arr.dtype, buffer=shm.buf, offset=self.GEN.size)[...] = arr
+        self.GEN.pack_into(shm.buf, 0, self.gen)
+        return [shm.name, arr.dtype.str, list(arr.shape), self.gen]
+
+    def close(self):
+        for ring in self.rings.values():
+            for shm in ring:
+                shm.close()
+                try:
+                    shm.unlink()
+                except FileNotFoundError:
+                    pass
+        self.rings.clear()
+
+
+class ShmReader:
+    """Attaches to publishers' slots (cached) and copies arrays out."""
+
+    def __init__(self):
+        self.maps = {}
+        self.stale = 0
+
+    def __call__(self, handle):
+        name, dtype, shape, gen = handle
+        shm = self.maps.get(name)
+        if shm is None:
+            shm = self.maps[name] = _attach(name)
+        arr = np.ndarray(shape, dtype, buffer=shm.buf, offset=ShmWriter.GEN.size).copy()
+        if ShmWriter.GEN.unpack_from(shm.buf, 0)[0] != gen:
+            self.stale += 1      # slot was reused under us
+            raise StaleShm(name)
+        return arr
+
+    def close(self):
+        for shm in self.maps.values():
+            shm.close()
+        self.maps.clear()
+
+
+def _attach(name):
+    """Open an existing segment without handing it to this process's resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)   # Python >= 3.13
+    except TypeError:
+        pass
+    # older Pythons register every attach, and the tracker would unlink the
+    # publisher's segment when this process exits
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *a, **k: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+# ---------- per-peer outbox with delivery policies ----------
+
+class _Outbox:
+    """
+    Outgoing frames of one connection. LATEST keeps one pending frame per
+    topic, DROP_OLDEST a bounded queue. FIFO never drops: it holds up to
+    `fifo_limit` frames per topic, publishers that can wait use
+    wait_room(), and a put() past the limit calls on_overflow (the hub
+    disconnects the stalled peer).
+    """
+
+    def __init__(self, policies, maxsize, fifo_limit=None, on_overflow=None):
+        self.policies = policies
+        self.maxsize = maxsize
+        self.fifo_limit = fifo_limit or maxsize * 8
+        self.on_overflow = on_overflow
+        self.queues = {}
+        self.fifo = set()        # topics with the FIFO policy
+        self.ready = deque()     # topics in arrival order, one entry per pending frame
+        self.wake = asyncio.Event()
+        self.room = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.overflows = 0
+        self.closed = False      # the send loop has ended
+
+    def _queue(self, topic):
+        q = self.queues.get(topic)
+        if q is None:
+            policy = self.policies.get(topic, DEFAULT_POLICY)
+            maxlen = 1 if policy == LATEST else (None if policy == FIFO else self.maxsize)
+            q = self.queues[topic] = deque(maxlen=maxlen)
+            if policy == FIFO:
+                self.fifo.add(topic)
+        return q
+
+    def full(self, topic):
+        return topic in self.fifo and len(self.queues[topic]) >= self.fifo_limit
+
+    def put(self, topic, frame):
+        q = self._queue(topic)
+        if self.full(topic):
+            self.overflows += 1
+            if self.on_overflow:
+                self.on_overflow()
+            return
+        if q.maxlen is not None and len(q) == q.maxlen:
+            self.dropped += 1    # deque drops the oldest; its ready slot is reused
+        else:
+            self.ready.append(topic)
+        q.append(frame)
+        self.wake.set()
+
+    async def wait_room(self, topic, timeout=None):
+        """Wait until a FIFO topic is below its limit (no-op for other policies)."""
+        self._queue(topic)
+        if self.full(topic) and timeout is not None:
+            await asyncio.wait_for(self.wait_room(topic), timeout)
+            return
+        while self.full(topic) and not self.closed:
+            self.room.clear()
+            await self.room.wait()
+
+    async def get(self):
+        while not self.ready:
+            self.wake.clear()
+            await self.wake.wait()
+        topic = self.ready.popleft()
+        self.room.set()
+        return self.queues[topic].popleft()
+
+
+def _frame(kind, topic, payload=b""):
+    t = topic.encode()
+    return _HDR.pack(kind, len(t), len(payload)) + t + payload
+
+
+async def _read_frame(reader):
+    kind, tlen, plen = _HDR.unpack(await reader.readexactly(_HDR.size))
+    body = await reader.readexactly(tlen + plen)
+    return kind, body[:tlen].decode(), body[tlen:]
+
+
+class _Peer:
+    def __init__(self, reader, writer, policies, maxsize, on_overflow=None):
+        self.reader = reader
+        self.writer = writer
+        self.topics = set()
+        self.outbox = _Outbox(policies, maxsize, on_overflow=on_overflow)
+        self.received = 0
+        self.task = asyncio.create_task(self._send_loop())
+
+    async def _send_loop(self):
+        try:
+            while True:
+                self.writer.write(await self.outbox.get())
+                self.outbox.sent += 1
+                # every frame: keeps the transport buffer at its high-water mark,
+                # so a stalled reader backs up into the (bounded) outbox
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.outbox.closed = True
+            self.outbox.room.set()
+
+    def close(self):
+        self.task.cancel()
+        self.writer.close()
+
+
+# ---------- hub (owns the socket, routes between processes) ----------
+
+class BusHub:
+    """Serves `bus` to other processes on a Unix socket and routes between them."""
+
+    def __init__(self, bus: EventBus, path=DEFAULT_PATH, maxsize=DEFAULT_MAXSIZE, stall_timeout=5.0):
+        self.bus = bus
+        self.path = path
+        self.maxsize = maxsize
+        self.stall_timeout = stall_timeout    # FIFO relay waits this long for a slow peer
+        self.peers = []
+        self.server = None
+        self.shm = ShmWriter()
+        self.attach = ShmReader()
+        self._relaying = False    # next tap call is a relayed peer event
+        bus.tap(self._on_local)
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self._serve, path=self.path)
+        os.chmod(self.path, 0o600)
+        print(f"[bridge] hub on {self.path}")
+        return self
+
+    def _on_local(self, topic, data):
+        # local publish → peers (events relayed from a peer were forwarded already;
+        # taps run synchronously at the start of publish, so the flag is ours)
+        if self._relaying:
+            self._relaying = False
+            return
+        peers = [p for p in self.peers if topic in p.topics]
+        if peers:
+            frame = _frame(PUB, topic, encode(data, self.shm))
+            for p in peers:
+                p.outbox.put(topic, frame)
+
+    async def _serve(self, reader, writer):
+        peer = None
+
+        def overflow():
+            # a FIFO topic backed up: the peer stopped reading
+            if peer in self.peers:
+                self.peers.remove(peer)
+                print(f"[bridge] peer stalled (fifo limit {peer.outbox.fifo_limit}), disconnecting")
+                peer.close()
+
+        peer = _Peer(reader, writer, self.bus.policies, self.maxsize, on_overflow=overflow)
+        self.peers.append(peer)
+        try:
+            while True:
+                kind, topic, payload = await _read_frame(reader)
+                if kind == SUB:
+                    peer.topics.add(topic)
+                elif kind == UNSUB:
+                    peer.topics.discard(topic)
+                elif kind == PUB:
+                    peer.received += 1
+                    frame = None
+                    for p in list(self.peers):
+                        if p is not peer and topic in p.topics:
+                            # FIFO backpressure: stop reading from the publisher until
+                            # the subscriber catches up (or is dropped as stalled)
+                            try:
+                                await p.outbox.wait_room(topic, self.stall_timeout)
+                            except asyncio.TimeoutError:
+                                p.outbox.on_overflow()
+                                continue
+                            frame = frame or _frame(PUB, topic, payload)
+                            p.outbox.put(topic, frame)
+                    # decode only if someone in this process listens
+                    if self.bus.subscribers.get(topic) or len(self.bus.taps) > 1:
+                        try:
+                            data = decode(payload, self.attach)
+                        except StaleShm:
+                            continue    # shared-memory slot already reused
+                        self._relaying = True
+                        await self.bus.publish(topic, data)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if peer in self.peers:
+                self.peers.remove(peer)
+            peer.close()
+
+    def stats(self):
+        return [{"topics": sorted(p.topics), "received": p.received, "sent": p.outbox.sent,
+                 "dropped": p.outbox.dropped, "overflows": p.outbox.overflows} for p in self.peers]
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        for p in list(self.peers):
+            p.close()
+        self.shm.close()
+        self.attach.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+# ---------- client (any other process) ----------
+
+class BusClient:
+    """
+    EventBus-like endpoint in another process. Subscribers run on a local
+    EventBus (same per-topic policies); publishes go to the local bus and
+    to the hub.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, policies=None, maxsize=DEFAULT_MAXSIZE, use_shm=True):
+        self.path = path
+        self.bus = EventBus(policies, maxsize)
+        self.policies = self.bus.policies
+        self.maxsize = maxsize
+        self.shm = ShmWriter() if use_shm else None
+        self.attach = ShmReader()
+        self.peer = None
+        self._reader_task = None
+        self.received = 0
+
+    async def connect(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.05)
+        self.peer = _Peer(reader, writer, self.policies, self.maxsize)
+        for topic in self.bus.subscribers:
+            self.peer.writer.write(_frame(SUB, topic))
+        self._reader_task = asyncio.create_task(self._recv_loop())
+        return self
+
+    def subscribe(self, topic, callback):
+        new = topic not in self.bus.subscribers
+        sub = self.bus.subscribe(topic, callback)
+        if new and self.peer:
+            self.peer.writer.write(_frame(SUB, topic))
+        return sub
+
+    async def publish(self, topic, data=None):
+        if self.peer:
+            await self.peer.outbox.wait_room(topic)     # FIFO: wait for a stalled hub
+            self.peer.outbox.put(topic, _frame(PUB, topic, encode(data, self.shm)))
+        await self.bus.publish(topic, data)
+
+    async def _recv_loop(self):
+        try:
+            while True:
+                kind, topic, payload = await _read_frame(self.peer.reader)
+                if kind != PUB:
+                    continue
+                try:
+                    data = decode(payload, self.attach)
+                except StaleShm:
+                    continue    # shared-memory slot already reused
+                self.received += 1
+                await self.bus.publish(topic, data)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+
+    def stats(self):
+        p = self.peer
+        return {"received": self.received, "sent": p.outbox.sent if p else 0,
+                "dropped": p.outbox.dropped if p else 0, "stale_shm": self.attach.stale}
+
+    async def close(self):
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self.peer:
+            self.peer.close()
+        await self.bus.close()
+        if self.shm:
+            self.shm.close()
+        self.attach.close()
@@ -1,13 +1,139 @@
 import asyncio
+import inspect
+import time
 from collections import defaultdict
 
+# Delivery policies
+LATEST = "latest"            # keep only the newest pending event
+FIFO = "fifo"                # keep everything, publisher waits when full
+DROP_OLDEST = "drop_oldest"  # bounded, oldest pending event is discarded
+
+DEFAULT_POLICIES = {
+    "face.detected": LATEST,
+    "speak": FIFO,
+}
+DEFAULT_POLICY = DROP_OLDEST
+DEFAULT_MAXSIZE = 32
+
+
+class Subscriber:
+    """
+    One callback on one topic.
+
+    Coroutine callbacks get a persistent worker task fed by a bounded
+    queue; plain callbacks are called inline from publish().
+    """
+
+    def __init__(self, event, callback, policy, maxsize):
+        self.event = event
+        self.callback = callback
+        self.policy = policy
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        self.is_async = inspect.iscoroutinefunction(callback)
+
+        size = 1 if policy == LATEST else maxsize
+        self.queue = asyncio.Queue(maxsize=size) if self.is_async else None
+        self.task = None
+
+        # stats
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latency_sum = 0.0     # publish → callback start
+        self.latency_max = 0.0
+
+    async def offer(self, data):
+        item = (time.monotonic(), data)
+
+        if not self.is_async:
+            await self._call(item)
+            return
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._worker())
+
+        if self.policy == FIFO:
+            await self.queue.put(item)
+        else:
+            if self.queue.full():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(item)
+
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    async def _worker(self):
+        while True:
+            item = await self.queue.get()
+            await self._call(item)
+
+    async def _call(self, item):
+        t_pub, data = item
+        lat = time.monotonic() - t_pub
+        self.latency_sum += lat
+        self.latency_max = max(self.latency_max, lat)
+        try:
+            result = self.callback(data)
+            if inspect.isawaitable(result):
+                await result
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"[bus] {self.event} → {self.name} failed: {e!r}")
+
+    def stats(self):
+        n = max(1, self.delivered + self.errors)
+        return {
+            "callback": self.name,
+            "policy": self.policy if self.is_async else "inline",
+            "depth": self.queue.qsize() if self.queue else 0,
+            "max_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "latency_avg_ms": 1000 * self.latency_sum / n,
+            "latency_max_ms": 1000 * self.latency_max,
+        }
+
+
 class EventBus:
-    def __init__(self):
+    def __init__(self, policies=None, maxsize=DEFAULT_MAXSIZE):
         self.subscribers = defaultdict(list)
+        self.taps = []      # fn(event, data), called for every event
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        self.maxsize = maxsize
+
+    def set_policy(self, event, policy):
+        """Policy for subscribers added after this call."""
+        self.policies[event] = policy
 
     def subscribe(self, event, callback):
-        self.subscribers[event].append(callback)
+        policy = self.policies.get(event, DEFAULT_POLICY)
+        sub = Subscriber(event, callback, policy, self.maxsize)
+        self.subscribers[event].append(sub)
+        return sub
+
+    def tap(self, fn):
+        """Observe every published event (e.g. a session recorder)."""
+        self.taps.append(fn)
 
     async def publish(self, event, data=None):
-        for cb in self.subscribers[event]:
-            asyncio.create_task(cb(data))
+        for fn in self.taps:
+            fn(event, data)
+        for sub in self.subscribers.get(event, ()):
+            await sub.offer(data)
+
+    def stats(self):
+        return {
+            event: [s.stats() for s in subs]
+            for event, subs in self.subscribers.items()
+        }
+
+    async def close(self):
+        """Cancel all subscriber workers (pending events are discarded)."""
+        tasks = [s.task for subs in self.subscribers.values() for s in subs if s.task]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,64 @@
+import time
+
+
+class IdleGovernor:
+    """
+    Power governor driven by time since the last face.
+
+    Active: everything at full rate. After `idle_after` seconds without a
+    face the governor goes idle; callers then capture/detect at reduced
+    rates (detect_due() says when a full detection is still wanted) and
+    park loops that have nothing to do. Any face, IMX500 person or frame
+    motion wakes it on the same frame.
+
+    on_change(idle: bool) is called on every transition.
+    """
+
+    def __init__(self, idle_after=10.0, idle_detect_hz=1.0, on_change=None):
+        self.idle_after = float(idle_after)
+        self.idle_detect_period = 1.0 / idle_detect_hz
+        self.on_change = on_change
+
+        self.idle = False
+        self.last_activity = time.monotonic()
+        self.last_detect = 0.0
+
+        # stats
+        self.transitions = 0
+        self.idle_since = None
+        self.idle_total = 0.0
+
+    def _set(self, idle, now):
+        if idle == self.idle:
+            return
+        self.idle = idle
+        self.transitions += 1
+        if idle:
+            self.idle_since = now
+        else:
+            self.idle_total += now - self.idle_since
+            self.idle_since = None
+        print(f"[idle] {'idle' if idle else 'active'}")
+        if self.on_change:
+            self.on_change(idle)
+
+    def update(self, now, face=False, person=False, motion=False):
+        """Feed one frame's cues; returns True while idle."""
+        if face or (self.idle and (person or motion)):
+            self.last_activity = now
+            self._set(False, now)
+        elif not self.idle and now - self.last_activity > self.idle_after:
+            self._set(True, now)
+        return self.idle
+
+    def detect_due(self, now):
+        """Whether to run face detection on this frame."""
+        return not self.idle or now - self.last_detect >= self.idle_detect_period
+
+    def note_detect(self, now):
+        self.last_detect = now
+
+    def idle_seconds(self, now):
+        """Total time spent idle so far."""
+        total = self.idle_total + (now - self.idle_since if self.idle else 0.0)
+        return total
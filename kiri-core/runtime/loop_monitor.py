@@ -0,0 +1,189 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+
+PROJECT = Path(__file__).resolve().parents[1]
+
+
+class LoopMonitor:
+    """
+    Event-loop lag monitor and blocking-call detector.
+
+    A heartbeat coroutine sleeps `interval` seconds and measures how late
+    it wakes up (= loop lag). A watchdog thread notices when the heartbeat
+    has been silent longer than `threshold` and samples the loop thread's
+    Python stack via sys._current_frames(); when the loop recovers, the
+    stall's duration is charged to the most-sampled project call site.
+
+    Cheap enough to leave on: the watchdog only walks stacks while the
+    loop is actually blocked and the offender table is bounded.
+
+        mon = LoopMonitor()
+        mon.start()            # from inside the running loop
+        ...
+        print(mon.report())
+    """
+
+    def __init__(self, interval=0.01, threshold=0.05, sample_s=0.01, max_offenders=100):
+        self.interval = interval
+        self.threshold = threshold
+        self.sample_s = sample_s
+        self.max_offenders = max_offenders
+
+        self.beats = 0
+        self.max_lag = 0.0
+        self.lags = Counter()         # lag histogram, 1 ms buckets
+        self.stalls = 0
+        self.blocked_s = 0.0
+        self.offenders = {}           # site -> {"n", "total", "max", "stack"}
+
+        self._beat_t = None
+        self._peak_lag = 0.0          # max beat lag since the current stall began
+        self._loop_thread = None
+        self._task = None
+        self._thread = None
+        self._running = False
+
+    # --- lifecycle ---
+    def start(self):
+        """Start heartbeat + watchdog; call from the event-loop thread."""
+        if self._running:
+            return self
+        self._running = True
+        self._loop_thread = threading.get_ident()
+        self._beat_t = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+
+    # --- heartbeat (loop thread) ---
+    async def _heartbeat(self):
+        while self._running:
+            t0 = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - t0 - self.interval)
+            self.lags[int(lag * 1000)] += 1
+            self.max_lag = max(self.max_lag, lag)
+            self._peak_lag = max(self._peak_lag, lag)
+            self.beats += 1
+            self._beat_t = now
+
+    # --- watchdog (own thread) ---
+    def _watchdog(self):
+        samples = None        # Counter of sites during the current stall
+        stacks = {}
+        silent_max = 0.0
+        seen = self.beats
+        while self._running:
+            time.sleep(self.sample_s)
+            if samples is not None and self.beats != seen:
+                # loop recovered: charge the stall to its main offender. More
+                # short beats may have landed since, so use the peak lag (or
+                # the silence measured here, whichever is longer)
+                self._charge(samples, stacks, max(self._peak_lag, silent_max))
+                samples, stacks = None, {}
+            seen = self.beats
+
+            silent = time.monotonic() - self._beat_t - self.interval
+            if silent < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            site, stack = self._site(frame)
+            del frame
+            if samples is None:
+                samples = Counter()
+                silent_max = 0.0
+                self._peak_lag = 0.0
+            silent_max = max(silent_max, silent)
+            samples[site] += 1
+            stacks[site] = stack
+
+    def _site(self, frame):
+        """(innermost project call site, short formatted stack)."""
+        summary = traceback.extract_stack(frame)
+        site = None
+        for fs in reversed(summary):
+            try:
+                rel = Path(fs.filename).resolve().relative_to(PROJECT)
+            except ValueError:
+                continue
+            if rel.name == "loop_monitor.py":
+                continue
+            site = f"{rel}:{fs.lineno} {fs.name}"
+            break
+        if site is None:
+            fs = summary[-1]
+            site = f"{fs.filename}:{fs.lineno} {fs.name}"
+        stack = "".join(traceback.format_list(summary[-6:]))
+        return site, stack
+
+    def _charge(self, samples, stacks, lag):
+        if lag < self.threshold:
+            return
+        site = samples.most_common(1)[0][0]
+        self.stalls += 1
+        self.blocked_s += lag
+        o = self.offenders.get(site)
+        if o is None:
+            if len(self.offenders) >= self.max_offenders:
+                site = "<other>"
+                o = self.offenders.setdefault(site, {"n": 0, "total": 0.0, "max": 0.0, "stack": ""})
+            else:
+                o = self.offenders[site] = {"n": 0, "total": 0.0, "max": 0.0, "stack": ""}
+        o["n"] += 1
+        o["total"] += lag
+        o["max"] = max(o["max"], lag)
+        o["stack"] = stacks.get(site, o["stack"])
+
+    # --- reporting ---
+    def percentile(self, q):
+        """Lag percentile in seconds (1 ms resolution)."""
+        total = sum(self.lags.values())
+        if not total:
+            return 0.0
+        acc = 0
+        for ms in sorted(self.lags):
+            acc += self.lags[ms]
+            if acc >= q / 100.0 * total:
+                return ms / 1000.0
+        return self.max_lag
+
+    def worst(self, top=5):
+        return sorted(self.offenders.items(), key=lambda kv: kv[1]["total"], reverse=True)[:top]
+
+    def stats(self):
+        return {
+            "beats": self.beats,
+            "lag_p50_ms": self.percentile(50) * 1000,
+            "lag_p99_ms": self.percentile(99) * 1000,
+            "lag_max_ms": self.max_lag * 1000,
+            "stalls": self.stalls,
+            "blocked_s": self.blocked_s,
+            "offenders": {k: {"n": v["n"], "total_s": v["total"], "max_ms": v["max"] * 1000}
+                          for k, v in self.worst(10)},
+        }
+
+    def report(self, top=5, stacks=False):
+        lines = [
+            f"[loop] lag p50={self.percentile(50)*1000:.0f}ms p99={self.percentile(99)*1000:.0f}ms "
+            f"max={self.max_lag*1000:.0f}ms  stalls>{self.threshold*1000:.0f}ms: {self.stalls} "
+            f"({self.blocked_s:.2f}s blocked)"
+        ]
+        for site, o in self.worst(top):
+            lines.append(f"  {o['total']:7.2f}s {o['n']:5d}x max {o['max']*1000:5.0f}ms  {site}")
+            if stacks and o["stack"]:
+                lines.append("    " + o["stack"].rstrip().replace("\n", "\n    "))
+        return "\n".join(lines)
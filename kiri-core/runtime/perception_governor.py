@@ -0,0 +1,132 @@
+import time
+
+# Operating points, cheapest last. scale: detection input scale; every:
+# detect on every Nth frame; boost: boosted fallback pass allowed;
+# recog_hz: face recognition rate.
+LEVELS = [
+    {"scale": 1.0,  "every": 1, "boost": True,  "recog_hz": 5.0},
+    {"scale": 1.0,  "every": 1, "boost": False, "recog_hz": 2.0},
+    {"scale": 0.75, "every": 1, "boost": False, "recog_hz": 2.0},
+    {"scale": 0.5,  "every": 1, "boost": False, "recog_hz": 1.0},
+    {"scale": 0.5,  "every": 2, "boost": False, "recog_hz": 0.5},
+    {"scale": 0.5,  "every": 3, "boost": False, "recog_hz": 0.5},
+]
+
+
+class LatencyGovernor:
+    """
+    Keeps per-frame perception latency inside a budget by trading quality.
+
+    Feed it the measured latency of every processed frame (observe()). It
+    steps down the LEVELS ladder when the smoothed latency stays above
+    `budget_ms`, and back up when it stays below `up_ratio * budget_ms`.
+    Hysteresis: different thresholds and dwell times for the two
+    directions, a hold time after every change, and no upgrade into a
+    level that was measured over budget (until it's forgotten after
+    `forget_s`, e.g. when thermal throttling ends).
+
+    Callers ask point (the current operating point), detect_due() per
+    frame and recog_due(now) before running recognition.
+    """
+
+    def __init__(self, budget_ms=40.0, levels=LEVELS, alpha=0.2, up_ratio=0.6,
+                 down_after_s=0.5, up_after_s=3.0, hold_s=1.0, forget_s=15.0, on_change=None):
+        self.budget = budget_ms / 1000.0
+        self.levels = levels
+        self.alpha = alpha
+        self.up_ratio = up_ratio
+        self.down_after = down_after_s
+        self.up_after = up_after_s
+        self.hold = hold_s
+        self.forget = forget_s
+        self.on_change = on_change
+
+        self.level = 0
+        self.ewma = None
+        self.level_ewma = [None] * len(levels)   # last smoothed latency seen per level
+        self.level_seen = [0.0] * len(levels)
+        self._over_since = None
+        self._under_since = None
+        self._changed_at = 0.0
+        self._frame = 0
+        self._last_recog = 0.0
+
+        # stats
+        self.changes = 0
+        self.frames = 0
+        self.detected = 0
+        self.time_at = [0.0] * len(levels)
+        self._t_last = None
+
+    @property
+    def point(self):
+        return self.levels[self.level]
+
+    # --- per-frame gates ---
+    def detect_due(self):
+        """Cadence gate: True on every `every`-th frame."""
+        self._frame += 1
+        self.frames += 1
+        due = self._frame % self.point["every"] == 0
+        if due:
+            self.detected += 1
+        return due
+
+    def recog_due(self, now):
+        if now - self._last_recog >= 1.0 / self.point["recog_hz"]:
+            self._last_recog = now
+            return True
+        return False
+
+    # --- control ---
+    def observe(self, latency_s, now=None):
+        """Feed one processed frame's latency; returns the operating point."""
+        now = time.monotonic() if now is None else now
+        if self._t_last is not None:
+            self.time_at[self.level] += now - self._t_last
+        self._t_last = now
+
+        self.ewma = latency_s if self.ewma is None else self.ewma + self.alpha * (latency_s - self.ewma)
+        self.level_ewma[self.level] = self.ewma
+        self.level_seen[self.level] = now
+
+        over = self.ewma > self.budget
+        under = self.ewma < self.budget * self.up_ratio
+        self._over_since = (self._over_since or now) if over else None
+        self._under_since = (self._under_since or now) if under else None
+
+        if now - self._changed_at < self.hold:
+            return self.point
+
+        if over and now - self._over_since >= self.down_after and self.level < len(self.levels) - 1:
+            self._set(self.level + 1, now)
+        elif under and now - self._under_since >= self.up_after and self.level > 0:
+            target = self.level - 1
+            known = self.level_ewma[target]
+            fresh = now - self.level_seen[target] < self.forget
+            if known is None or not fresh or known <= self.budget:
+                self._set(target, now)
+        return self.point
+
+    def _set(self, level, now):
+        self.level = level
+        self.changes += 1
+        self._changed_at = now
+        self._over_since = self._under_since = None
+        self._frame = 0
+        print(f"[gov] {self.describe()}  (ewma {self.ewma*1000:.0f}ms, budget {self.budget*1000:.0f}ms)")
+        if self.on_change:
+            self.on_change(self.point)
+
+    # --- reporting ---
+    def describe(self):
+        p = self.point
+        return (f"level {self.level}: scale={p['scale']:.2f} every={p['every']} "
+                f"boost={'on' if p['boost'] else 'off'} recog={p['recog_hz']:g}Hz")
+
+    def report(self):
+        ewma = f"{self.ewma*1000:.0f}ms" if self.ewma is not None else "-"
+        total = sum(self.time_at) or 1.0
+        share = " ".join(f"L{i}={t/total:.0%}" for i, t in enumerate(self.time_at) if t)
+        return (f"[gov] {self.describe()}  ewma={ewma}/{self.budget*1000:.0f}ms "
+                f"changes={self.changes} detected={self.detected}/{self.frames}  {share}")
@@ -0,0 +1,195 @@
+"""
+Session log layout (one directory per session):
+
+    index.jsonl        one JSON record per line, in capture order
+    chunk_00000.bin    raw or JPEG frame payloads, back to back
+    chunk_00001.bin    ...a new chunk starts every `chunk_bytes`
+
+Record kinds in index.jsonl:
+
+    {"kind": "frame", "t", "seq", "chunk", "off", "len", "enc", "shape", "dtype"}
+    {"kind": "detections", "t", "seq", "faces"}
+    {"kind": "imx500", "t", "seq", "dets"}
+    {"kind": "event", "t", "event", "data"}
+
+Raw frames can be read zero-copy from a memory map of their chunk.
+"""
+
+import json
+import mmap
+import queue
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+def _jsonable(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (tuple, set)):
+        return list(obj)
+    return repr(obj)
+
+
+class SessionRecorder:
+    """
+    Records frames, detections and bus events to a session log.
+
+    All record_* calls are cheap and non-blocking: they enqueue onto a
+    bounded queue that a background writer thread drains (JPEG encoding
+    happens there too). When the queue is full the record is dropped and
+    counted, so recording never stalls the 30 fps loop.
+    Frames are not copied; don't mutate them after recording.
+    """
+
+    def __init__(self, root, encoding="jpg", jpeg_quality=85,
+                 max_pending=64, chunk_bytes=256 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.encoding = encoding
+        self.jpeg_quality = int(jpeg_quality)
+        self.chunk_bytes = int(chunk_bytes)
+
+        self.q = queue.Queue(maxsize=max_pending)
+        self.seq = 0
+        self.written = 0
+        self.dropped = 0
+
+        self._chunk_id = -1
+        self._chunk = None
+        self._index = open(self.root / "index.jsonl", "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    # ---------------- producer side ----------------
+    def _put(self, item):
+        try:
+            self.q.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def record_frame(self, frame, t=None):
+        """Record a frame; returns its sequence number."""
+        self.seq += 1
+        self._put(("frame", t if t is not None else time.monotonic(), self.seq, frame))
+        return self.seq
+
+    def record_detections(self, seq, faces, t=None):
+        self._put(("detections", t if t is not None else time.monotonic(), seq, faces))
+
+    def record_imx500(self, seq, dets, t=None):
+        """IMX500 Detection objects (box, category, conf)."""
+        dets = [{"box": list(map(int, d.box)), "category": int(d.category), "conf": float(d.conf)}
+                for d in dets or []]
+        self._put(("imx500", t if t is not None else time.monotonic(), seq, dets))
+
+    def record_event(self, event, data=None, t=None):
+        self._put(("event", t if t is not None else time.monotonic(), event, data))
+
+    def attach(self, bus):
+        """Record every event published on an EventBus."""
+        bus.tap(self.record_event)
+
+    def close(self):
+        self.q.put(None)
+        self._thread.join()
+        self._index.close()
+        if self._chunk:
+            self._chunk.close()
+
+    # ---------------- writer thread ----------------
+    def _chunk_for(self, nbytes):
+        if self._chunk is None or self._chunk.tell() + nbytes > self.chunk_bytes:
+            if self._chunk:
+                self._chunk.close()
+            self._chunk_id += 1
+            self._chunk = open(self.root / f"chunk_{self._chunk_id:05d}.bin", "ab")
+        return self._chunk
+
+    def _write_frame(self, t, seq, frame):
+        if self.encoding == "jpg":
+            ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality])
+            if not ok:
+                return None
+            payload = buf.tobytes()
+        else:
+            payload = np.ascontiguousarray(frame).tobytes()
+
+        f = self._chunk_for(len(payload))
+        off = f.tell()
+        f.write(payload)
+        return {
+            "kind": "frame", "t": t, "seq": seq,
+            "chunk": self._chunk_id, "off": off, "len": len(payload),
+            "enc": self.encoding, "shape": list(frame.shape), "dtype": str(frame.dtype),
+        }
+
+    def _writer(self):
+        while True:
+            item = self.q.get()
+            if item is None:
+                break
+
+            kind, t = item[0], item[1]
+            if kind == "frame":
+                rec = self._write_frame(t, item[2], item[3])
+            elif kind == "detections":
+                rec = {"kind": kind, "t": t, "seq": item[2], "faces": item[3]}
+            elif kind == "imx500":
+                rec = {"kind": kind, "t": t, "seq": item[2], "dets": item[3]}
+            else:
+                rec = {"kind": kind, "t": t, "event": item[2], "data": item[3]}
+
+            if rec is not None:
+                self._index.write(json.dumps(rec, default=_jsonable) + "\n")
+                self.written += 1
+
+            # flush whenever we catch up, so a crash loses little
+            if self.q.empty():
+                self._index.flush()
+                if self._chunk:
+                    self._chunk.flush()
+
+
+class SessionLog:
+    """Read side of a session log (frames are memory-mapped)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        with open(self.root / "index.jsonl", encoding="utf-8") as f:
+            self.records = [json.loads(line) for line in f if line.strip()]
+        self._maps = {}
+
+    def _map(self, chunk_id):
+        if chunk_id not in self._maps:
+            with open(self.root / f"chunk_{chunk_id:05d}.bin", "rb") as f:
+                self._maps[chunk_id] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._maps[chunk_id]
+
+    def frame(self, rec):
+        """Decode a frame record (raw frames are zero-copy, read-only views)."""
+        mm = self._map(rec["chunk"])
+        if rec["enc"] == "raw":
+            arr = np.frombuffer(mm, dtype=rec["dtype"], count=int(np.prod(rec["shape"])), offset=rec["off"])
+            return arr.reshape(rec["shape"])
+        buf = np.frombuffer(mm, dtype=np.uint8, count=rec["len"], offset=rec["off"])
+        return cv2.imdecode(buf, cv2.IMREAD_UNCHANGED)
+
+    def frames(self):
+        for rec in self.records:
+            if rec["kind"] == "frame":
+                yield rec, self.frame(rec)
+
+    def detections(self):
+        """seq -> recorded faces."""
+        return {r["seq"]: r["faces"] for r in self.records if r["kind"] == "detections"}
+
+    def close(self):
+        for mm in self._maps.values():
+            mm.close()
+        self._maps.clear()
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import time
+
+from behaviour.track_face import TrackFace
+from hardware.fake_swivel import FakeSwivel
+from motion.swivel_motion import SwivelMotion
+from motion.swivel_stable import SwivelMotionStable
+from perception.face_provider import get_best_face
+from runtime.recorder import SessionLog
+from runtime.state import State
+
+
+class _LogClock:
+    """Clock driven by the log timestamps, so replays are deterministic."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def replay(log, refiner=None, bus=None, realtime=False, speed=1.0, tracker_kwargs=None, gate=None):
+    """
+    Feed a recorded session back through perception → TrackFace →
+    SwivelMotionStable → SwivelMotion → FakeSwivel.
+
+    log:      SessionLog
+    refiner:  FaceRefiner to re-run detection on the frames; if None the
+              recorded detections are used (frames the live loop did not
+              run detection on keep the previous ones, as they did live)
+    bus:      optional EventBus to re-publish recorded events on
+    realtime: sleep so records are replayed at their recorded pace
+              (scaled by speed); otherwise run as fast as possible
+    gate:     optional StaticSceneGate; skipped frames reuse the cached
+              faces (use gate.skip_fraction to see how much was saved)
+
+    Time inside the pipeline always follows the log timestamps, so both
+    modes produce the same commands. Returns a summary dict.
+    """
+    clock = _LogClock()
+    swivel = FakeSwivel(clock=clock)
+    raw_motion = SwivelMotion(swivel)
+    motion = SwivelMotionStable(raw_motion)
+
+    state = State()
+    kwargs = dict(pan_gain=-40.0, tilt_gain=+35.0)
+    kwargs.update(tracker_kwargs or {})
+    tracker = TrackFace(motion=motion, get_face_fn=lambda: get_best_face(state), **kwargs)
+
+    recorded = log.detections()
+    last_recorded = []
+    motion_dt = 1.0 / raw_motion.hz
+    t0_log = None
+    t0_wall = time.monotonic()
+    next_motion = None
+    n_frames = n_faces = 0
+
+    for rec in log.records:
+        t = rec["t"]
+        if t0_log is None:
+            t0_log = t
+            next_motion = t
+
+        if realtime:
+            delay = (t - t0_log) / speed - (time.monotonic() - t0_wall)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        # servo loop catches up to this record's time
+        while next_motion <= t:
+            clock.now = next_motion
+            raw_motion.step(motion_dt)
+            next_motion += motion_dt
+        clock.now = t
+
+        if rec["kind"] == "event" and bus is not None:
+            await bus.publish(rec["event"], rec["data"])
+
+        elif rec["kind"] == "frame":
+            frame = log.frame(rec)
+            if gate is not None and not gate.should_detect(frame, t, moving=not raw_motion.at_target()):
+                faces = gate.reuse(t)
+            else:
+                if refiner is not None:
+                    faces = refiner.detect_faces(frame)
+                else:
+                    faces = last_recorded = recorded.get(rec["seq"], last_recorded)
+                if gate is not None:
+                    gate.store(faces, t)
+            state.publish_faces(frame, faces, t)
+            tracker.update(get_best_face(state), t)
+            n_frames += 1
+            n_faces += bool(faces)
+
+    return {
+        "frames": n_frames,
+        "frames_with_face": n_faces,
+        "commands": swivel.commands,
+        "final_pan": raw_motion.current_pan,
+        "final_tilt": raw_motion.current_tilt,
+        "skip_fraction": gate.skip_fraction if gate is not None else None,
+    }
+
+
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay a recorded KIRI session")
+    ap.add_argument("session", help="Session directory written by SessionRecorder")
+    ap.add_argument("--realtime", action="store_true", help="Replay at recorded pace")
+    ap.add_argument("--speed", type=float, default=1.0, help="Pace multiplier for --realtime")
+    ap.add_argument("--redetect", action="store_true", help="Re-run YuNet instead of recorded faces")
+    ap.add_argument("--predictive", action="store_true", help="Use latency-compensated TrackFace")
+    ap.add_argument("--static-gate", action="store_true", help="Skip detection on unchanged frames")
+    args = ap.parse_args(argv)
+
+    refiner = None
+    if args.redetect:
+        from config.models import YUNET
+        from perception.face_refiner import FaceRefiner
+        refiner = FaceRefiner(YUNET)
+
+    gate = None
+    if args.static_gate:
+        from perception.static_gate import StaticSceneGate
+        gate = StaticSceneGate()
+
+    log = SessionLog(args.session)
+    t0 = time.monotonic()
+    res = asyncio.run(replay(
+        log, refiner=refiner, realtime=args.realtime, speed=args.speed,
+        tracker_kwargs={"predictive": args.predictive}, gate=gate,
+    ))
+    dt = time.monotonic() - t0
+
+    print(f"[replay] {res['frames']} frames ({res['frames_with_face']} with face) in {dt:.2f}s")
+    print(f"[replay] {len(res['commands'])} servo commands, final pan/tilt "
+          f"{res['final_pan']:.1f}/{res['final_tilt']:.1f}")
+    if gate is not None:
+        print(gate.report())
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,174 @@
+import asyncio
+import inspect
+import time
+
+
+class PeriodicTask:
+    """One registered periodic job plus its timing statistics."""
+
+    def __init__(self, name, fn, hz, priority=0, budget=None):
+        self.name = name
+        self.fn = fn
+        self.period = 1.0 / hz
+        self.priority = priority
+        # time budget per run (seconds); defaults to half the period
+        self.budget = budget if budget is not None else self.period * 0.5
+        self.next_deadline = None
+        self.paused = False
+
+        # stats
+        self.runs = 0
+        self.overruns = 0         # run finished after its next deadline
+        self.skipped = 0          # iterations dropped because of overruns
+        self.over_budget = 0      # run took longer than its budget
+        self.jitter_sum = 0.0     # start lateness vs deadline
+        self.jitter_max = 0.0
+        self.busy_sum = 0.0       # time spent inside fn
+        self.busy_max = 0.0
+
+    def stats(self):
+        n = max(1, self.runs)
+        return {
+            "hz": 1.0 / self.period,
+            "priority": self.priority,
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "over_budget": self.over_budget,
+            "jitter_avg_ms": 1000 * self.jitter_sum / n,
+            "jitter_max_ms": 1000 * self.jitter_max,
+            "busy_avg_ms": 1000 * self.busy_sum / n,
+            "busy_max_ms": 1000 * self.busy_max,
+            "busy_total_s": self.busy_sum,
+        }
+
+
+class Scheduler:
+    """
+    Single deadline-based scheduler for the periodic control loops.
+
+    - Tasks register with a rate (Hz) and a priority (higher runs first
+      when several are due at the same time).
+    - Deadlines are absolute on time.monotonic(): deadline += period,
+      so there is no cumulative drift from sleep/execution time.
+    - On overrun the missed iterations are skipped (merged into the next
+      one) instead of being run back-to-back to "catch up".
+    - fn may be a plain function or a coroutine function.
+    """
+
+    def __init__(self):
+        self.tasks = {}
+        self.running = False
+        self._wake = asyncio.Event()    # set by add/resume/set_rate/stop
+
+    def add(self, name, fn, hz, priority=0, budget=None):
+        task = PeriodicTask(name, fn, hz, priority, budget)
+        self.tasks[name] = task
+        self._wake.set()
+        return task
+
+    def remove(self, name):
+        self.tasks.pop(name, None)
+
+    def set_rate(self, name, hz):
+        """Change a task's rate; takes effect from its next deadline."""
+        self.tasks[name].period = 1.0 / hz
+        self._wake.set()
+
+    def pause(self, name):
+        """Park a task (it keeps its stats, but does not run)."""
+        self.tasks[name].paused = True
+
+    def resume(self, name):
+        """Un-park a task; it runs at the next scheduler pass."""
+        task = self.tasks[name]
+        if task.paused:
+            task.paused = False
+            task.next_deadline = time.monotonic()
+            self._wake.set()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+
+    async def _nap(self, timeout):
+        """Sleep up to `timeout` (None = until woken); add/resume/set_rate wake it early."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    def _next_task(self, now):
+        active = [t for t in self.tasks.values() if not t.paused]
+        if not active:
+            return None
+        due = [t for t in active if t.next_deadline <= now]
+        if due:
+            return max(due, key=lambda t: (t.priority, -t.next_deadline))
+        return min(active, key=lambda t: (t.next_deadline, -t.priority))
+
+    async def run(self):
+        self.running = True
+        start = time.monotonic()
+        for t in self.tasks.values():
+            t.next_deadline = start
+
+        while self.running:
+            if not self.tasks:
+                await self._nap(None)
+                continue
+
+            now = time.monotonic()
+            for t in self.tasks.values():
+                if t.next_deadline is None:     # added while running
+                    t.next_deadline = now
+
+            task = self._next_task(now)
+            if task is None:
+                await self._nap(None)       # everything parked: sleep until resume()
+                continue
+            wait = task.next_deadline - now
+            if wait > 0:
+                await self._nap(wait)
+                continue    # re-evaluate: something else may be due now
+
+            t0 = time.monotonic()
+            lateness = t0 - task.next_deadline
+            result = task.fn()
+            if inspect.isawaitable(result):
+                await result
+            t1 = time.monotonic()
+
+            busy = t1 - t0
+            task.runs += 1
+            task.jitter_sum += lateness
+            task.jitter_max = max(task.jitter_max, lateness)
+            task.busy_sum += busy
+            task.busy_max = max(task.busy_max, busy)
+            if busy > task.budget:
+                task.over_budget += 1
+
+            # advance on the absolute grid, skipping missed slots
+            task.next_deadline += task.period
+            if t1 > task.next_deadline:
+                missed = int((t1 - task.next_deadline) / task.period) + 1
+                task.overruns += 1
+                task.skipped += missed
+                task.next_deadline += missed * task.period
+
+            # yield so non-scheduled coroutines (perception, I/O) get a turn
+            await asyncio.sleep(0)
+
+    def stats(self):
+        return {name: t.stats() for name, t in self.tasks.items()}
+
+    def report(self):
+        lines = ["[sched] task          hz   runs  overrun skipped  jit avg/max ms   busy avg/max ms"]
+        for name, s in self.stats().items():
+            lines.append(
+                f"[sched] {name:<12} {s['hz']:5.1f} {s['runs']:6d} {s['overruns']:7d} {s['skipped']:7d}"
+                f"   {s['jitter_avg_ms']:6.2f}/{s['jitter_max_ms']:6.2f}"
+                f"   {s['busy_avg_ms']:6.2f}/{s['busy_max_ms']:6.2f}"
+            )
+        return "\n".join(lines)
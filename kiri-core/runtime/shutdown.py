@@ -1,14 +1,17 @@
 import asyncio
 
+SHUTDOWN_PHRASE = "Shutting down."
+
 async def graceful_shutdown(bus, audio, swivel):
     print("[shutdown] draining audio queue…")
-    await bus.publish("speak", "Shutting down.")
+    await bus.publish("speak", SHUTDOWN_PHRASE)
     
     # give audio queue a moment to accept the message
     await asyncio.sleep(0.1)
 
     # Wait for all queued speech to finish
     await audio.queue.join()
+    audio.tts.close()       # persist the TTS cache's LRU times, close the sink
 
     # Final goodnight gesture
     swivel.set(90, 140)
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+
+class BootStep:
+    def __init__(self, name, fn, after=(), required=True):
+        self.name = name
+        self.fn = fn
+        self.after = tuple(after)
+        self.required = required
+        self.start = None
+        self.end = None
+        self.error = None
+
+
+class Startup:
+    """
+    Concurrent boot orchestrator.
+
+    Each step is a blocking callable run on a worker thread, so camera
+    firmware upload, Arduino reset, model loading and warm-up overlap.
+    A step may depend on others (after=...) and receives nothing; share
+    results through closures or read them from run()'s return value.
+
+        boot = Startup()
+        boot.add("swivel", lambda: SwivelController().open())
+        boot.add("yunet", load_refiner)
+        results = await boot.run()
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.t0 = None
+
+    def add(self, name, fn, after=(), required=True):
+        self.steps[name] = BootStep(name, fn, after, required)
+
+    async def _run_step(self, step, futures):
+        for dep in step.after:
+            await futures[dep]
+
+        step.start = time.monotonic() - self.t0
+        try:
+            return await asyncio.to_thread(step.fn)
+        except Exception as e:
+            step.error = e
+            if step.required:
+                raise
+            print(f"[boot] {step.name} failed (optional): {e!r}")
+            return None
+        finally:
+            step.end = time.monotonic() - self.t0
+
+    async def run(self):
+        """Run all steps; returns {name: result}. Raises the first required failure."""
+        self.t0 = time.monotonic()
+        futures = {}
+        for step in self.steps.values():
+            futures[step.name] = asyncio.ensure_future(self._run_step(step, futures))
+
+        results = await asyncio.gather(*futures.values(), return_exceptions=True)
+        self.print_timeline()
+
+        for step, res in zip(self.steps.values(), results):
+            if isinstance(res, BaseException):
+                raise res
+        return dict(zip(self.steps.keys(), results))
+
+    def print_timeline(self, width=40):
+        total = max((s.end or 0) for s in self.steps.values()) or 1e-9
+        print(f"[boot] timeline ({total:.2f}s total)")
+        for s in self.steps.values():
+            if s.start is None:
+                print(f"[boot] {s.name:<10} (not started)")
+                continue
+            a = int(s.start / total * width)
+            b = max(a + 1, int(s.end / total * width))
+            bar = " " * a + "█" * (b - a)
+            status = " FAILED" if s.error else ""
+            print(f"[boot] {s.name:<10} {s.start:5.2f} → {s.end:5.2f}s |{bar:<{width}}|{status}")
@@ -1,4 +1,52 @@
+import asyncio
+
+
 class State:
+    """
+    Shared perception state.
+
+    Writers call publish_faces() once per processed frame; readers can
+    await wait_faces() instead of polling. Both must run on the event
+    loop thread (use loop.call_soon_threadsafe from worker threads).
+    """
+
     def __init__(self):
         self.frame = None
+        self.frame_time = None   # monotonic time the frame was captured
         self.faces = []
+        self.tracks = None       # confirmed FaceTracks (None = no track manager)
+        self.attention = None    # FaceTrack to look at
+        self.seq = 0             # detection sequence number
+        self._new_faces = None   # asyncio.Event, created by the first waiter
+
+    def publish_faces(self, frame, faces, frame_time=None, tracks=None, attention=None):
+        """Store a new detection result and wake everyone waiting for it."""
+        self.frame = frame
+        self.frame_time = frame_time
+        self.faces = faces
+        self.tracks = tracks
+        self.attention = attention
+        self.seq += 1
+
+        ev = self._new_faces
+        if ev is not None:
+            self._new_faces = None
+            ev.set()
+
+    async def wait_faces(self, seq, timeout=None):
+        """
+        Wait until a detection newer than `seq` is published.
+        Returns the new sequence number, or None on timeout.
+        """
+        if self.seq != seq:
+            return self.seq
+
+        if self._new_faces is None:
+            self._new_faces = asyncio.Event()
+        ev = self._new_faces
+
+        try:
+            await asyncio.wait_for(ev.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.seq
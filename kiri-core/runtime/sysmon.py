@@ -0,0 +1,33 @@
+import os
+import time
+from pathlib import Path
+
+THERMAL = Path("/sys/class/thermal/thermal_zone0/temp")
+
+
+class SysMon:
+    """Process CPU % (of one core) and SoC temperature, for power reports."""
+
+    def __init__(self):
+        self._t = time.monotonic()
+        self._cpu = time.process_time()
+
+    def cpu_percent(self):
+        """CPU used by this process since the previous call."""
+        now, cpu = time.monotonic(), time.process_time()
+        dt = now - self._t
+        pct = 100.0 * (cpu - self._cpu) / dt if dt > 0 else 0.0
+        self._t, self._cpu = now, cpu
+        return pct
+
+    @staticmethod
+    def temperature_c():
+        try:
+            return int(THERMAL.read_text().strip()) / 1000.0
+        except (OSError, ValueError):
+            return None
+
+    def report(self):
+        temp = self.temperature_c()
+        temp_s = f"{temp:.1f}°C" if temp is not None else "n/a"
+        return f"[sys] cpu {self.cpu_percent():5.1f}%  temp {temp_s}  load {os.getloadavg()[0]:.2f}"
@@ -0,0 +1,187 @@
+import json
+import os
+import signal
+import time
+from pathlib import Path
+
+
+class _NullSpan:
+    """Shared do-nothing context manager returned while tracing is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "frame", "t0")
+
+    def __init__(self, tracer, name, frame):
+        self.tracer = tracer
+        self.name = name
+        self.frame = frame
+
+    def __enter__(self):
+        self.t0 = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.t0, time.monotonic(), self.frame)
+        return False
+
+
+class _InFrame:
+    """Temporarily switch the causal frame id (restored on exit)."""
+    __slots__ = ("tracer", "frame", "prev")
+
+    def __init__(self, tracer, frame):
+        self.tracer = tracer
+        self.frame = frame
+
+    def __enter__(self):
+        self.prev = self.tracer.frame
+        self.tracer.frame = self.frame
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.frame = self.prev
+        return False
+
+
+class Tracer:
+    """
+    Per-frame span tracing into a fixed-size ring buffer.
+
+    Spans are keyed by a frame id so one camera frame can be followed from
+    capture to the serial write that acts on it. `frame` is the id of the
+    frame currently flowing through the code (set by the perception loop,
+    carried by SwivelMotion into its steps); spans default to it.
+
+        with TRACE.span("detect"):
+            faces = fr.detect_faces(frame)
+
+    Disabled (the default) a span is one attribute check and a shared
+    no-op context manager. Dump with dump()/chrome_trace() as Chrome trace
+    JSON (chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    # spans that start / end the photon-to-servo path of a frame
+    FIRST = "capture"
+    LAST = "serial_send"
+
+    def __init__(self, size=20000):
+        self.enabled = False
+        self.size = size
+        self.frame = None
+        self._ring = [None] * size
+        self._i = 0
+        self._next_frame = 0
+
+    # --- control ---
+    def enable(self, size=None):
+        if size and size != self.size:
+            self.size = size
+            self.clear()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self._ring = [None] * self.size
+        self._i = 0
+
+    # --- recording ---
+    def new_frame(self):
+        """Allocate the next frame id and make it current."""
+        self._next_frame += 1
+        self.frame = self._next_frame
+        return self.frame
+
+    def in_frame(self, frame):
+        if not self.enabled:
+            return _NULL
+        return _InFrame(self, frame)
+
+    def span(self, name, frame=None):
+        if not self.enabled:
+            return _NULL
+        return _Span(self, name, self.frame if frame is None else frame)
+
+    def complete(self, name, t0, t1, frame=None):
+        """Record a finished span (monotonic seconds)."""
+        if not self.enabled:
+            return
+        i = self._i
+        self._ring[i % self.size] = (name, frame, t0, t1)
+        self._i = i + 1
+
+    # --- reading ---
+    def spans(self):
+        """Recorded spans, oldest first: (name, frame, t0, t1)."""
+        n = self._i
+        if n <= self.size:
+            out = self._ring[:n]
+        else:
+            k = n % self.size
+            out = self._ring[k:] + self._ring[:k]
+        return [s for s in out if s is not None]
+
+    def frame_latencies(self, spans=None):
+        """frame id -> seconds from capture start to the end of its first serial write."""
+        start, end = {}, {}
+        for name, frame, t0, t1 in spans if spans is not None else self.spans():
+            if frame is None:
+                continue
+            if name == self.FIRST:
+                start.setdefault(frame, t0)
+            elif name == self.LAST and frame not in end:
+                end[frame] = t1
+        return {f: end[f] - start[f] for f in end if f in start}
+
+    def chrome_trace(self):
+        """The buffer as a Chrome trace-event dict."""
+        spans = self.spans()
+        pid = os.getpid()
+        events = []
+        for name, frame, t0, t1 in spans:
+            events.append({
+                "name": name, "ph": "X", "pid": pid, "tid": name,
+                "ts": t0 * 1e6, "dur": (t1 - t0) * 1e6,
+                "args": {"frame": frame},
+            })
+        # one bar per frame for the whole photon-to-servo path
+        starts = {}
+        for name, frame, t0, _ in spans:
+            if name == self.FIRST and frame is not None:
+                starts.setdefault(frame, t0)
+        for frame, lat in self.frame_latencies(spans).items():
+            events.append({
+                "name": f"frame {frame}", "ph": "X", "pid": pid, "tid": "photon->servo",
+                "ts": starts[frame] * 1e6, "dur": lat * 1e6,
+                "args": {"frame": frame, "latency_ms": round(lat * 1000, 2)},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path):
+        path = Path(path)
+        path.write_text(json.dumps(self.chrome_trace()))
+        return path
+
+    def install_signal(self, directory="/tmp", signum=signal.SIGUSR1):
+        """`kill -USR1 <pid>` writes the buffer to <directory>/kiri-trace-<time>.json."""
+        def _handler(*_):
+            p = self.dump(Path(directory) / f"kiri-trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+            print(f"[trace] wrote {p}")
+        signal.signal(signum, _handler)
+
+
+# process-wide tracer (enabled with KIRI_TRACE=1 or TRACE.enable())
+TRACE = Tracer()
+if os.environ.get("KIRI_TRACE"):
+    TRACE.enable()
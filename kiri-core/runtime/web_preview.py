@@ -1,8 +1,11 @@
 import asyncio
-import cv2
 import numpy as np
 from aiohttp import web
 
+from perception.preview import encode_frame
+from runtime.trace import TRACE
+
+
 async def mjpeg_stream(state):
     """
     Async generator that yields JPEG frames with bounding boxes.
@@ -14,21 +17,10 @@ async def mjpeg_stream(state):
             await asyncio.sleep(0.01)
             continue
 
-        shown = frame.copy()
-
-        # Draw bounding boxes
-        faces = getattr(state, "faces", [])
-        for f in faces:
-            x, y, w, h = f["box"]
-            cv2.rectangle(shown, (x, y), (x+w, y+h), (0, 255, 0), 2)
-
-        # Encode JPEG
-        ret, jpeg = cv2.imencode('.jpg', shown, [int(cv2.IMWRITE_JPEG_QUALITY), 75])
-        if not ret:
+        frame_bytes = encode_frame(frame, getattr(state, "faces", []))
+        if frame_bytes is None:
             continue
 
-        frame_bytes = jpeg.tobytes()
-
         yield (b"--frame\r\n"
                b"Content-Type: image/jpeg\r\n\r\n" +
                frame_bytes +
@@ -54,6 +46,18 @@ async def handle_mjpeg(request):
     return response
 
 
+async def handle_trace(request):
+    """Chrome trace JSON of the span ring buffer (?clear=1 empties it afterwards)."""
+    if not TRACE.enabled:
+        return web.json_response({"error": "tracing disabled (KIRI_TRACE=1)"}, status=404)
+    data = TRACE.chrome_trace()
+    if request.query.get("clear"):
+        TRACE.clear()
+    return web.json_response(data, headers={
+        "Content-Disposition": "attachment; filename=kiri-trace.json",
+    })
+
+
 async def start_web_preview(state, host="0.0.0.0", port=8080):
     """
     Launches the tiny web server for preview streaming.
@@ -61,6 +65,7 @@ async def start_web_preview(state, host="0.0.0.0", port=8080):
     app = web.Application()
     app["state"] = state
     app.router.add_get("/", handle_mjpeg)
+    app.router.add_get("/trace", handle_trace)
 
     runner = web.AppRunner(app)
     await runner.setup()